@@ -163,6 +163,7 @@ from yt.utilities.parallel_tools.parallel_analysis_interface import (
     enable_parallelism,
     communication_system,
 )
+from yt.utilities.parallel_tools.local_parallelism import local_parallelism
 
 from yt.convenience import load, simulation
 
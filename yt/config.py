@@ -51,6 +51,16 @@ ytcfg_defaults = dict(
     thread_field_detection="False",
     ignore_invalid_unit_operation_errors="False",
     chunk_size="1000",
+    local_parallel_workers="0",
+    io_cache_size="0",
+    mask_cache_size="64",
+    ghost_zone_cache_size="256",
+    chunk_prefetch_depth="0",
+    chunk_prefetch_memory="512",
+    result_cache="False",
+    result_cache_dir="",
+    result_cache_size="1024",
+    sph_domain_particles="16777216",
     xray_data_dir="/does/not/exist",
     supp_data_dir="/does/not/exist",
     default_colormap="arbre",
@@ -1,7 +1,10 @@
 import fileinput
 import io
 import os
+import queue
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from re import finditer
 from tempfile import NamedTemporaryFile, TemporaryFile
@@ -41,13 +44,19 @@ from yt.utilities.lib.pixelization_routines import (
     normalization_3d_utility,
     pixelize_sph_kernel_arbitrary_grid,
 )
-from yt.utilities.lib.quad_tree import QuadTree
+from yt.utilities.lib.quad_tree import QuadTree, merge_quadtrees
 from yt.utilities.minimal_representation import MinimalProjectionData
+from yt.utilities.parallel_tools.local_parallelism import get_local_workers
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     communication_system,
     parallel_objects,
     parallel_root_only,
 )
+from yt.utilities.result_cache import result_cache, result_key
+
+# The number of cells of the slabs in which covering grids kept in storage
+# are filled, unless told otherwise.
+_default_slab_cells = 2 ** 25
 
 
 class YTStreamline(YTSelectionContainer1D):
@@ -151,9 +160,64 @@ class YTStreamline(YTSelectionContainer1D):
         return mask
 
 
+class LocalQuadTrees:
+    """
+    A stand-in for a :class:`~yt.utilities.lib.quad_tree.QuadTree` that
+    spreads the chunks added to it over a pool of local threads.
+
+    Each thread adds chunks to a tree of its own, taken from a shared pool, so
+    that threads never wait on each other; a thread picks up the next pending
+    chunk as soon as it is done with the previous one.  Adding values to a
+    tree releases the GIL, so this overlaps with reading the next chunks in
+    the calling thread.  Once all the chunks have been added, :meth:`merge`
+    combines the trees into the first one.
+    """
+
+    def __init__(self, tree, make_tree, nworkers):
+        self.tree = tree
+        self.trees = [tree] + [make_tree() for _ in range(nworkers - 1)]
+        self._free = queue.Queue()
+        for t in self.trees:
+            self._free.put(t)
+        self._executor = ThreadPoolExecutor(max_workers=nworkers)
+        self._pending = deque()
+        # Bound the number of chunks held in memory while waiting for a tree
+        self._max_pending = 2 * nworkers
+
+    def _add(self, *args):
+        tree = self._free.get()
+        try:
+            tree.add_chunk_to_tree(*args)
+        finally:
+            self._free.put(tree)
+
+    def add_chunk_to_tree(self, *args):
+        while len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._executor.submit(self._add, *args))
+
+    def merge(self, merge_style):
+        """
+        Wait for all the chunks to be added and merge the trees following
+        *merge_style* (1 to add values, -1 to keep the maximum).  Returns the
+        merged tree.
+        """
+        while len(self._pending) > 0:
+            self._pending.popleft().result()
+        self.close()
+        for other in self.trees[1:]:
+            merge_quadtrees(self.tree, other, merge_style)
+        self.trees = [self.tree]
+        return self.tree
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
 class YTProj(YTSelectionContainer2D):
     _key_fields = YTSelectionContainer2D._key_fields + ["weight_field"]
     _con_args = ("axis", "field", "weight_field")
+    _result_key_args = _con_args + ("method", "_sum_only")
     _container_fields = ("px", "py", "pdx", "pdy", "weight_field")
 
     def __init__(
@@ -234,20 +298,6 @@ class YTProj(YTSelectionContainer2D):
         if communication_system.communicators[-1].size > 1:
             for chunk in self.data_source.chunks([], "io", local_only=False):
                 self._initialize_chunk(chunk, tree)
-        _units_initialized = False
-        with self.data_source._field_parameter_state(self.field_parameters):
-            for chunk in parallel_objects(
-                self.data_source.chunks([], "io", local_only=True)
-            ):
-                if not _units_initialized:
-                    self._initialize_projected_units(fields, chunk)
-                    _units_initialized = True
-                self._handle_chunk(chunk, fields, tree)
-        # if there's less than nprocs chunks, units won't be initialized
-        # on all processors, so sync with _projected_units on rank 0
-        projected_units = self.comm.mpi_bcast(self._projected_units)
-        self._projected_units = projected_units
-        # Note that this will briefly double RAM usage
         if self.method == "mip":
             merge_style = -1
             op = "max"
@@ -256,6 +306,36 @@ class YTProj(YTSelectionContainer2D):
             op = "sum"
         else:
             raise NotImplementedError
+        # Without MPI, or on top of it, chunks can be added to per-thread
+        # trees that are merged once all of them have been read.
+        nworkers = get_local_workers()
+        if nworkers > 1:
+            tree = LocalQuadTrees(tree, lambda: self._get_tree(len(fields)), nworkers)
+        _units_initialized = False
+        prefetch = list(fields)
+        if self.weight_field is not None:
+            prefetch.append(self.weight_field)
+        try:
+            with self.data_source._field_parameter_state(self.field_parameters):
+                for chunk in parallel_objects(
+                    self.data_source.chunks(
+                        [], "io", local_only=True, prefetch=prefetch
+                    )
+                ):
+                    if not _units_initialized:
+                        self._initialize_projected_units(fields, chunk)
+                        _units_initialized = True
+                    self._handle_chunk(chunk, fields, tree)
+        finally:
+            if isinstance(tree, LocalQuadTrees):
+                tree.close()
+        if isinstance(tree, LocalQuadTrees):
+            tree = tree.merge(merge_style)
+        # if there's less than nprocs chunks, units won't be initialized
+        # on all processors, so sync with _projected_units on rank 0
+        projected_units = self.comm.mpi_bcast(self._projected_units)
+        self._projected_units = projected_units
+        # Note that this will briefly double RAM usage
         # TODO: Add the combine operation
         xax = self.ds.coordinates.x_axis[self.axis]
         yax = self.ds.coordinates.y_axis[self.axis]
@@ -486,37 +566,61 @@ class YTQuadTreeProj(YTProj):
             max_level,
         )
 
-        if not self.deserialize(field):
-            self.get_data(field)
-            self.serialize()
+        self.get_data(field)
 
     @property
     def _mrep(self):
         return MinimalProjectionData(self)
 
+    def get_data(self, fields=None):
+        fields = self._determine_fields(ensure_list(fields or []))
+        if len(fields) == 0 or self.deserialize(fields):
+            return
+        super(YTQuadTreeProj, self).get_data(fields)
+        self.serialize(fields)
+
+    def _result_key(self, fields):
+        units = [str(self.ds._get_field_info(field).units) for field in fields]
+        return result_key(
+            self.ds,
+            "projection",
+            self,
+            self.method,
+            self._sum_only,
+            fields,
+            self.weight_field,
+            units,
+            fields=fields + [self.weight_field],
+        )
+
     def deserialize(self, fields):
-        if not ytcfg.getboolean("yt", "serialize"):
+        """
+        Fill *fields* from the result cache, if it is enabled and holds them.
+        Returns whether this succeeded.
+        """
+        if not result_cache.enabled:
             return False
-        for field in fields:
-            self[field] = None
-        deserialized_successfully = False
-        store_file = self.ds.parameter_filename + ".yt"
-        if os.path.isfile(store_file):
-            deserialized_successfully = self._mrep.restore(store_file, self.ds)
-
-            if deserialized_successfully:
-                mylog.info("Using previous projection data from %s", store_file)
-                for field, field_data in self._mrep.field_data.items():
-                    self[field] = field_data
-        if not deserialized_successfully:
-            for field in fields:
-                del self[field]
-        return deserialized_successfully
+        entry = result_cache.get(self._result_key(fields), self.ds)
+        if entry is None:
+            return False
+        mylog.info("Using cached projection of %s", fields)
+        for name in self._container_fields:
+            self.field_data[name] = entry[name]
+        for i, field in enumerate(fields):
+            self[field] = entry[f"field_{i}"]
+            self._projected_units[field] = self[field].units
+        return True
 
-    def serialize(self):
-        if not ytcfg.getboolean("yt", "serialize"):
+    def serialize(self, fields):
+        """Store *fields* in the result cache, if it is enabled."""
+        if not result_cache.enabled:
+            return
+        if any(f not in self.field_data for f in fields):
             return
-        self._mrep.store(self.ds.parameter_filename + ".yt")
+        arrays = {name: self.field_data[name] for name in self._container_fields}
+        for i, field in enumerate(fields):
+            arrays[f"field_{i}"] = self.field_data[field]
+        result_cache.put(self._result_key(fields), arrays)
 
     def _get_tree(self, nvals):
         xax = self.ds.coordinates.x_axis[self.axis]
@@ -597,11 +701,26 @@ class YTCoveringGrid(YTSelectionContainer3D):
         A list of fields that you'd like pre-generated for your object
     num_ghost_zones : integer, optional
         The number of padding ghost zones used when accessing fields.
+    storage : string, optional
+        If given, the directory in which the mesh fields of the covering grid
+        are stored as ``.npy`` files, rather than in memory.  They are then
+        filled slab by slab along the x axis, each slab being written to its
+        file as soon as it is done, and returned as memory-mapped arrays, so
+        that covering grids larger than the memory can be built.  In parallel,
+        slabs are spread over the MPI processes, or over local processes if
+        :func:`~yt.utilities.parallel_tools.local_parallelism.local_parallelism`
+        is enabled.  Modifying the arrays does not modify the files.
+    slab_size : integer, optional
+        The number of cells along the x axis of each slab filled when using
+        *storage*.  By default, slabs hold about 32 million cells.
 
     Examples
     --------
     >>> cube = ds.covering_grid(2, left_edge=[0.0, 0.0, 0.0], \
     ...                          dims=[128, 128, 128])
+    >>> big = ds.covering_grid(5, left_edge=[0.0, 0.0, 0.0],
+    ...                        dims=[4096, 4096, 4096], storage="cube")
+    >>> density = big["gas", "density"][:16]
     """
 
     _spatial = True
@@ -616,6 +735,8 @@ class YTCoveringGrid(YTSelectionContainer3D):
         ("index", "z"),
     )
     _base_grid = None
+    _storage = None
+    _slab_size = None
 
     def __init__(
         self,
@@ -627,6 +748,8 @@ class YTCoveringGrid(YTSelectionContainer3D):
         num_ghost_zones=0,
         use_pbar=True,
         field_parameters=None,
+        storage=None,
+        slab_size=None,
     ):
         if field_parameters is None:
             center = None
@@ -635,6 +758,8 @@ class YTCoveringGrid(YTSelectionContainer3D):
         YTSelectionContainer3D.__init__(self, center, ds, field_parameters)
 
         self.level = level
+        self._storage = storage
+        self._slab_size = slab_size
         self.left_edge = self._sanitize_edge(left_edge)
         self.ActiveDimensions = self._sanitize_dims(dims)
 
@@ -782,6 +907,12 @@ class YTCoveringGrid(YTSelectionContainer3D):
         if fields is None:
             return
         fields = self._determine_fields(ensure_list(fields))
+        if self._storage is not None:
+            stored = [
+                f for f in fields if f not in self.field_data and self._on_mesh(f)
+            ]
+            if len(stored) > 0:
+                self._fill_storage(stored)
         fields_to_get = [f for f in fields if f not in self.field_data]
         fields_to_get = self._identify_dependencies(fields_to_get)
         if len(fields_to_get) == 0:
@@ -967,8 +1098,7 @@ class YTCoveringGrid(YTSelectionContainer3D):
         if not iterable(self.ds.refine_by):
             refine_by = [refine_by, refine_by, refine_by]
         refine_by = np.array(refine_by, dtype="i8")
-        for chunk in parallel_objects(self._data_source.chunks(fields, "io")):
-            input_fields = [chunk[field] for field in fields]
+        for input_fields, icoords, ires in self._fill_cells(fields):
             # NOTE: This usage of "refine_by" is actually *okay*, because it's
             # being used with respect to iref, which is *already* scaled!
             fill_region(
@@ -976,18 +1106,118 @@ class YTCoveringGrid(YTSelectionContainer3D):
                 output_fields,
                 self.level,
                 self.global_startindex,
-                chunk.icoords,
-                chunk.ires,
+                icoords,
+                ires,
                 domain_dims,
                 refine_by,
             )
-        if self.comm.size > 1:
+        if self.comm.size > 1 and not self._from_neighbors:
             for i in range(len(fields)):
                 output_fields[i] = self.comm.mpi_allreduce(output_fields[i], op="sum")
         for name, v in zip(fields, output_fields):
             fi = self.ds._get_field_info(*name)
             self[name] = self.ds.arr(v, fi.units)
 
+    @property
+    def _from_neighbors(self):
+        # The ghost zones of a grid are filled from the grids around it
+        return self._base_grid is not None and hasattr(self.index, "_neighbor_cells")
+
+    def _fill_cells(self, fields):
+        # Yield the field values, icoords and ires of the cells to fill the
+        # covering grid with
+        if self._from_neighbors:
+            left_edge = self.left_edge.in_units("code_length").d
+            right_edge = self.right_edge.in_units("code_length").d
+            for level in range(self.level + 1):
+                yield from self.index._neighbor_cells(
+                    self._base_grid,
+                    fields,
+                    level,
+                    left_edge,
+                    right_edge,
+                    masked=level < self.level,
+                )
+            return
+        for chunk in parallel_objects(self._data_source.chunks(fields, "io")):
+            yield [chunk[field] for field in fields], chunk.icoords, chunk.ires
+
+    def _on_mesh(self, field):
+        # Is field defined on the cells of the covering grid, rather than
+        # being a list of particles?
+        finfo = self.ds._get_field_info(*field)
+        return finfo.sampling_type != "particle" or finfo.is_sph_field
+
+    def _storage_path(self, field):
+        return os.path.join(self._storage, "%s-%s.npy" % field)
+
+    def _slabs(self):
+        # The [start, end) ranges of cells along x of the slabs to fill
+        nx, ny, nz = (int(n) for n in self.ActiveDimensions)
+        slab_size = self._slab_size
+        if slab_size is None:
+            slab_size = _default_slab_cells // max(ny * nz, 1)
+        # Slabs must be thick enough for their ghost zones
+        slab_size = max(slab_size, 2 * self._num_ghost_zones + 2, 1)
+        return [(i, min(i + slab_size, nx)) for i in range(0, nx, slab_size)]
+
+    def _fill_storage(self, fields):
+        # Fill fields slab by slab, writing every slab straight into the
+        # memory-mapped files of the fields, then map the files.
+        shape = tuple(int(n) for n in self.ActiveDimensions)
+        if self.comm.rank == 0:
+            os.makedirs(self._storage, exist_ok=True)
+            for field in fields:
+                np.lib.format.open_memmap(
+                    self._storage_path(field), mode="w+", dtype="float64", shape=shape
+                ).flush()
+        self.comm.barrier()
+        slabs = self._slabs()
+        mylog.info(
+            "Filling %s slabs of covering grid in %s", len(slabs), self._storage
+        )
+        kwargs = {}
+        if self.comm.size == 1 and get_local_workers() > 1:
+            kwargs = {"njobs": get_local_workers(), "backend": "process"}
+        storage = {}
+        for sto, (start, end) in parallel_objects(slabs, storage=storage, **kwargs):
+            sto.result = self._fill_slab(fields, start, end)
+        # The units of the fields, as filled in the first slab
+        units = storage[0]
+        for field in fields:
+            values = np.load(self._storage_path(field), mmap_mode="c")
+            self[field] = self.ds.arr(values, units[field])
+
+    def _fill_slab(self, fields, start, end):
+        # Fill the cells [start, end) along x of fields with an in-memory
+        # covering grid padded by the ghost zones, and write them to the
+        # files of the fields.  Returns the units of the fields.
+        ngz = self._num_ghost_zones
+        nx = int(self.ActiveDimensions[0])
+        lo, hi = max(start - ngz, 0), min(end + ngz, nx)
+        dims = self.ActiveDimensions.copy()
+        dims[0] = hi - lo
+        left_edge = self.left_edge.copy()
+        left_edge[0] += lo * self.dds[0]
+        slab = self.__class__(
+            self.level,
+            left_edge,
+            dims,
+            ds=self.ds,
+            num_ghost_zones=ngz,
+            use_pbar=False,
+            field_parameters=self.field_parameters,
+        )
+        units = {}
+        for field in fields:
+            values = slab[field]
+            units[field] = str(values.units)
+            output = np.load(self._storage_path(field), mmap_mode="r+")
+            output[start:end] = values.d[start - lo : end - lo]
+            output.flush()
+            del output
+        return units
+
     def _generate_container_field(self, field):
         rv = self.ds.arr(np.ones(self.ActiveDimensions, dtype="float64"), "")
         axis_name = self.ds.coordinates.axis_name
@@ -1249,7 +1479,10 @@ class YTSmoothedCoveringGrid(YTCoveringGrid):
     Smoothed covering grids start at level 0, interpolating to
     fill the region to level 1, replacing any cells actually
     covered by level 1 data, and then recursively repeating this
-    process until it reaches the specified `level`.
+    process until it reaches the specified `level`.  On grid
+    datasets, the grids contributing to every level are looked up
+    at once from the index, and each of them is read only when its
+    level is filled.
 
     Parameters
     ----------
@@ -1340,7 +1573,6 @@ class YTSmoothedCoveringGrid(YTCoveringGrid):
         fields = [f for f in fields if f not in self.field_data]
         if len(fields) == 0:
             return
-        ls = self._initialize_level_state(fields)
         min_level = self._compute_minimum_level()
         # NOTE: This usage of "refine_by" is actually *okay*, because it's
         # being used with respect to iref, which is *already* scaled!
@@ -1348,67 +1580,116 @@ class YTSmoothedCoveringGrid(YTCoveringGrid):
         if not iterable(self.ds.refine_by):
             refine_by = [refine_by, refine_by, refine_by]
         refine_by = np.array(refine_by, dtype="i8")
-        for level in range(self.level + 1):
-            if level < min_level:
-                self._update_level_state(ls)
-                continue
-            nd = self.ds.dimensionality
-            refinement = np.zeros_like(ls.base_dx)
-            refinement += self.ds.relative_refinement(0, ls.current_level)
-            refinement[nd:] = 1
-            domain_dims = self.ds.domain_dimensions * refinement
-            domain_dims = domain_dims.astype("int64")
-            tot = ls.current_dims.prod()
-            for chunk in ls.data_source.chunks(fields, "io"):
-                chunk[fields[0]]
-                input_fields = [chunk[field] for field in fields]
+        boxes = [self._level_box(level) for level in range(min_level, self.level + 1)]
+        grids = self._level_grids(boxes)
+        # Every level is interpolated from the previous one and filled in
+        # turn, alternating between two buffers per field that are large
+        # enough for the finest level.
+        size = max(int(np.prod(box[2])) for box in boxes)
+        buffers = [(np.empty(size), np.empty(size)) for field in fields]
+        current = None
+        for i, (level, start_index, dims, domain_dims, _dx) in enumerate(boxes):
+            ncells = int(np.prod(dims))
+            output = [b[i % 2][:ncells].reshape(dims) for b in buffers]
+            if current is None:
+                for v in output:
+                    v.fill(-999)
+            else:
+                prev_level, prev_start_index = boxes[i - 1][:2]
+                rf = float(self.ds.relative_refinement(prev_level, level))
+                input_left = prev_start_index * rf + 1
+                output_left = start_index + 0.5
+                for input_field, output_field in zip(current, output):
+                    ghost_zone_interpolate(
+                        rf, input_field, input_left, output_field, output_left
+                    )
+            current = output
+            tot = ncells
+            for input_fields, icoords, ires in self._level_cells(
+                fields, boxes[i], grids
+            ):
                 tot -= fill_region(
                     input_fields,
-                    ls.fields,
-                    ls.current_level,
-                    ls.global_startindex,
-                    chunk.icoords,
-                    chunk.ires,
+                    current,
+                    level,
+                    start_index,
+                    icoords,
+                    ires,
                     domain_dims,
                     refine_by,
                 )
             if level == 0 and tot != 0:
                 raise RuntimeError
-            self._update_level_state(ls)
-        for name, v in zip(fields, ls.fields):
+        for name, v in zip(fields, current):
             if self.level > 0:
                 v = v[1:-1, 1:-1, 1:-1]
             fi = self.ds._get_field_info(*name)
-            self[name] = self.ds.arr(v, fi.units)
+            self[name] = self.ds.arr(v.copy(), fi.units)
 
-    def _initialize_level_state(self, fields):
-        ls = LevelState()
-        ls.domain_width = self.ds.domain_width
-        ls.domain_left_edge = self.ds.domain_left_edge
-        ls.domain_right_edge = self.ds.domain_right_edge
-        ls.base_dx = self._base_dx
-        ls.dds = self.dds
-        ls.left_edge = self.left_edge
-        ls.right_edge = self.right_edge
-        for att in (
-            "domain_width",
-            "domain_left_edge",
-            "domain_right_edge",
-            "left_edge",
-            "right_edge",
-            "base_dx",
-            "dds",
-        ):
-            setattr(ls, att, getattr(ls, att).in_units("code_length").d)
-        ls.current_dx = ls.base_dx
-        ls.current_level = 0
-        ls.global_startindex, end_index, idims = self._minimal_box(ls.current_dx)
-        ls.current_dims = idims.astype("int32")
-        ls.left_edge = ls.global_startindex * ls.current_dx + self.ds.domain_left_edge.d
-        ls.right_edge = ls.left_edge + ls.current_dims * ls.current_dx
-        ls.fields = [np.zeros(idims, dtype="float64") - 999 for field in fields]
-        self._setup_data_source(ls)
-        return ls
+    def _level_box(self, level):
+        # The level, start index, dimensions, domain dimensions and cell width
+        # of the box covered at level, with a buffer of one cell beyond the
+        # grid.
+        nd = self.ds.dimensionality
+        refinement = np.ones(3, dtype="float64")
+        refinement[:nd] = self.ds.relative_refinement(0, level)
+        dx = self._base_dx.in_units("code_length").d / refinement
+        start_index, end_index, dims = self._minimal_box(dx)
+        domain_dims = (self.ds.domain_dimensions * refinement).astype("int64")
+        return level, start_index, dims, domain_dims, dx
+
+    def _level_grids(self, boxes):
+        # The indices of the grids of every level that overlap the buffered
+        # box of their level, looked up at once from the grid edges and
+        # levels of the index rather than by selecting a region per level.
+        # Returns None when the index has no grids to look up.
+        if self._from_neighbors or not hasattr(self.index, "_grids_in_box"):
+            return None
+        grids = {}
+        for level, start_index, dims, _domain_dims, dx in boxes:
+            left_edge = start_index * dx + self.ds.domain_left_edge.d
+            right_edge = left_edge + dims * dx
+            grids[level] = self.index._grids_in_box(
+                left_edge - dx, right_edge + dx, level
+            )
+        return grids
+
+    def _level_cells(self, fields, box, grids=None):
+        # Yield the field values, icoords and ires of the cells of the level
+        # of box whose centers are within it, or within one cell of it.  All
+        # of them are needed, including those covered by finer levels, which
+        # still contribute to the interpolation.
+        level, start_index, dims, _domain_dims, dx = box
+        left_edge = start_index * dx + self.ds.domain_left_edge.d
+        right_edge = left_edge + dims * dx
+        if grids is not None:
+            yield from self.index._box_cells(
+                grids[level],
+                fields,
+                level,
+                left_edge - dx,
+                right_edge + dx,
+                loose=False,
+            )
+            return
+        if self._from_neighbors:
+            yield from self.index._neighbor_cells(
+                self._base_grid,
+                fields,
+                level,
+                left_edge - dx,
+                right_edge + dx,
+                loose=False,
+            )
+            return
+        data_source = self.ds.region(self.center, left_edge - dx, right_edge + dx)
+        data_source.min_level = level
+        data_source.max_level = level
+        for chunk in data_source.chunks(fields, "io"):
+            if chunk.ires.size == 0:
+                continue
+            input_fields = [chunk[field] for field in fields]
+            yield input_fields, chunk.icoords, chunk.ires
 
     def _minimal_box(self, dds):
         LL = self.left_edge.d - self.ds.domain_left_edge.d
@@ -1430,35 +1711,6 @@ class YTSmoothedCoveringGrid(YTCoveringGrid):
             dims = end_index - start_index + 1
         return start_index, end_index.astype("int64"), dims.astype("int32")
 
-    def _update_level_state(self, level_state):
-        ls = level_state
-        if ls.current_level >= self.level:
-            return
-        rf = float(self.ds.relative_refinement(ls.current_level, ls.current_level + 1))
-        ls.current_level += 1
-        nd = self.ds.dimensionality
-        refinement = np.zeros_like(ls.base_dx)
-        refinement += self.ds.relative_refinement(0, ls.current_level)
-        refinement[nd:] = 1
-        ls.current_dx = ls.base_dx / refinement
-        ls.old_global_startindex = ls.global_startindex
-        ls.global_startindex, end_index, ls.current_dims = self._minimal_box(
-            ls.current_dx
-        )
-        ls.left_edge = ls.global_startindex * ls.current_dx + self.ds.domain_left_edge.d
-        ls.right_edge = ls.left_edge + ls.current_dims * ls.current_dx
-        input_left = (level_state.old_global_startindex) * rf + 1
-        new_fields = []
-        for input_field in level_state.fields:
-            output_field = np.zeros(ls.current_dims, dtype="float64")
-            output_left = level_state.global_startindex + 0.5
-            ghost_zone_interpolate(
-                rf, input_field, input_left, output_field, output_left
-            )
-            new_fields.append(output_field)
-        level_state.fields = new_fields
-        self._setup_data_source(ls)
-
 
 class YTSurface(YTSelectionContainer3D):
     r"""This surface object identifies isocontours on a cell-by-cell basis,
@@ -0,0 +1,281 @@
+"""
+Parsing and evaluation of the conditionals of cut regions.
+
+The conditionals of a :class:`~yt.data_objects.selection_data_containers.YTCutRegion`
+are strings such as ``"obj['temperature'] < 1e3"``.  Rather than evaluating
+every string with ``eval`` for every chunk and block, they are parsed once into
+a tree of comparisons combined with ``&``, ``|`` and ``~``.  Comparisons are
+evaluated with ufuncs writing into preallocated boolean buffers, which are
+reused from one evaluation to the next, and combined in place.  Once a mask
+selects nothing, the remaining conditionals are not evaluated, so that their
+fields are not even read.  Anything that is not a comparison between a field
+and a value is compiled once and evaluated as a whole.
+
+"""
+import ast
+import threading
+
+import numpy as np
+
+from yt.utilities.exceptions import YTIllDefinedCutRegion
+
+_comparisons = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+# The comparison to apply when the operands are swapped
+_reflected = {
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+}
+
+
+class _ShapeMismatch(Exception):
+    pass
+
+
+def _uses_obj(node):
+    return any(isinstance(n, ast.Name) and n.id == "obj" for n in ast.walk(node))
+
+
+def _compile(node, source):
+    expr = ast.fix_missing_locations(ast.Expression(body=node))
+    return compile(expr, f"<cut region conditional {source!r}>", "eval")
+
+
+def _output(shape, out):
+    if out is None:
+        return np.empty(shape, dtype="bool")
+    if out.shape != shape:
+        raise _ShapeMismatch
+    return out
+
+
+class _Node:
+    def __init__(self, depth):
+        self.depth = depth
+
+    def evaluate(self, namespace, out, buffers):
+        # Write the mask of this node into out, or into a new array if out is
+        # None, and return it.
+        raise NotImplementedError
+
+    def and_into(self, namespace, out, buffers):
+        scratch = buffers.get(self.depth, out.shape)
+        np.logical_and(out, self.evaluate(namespace, scratch, buffers), out=out)
+
+    def or_into(self, namespace, out, buffers):
+        scratch = buffers.get(self.depth, out.shape)
+        np.logical_or(out, self.evaluate(namespace, scratch, buffers), out=out)
+
+
+class _Expression(_Node):
+    # Any expression returning a boolean array, evaluated by Python
+    def __init__(self, node, source, depth):
+        super().__init__(depth)
+        self.code = _compile(node, source)
+
+    def evaluate(self, namespace, out, buffers):
+        res = eval(self.code, namespace)
+        shape = np.shape(res)
+        if out is None:
+            return np.array(res, dtype="bool")
+        _output(shape, out)[...] = res
+        return out
+
+
+class _Comparison(_Node):
+    # A field (any expression involving obj) compared with a value (any
+    # expression that does not involve obj)
+    def __init__(self, field, op, value, source, depth):
+        super().__init__(depth)
+        self.field = _compile(field, source)
+        self.ufunc = _comparisons[op]
+        self.value = _compile(value, source)
+
+    def evaluate(self, namespace, out, buffers):
+        field = eval(self.field, namespace)
+        value = eval(self.value, namespace)
+        funits = getattr(field, "units", None)
+        vunits = getattr(value, "units", None)
+        # Comparisons between arrays with units convert the value to the
+        # units of the field; data without units, or dimensionless data, is
+        # compared as is.
+        if (
+            funits is not None
+            and vunits is not None
+            and funits != vunits
+            and not funits.is_dimensionless
+            and not vunits.is_dimensionless
+        ):
+            value = value.to(funits)
+        field = np.asarray(field).view(np.ndarray)
+        value = np.asarray(value).view(np.ndarray)
+        out = _output(field.shape, out)
+        self.ufunc(field, value, out=out)
+        return out
+
+
+class _And(_Node):
+    def __init__(self, children, depth):
+        super().__init__(depth)
+        self.children = children
+
+    def evaluate(self, namespace, out, buffers):
+        out = self.children[0].evaluate(namespace, out, buffers)
+        self._combine(namespace, out, buffers, self.children[1:])
+        return out
+
+    def and_into(self, namespace, out, buffers):
+        self._combine(namespace, out, buffers, self.children)
+
+    def _combine(self, namespace, out, buffers, children):
+        for child in children:
+            if not out.any():
+                # Nothing left to select
+                break
+            child.and_into(namespace, out, buffers)
+
+
+class _Or(_Node):
+    def __init__(self, children, depth):
+        super().__init__(depth)
+        self.children = children
+
+    def evaluate(self, namespace, out, buffers):
+        out = self.children[0].evaluate(namespace, out, buffers)
+        for child in self.children[1:]:
+            if out.all():
+                # Everything is already selected
+                break
+            child.or_into(namespace, out, buffers)
+        return out
+
+
+class _Not(_Node):
+    def __init__(self, child, depth):
+        super().__init__(depth)
+        self.child = child
+
+    def evaluate(self, namespace, out, buffers):
+        out = self.child.evaluate(namespace, out, buffers)
+        np.logical_not(out, out=out)
+        return out
+
+
+def _build(node, source, depth):
+    # Build the evaluation tree of the AST node of a conditional
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+        cls = _And if isinstance(node.op, ast.BitAnd) else _Or
+        children = []
+        for operand in (node.left, node.right):
+            child = _build(operand, source, depth + 1)
+            # Flatten a & b & c into a single node
+            if type(child) is cls:
+                children += child.children
+            else:
+                children.append(child)
+        for child in children:
+            child.depth = depth + 1
+        return cls(children, depth)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+        return _Not(_build(node.operand, source, depth + 1), depth)
+    if (
+        isinstance(node, ast.Compare)
+        and all(type(op) in _comparisons for op in node.ops)
+        and sum(_uses_obj(operand) for operand in [node.left] + node.comparators)
+        == 1
+    ):
+        # a < obj['x'] <= b is a < obj['x'] and obj['x'] <= b
+        operands = [node.left] + node.comparators
+        comparisons = []
+        for op, left, right in zip(node.ops, operands[:-1], operands[1:]):
+            op = type(op)
+            if _uses_obj(left):
+                comparisons.append(_Comparison(left, op, right, source, depth + 1))
+            elif _uses_obj(right):
+                comparisons.append(
+                    _Comparison(right, _reflected[op], left, source, depth + 1)
+                )
+            else:
+                comparisons.append(
+                    _Expression(
+                        ast.Compare(left=left, ops=[op()], comparators=[right]),
+                        source,
+                        depth + 1,
+                    )
+                )
+        if len(comparisons) == 1:
+            comparisons[0].depth = depth
+            return comparisons[0]
+        return _And(comparisons, depth)
+    return _Expression(node, source, depth)
+
+
+class _Buffers(threading.local):
+    # Scratch boolean arrays, one per depth of the evaluation tree, reused
+    # as long as the shape of the data does not change.
+    def __init__(self):
+        self.shape = None
+        self.arrays = {}
+
+    def get(self, depth, shape):
+        if shape != self.shape:
+            self.shape = shape
+            self.arrays = {}
+        arr = self.arrays.get(depth, None)
+        if arr is None:
+            arr = self.arrays[depth] = np.empty(shape, dtype="bool")
+        return arr
+
+
+class CutRegionConditions:
+    r"""
+    The conditionals of a cut region, parsed once and evaluated as a single
+    expression tree.
+
+    Parameters
+    ----------
+    conditionals : list of strings
+        The conditionals, which all have to be satisfied.  They have access to
+        ``obj``, the data object they are evaluated on.
+    """
+
+    def __init__(self, conditionals):
+        self.conditionals = list(conditionals)
+        nodes = []
+        for cond in self.conditionals:
+            tree = ast.parse(cond.strip(), mode="eval")
+            nodes.append(_build(tree.body, cond, 1))
+        if len(nodes) == 1:
+            nodes[0].depth = 0
+            self.root = nodes[0]
+        else:
+            self.root = _And(nodes, 0)
+        self._buffers = _Buffers()
+
+    def evaluate(self, obj, locals=None, mask=None):
+        """
+        Return the boolean mask of the elements of *obj* that satisfy all of
+        the conditionals.  If *mask* is given, it is combined with the
+        conditionals in place and returned.
+        """
+        namespace = dict(locals) if locals is not None else {}
+        namespace["obj"] = obj
+        try:
+            if mask is None:
+                return self.root.evaluate(namespace, None, self._buffers)
+            if mask.any():
+                self.root.and_into(namespace, mask, self._buffers)
+            return mask
+        except _ShapeMismatch:
+            raise YTIllDefinedCutRegion(self.conditionals) from None
@@ -1,4 +1,3 @@
-import itertools
 import os
 import uuid
 import weakref
@@ -21,6 +20,7 @@ from yt.funcs import (
     mylog,
     validate_width_tuple,
 )
+from yt.geometry.element_index import ElementIndex
 from yt.geometry.selection_routines import compose_selector
 from yt.units import dimensions as ytdims
 from yt.units.yt_array import YTArray, YTQuantity, uconcatenate
@@ -66,6 +66,13 @@ def sanitize_weight_field(ds, field, weight):
     return weight_field
 
 
+def _code_length(value):
+    # A length as a plain float in code units
+    if hasattr(value, "in_units"):
+        return float(value.in_units("code_length"))
+    return float(value)
+
+
 def _get_ipython_key_completion(ds):
     # tuple-completion (ftype, fname) was added in IPython 8.0.0
     # with earlier versions, completion works with fname only
@@ -1578,39 +1585,26 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
         chunk_ind = kwargs.pop("chunk_ind", None)
         if chunk_ind is not None:
             chunk_ind = ensure_list(chunk_ind)
-        for ci, chunk in enumerate(self.index._chunk(self, chunking_style, **kwargs)):
-            if chunk_ind is not None and ci not in chunk_ind:
-                continue
-            with self._chunked_read(chunk):
-                self.get_data(fields)
-                # NOTE: we yield before releasing the context
-                yield self
+        # prefetch is a list of fields whose on-disk dependencies may be read
+        # ahead for the next io chunks while the current one is processed.
+        prefetch = kwargs.pop("prefetch", None)
+        citer = self.index._chunk(self, chunking_style, **kwargs)
+        if prefetch and chunking_style == "io" and chunk_ind is None:
+            citer = self.index._prefetch_chunks(citer, self, prefetch)
+        try:
+            for ci, chunk in enumerate(citer):
+                if chunk_ind is not None and ci not in chunk_ind:
+                    continue
+                with self._chunked_read(chunk):
+                    self.get_data(fields)
+                    # NOTE: we yield before releasing the context
+                    yield self
+        finally:
+            if hasattr(citer, "close"):
+                citer.close()
 
     def _identify_dependencies(self, fields_to_get, spatial=False):
-        inspected = 0
-        fields_to_get = fields_to_get[:]
-        for field in itertools.cycle(fields_to_get):
-            if inspected >= len(fields_to_get):
-                break
-            inspected += 1
-            fi = self.ds._get_field_info(*field)
-            fd = self.ds.field_dependencies.get(
-                field, None
-            ) or self.ds.field_dependencies.get(field[1], None)
-            # This is long overdue.  Any time we *can't* find a field
-            # dependency -- for instance, if the derived field has been added
-            # after dataset instantiation -- let's just try to
-            # recalculate it.
-            if fd is None:
-                try:
-                    fd = fi.get_dependencies(ds=self.ds)
-                    self.ds.field_dependencies[field] = fd
-                except Exception:
-                    continue
-            requested = self._determine_fields(list(set(fd.requested)))
-            deps = [d for d in requested if d not in fields_to_get]
-            fields_to_get += deps
-        return sorted(fields_to_get)
+        return self.ds._field_graph.closure(fields_to_get, self)
 
     def get_data(self, fields=None):
         if self._current_chunk is None:
@@ -1695,12 +1689,22 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
             self.field_data[f].convert_to_units(finfos[f].output_units)
 
         fields_to_generate += gen_fluids + gen_particles
-        self._generate_fields(fields_to_generate)
+        self._generate_fields(fields_to_generate, keep=ofields)
         for field in list(self.field_data.keys()):
             if field not in ofields:
                 self.field_data.pop(field)
 
-    def _generate_fields(self, fields_to_generate):
+    def _generate_fields(self, fields_to_generate, keep=None):
+        # Fields are generated in dependency order, so that retrying after a
+        # GenerationInProgress is only needed for dependencies that could not
+        # be detected.  If *keep* is given, generated fields that are not in
+        # it are dropped as soon as every field needing them has been
+        # generated, to lower the peak memory usage.
+        graph = self.ds._field_graph
+        fields_to_generate, consumers = graph.generation_plan(
+            fields_to_generate, self
+        )
+        done = set()
         index = 0
         with self._field_lock():
             # At this point, we assume that any fields that are necessary to
@@ -1709,10 +1713,13 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
             # fields have a spatial requirement.  This will be checked inside
             # _generate_field, at which point additional dependencies may
             # actually be noted.
-            while any(f not in self.field_data for f in fields_to_generate):
+            while any(f not in done for f in fields_to_generate):
                 field = fields_to_generate[index % len(fields_to_generate)]
                 index += 1
+                if field in done:
+                    continue
                 if field in self.field_data:
+                    done.add(field)
                     continue
                 fi = self.ds._get_field_info(*field)
                 try:
@@ -1758,11 +1765,26 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface):
                     except UnitParseError:
                         raise YTFieldUnitParseError(fi)
                     self.field_data[field] = fd
+                    done.add(field)
+                    if keep is not None:
+                        self._release_dependencies(field, consumers, keep)
                 except GenerationInProgress as gip:
                     for f in gip.fields:
+                        # This may be an intermediate field we released early
+                        done.discard(f)
                         if f not in fields_to_generate:
                             fields_to_generate.append(f)
 
+    def _release_dependencies(self, field, consumers, keep):
+        # Drop the generated fields that *field* depended on and that no field
+        # still to be generated needs.
+        for dep in self.ds._field_graph.dependencies(field, self):
+            if dep not in consumers:
+                continue
+            consumers[dep] -= 1
+            if consumers[dep] <= 0 and dep not in keep:
+                self.field_data.pop(dep, None)
+
     def __or__(self, other):
         if not isinstance(other, YTSelectionContainer):
             raise YTBooleanObjectError(other)
@@ -1980,6 +2002,34 @@ class YTSelectionContainer2D(YTSelectionContainer):
     def _convert_field_name(self, field):
         return field
 
+    # (px array, spatial index) of the elements
+    _element_index = None
+
+    def _elements_in_window(self, bounds, period=None):
+        """
+        Return the sorted indices of the elements of this object (as given by
+        its px, py, pdx and pdy fields) that overlap the window *bounds*,
+        given as (xmin, xmax, ymin, ymax) in code units, or whose periodic
+        images do if *period* is given.
+
+        The elements are indexed by
+        :class:`~yt.geometry.element_index.ElementIndex` once, and the index
+        is kept until the px field changes, so that a window only examines
+        the elements around it.
+        """
+        px = self["px"]
+        index = self._element_index
+        if index is None or index[0] is not px:
+            index = self._element_index = (
+                px,
+                ElementIndex(px.d, self["py"].d, self["pdx"].d, self["pdy"].d),
+            )
+        # The window may be given with units, as by the plot callbacks
+        bounds = [_code_length(b) for b in bounds]
+        if period is not None:
+            period = [_code_length(p) for p in period]
+        return index[1].query(bounds, period)
+
     def _get_pw(self, fields, center, width, origin, plot_type):
         from yt.visualization.fixed_resolution import FixedResolutionBuffer as frb
         from yt.visualization.plot_window import PWViewerMPL, get_window_parameters
@@ -2841,6 +2891,7 @@ class YTSelectionContainer3D(YTSelectionContainer):
         else:
             cons = np.linspace(min_val, max_val, num_levels + 1)
         contours = {}
+        cached_fields = {}
         for level in range(num_levels):
             contours[level] = {}
             if cumulative:
@@ -2850,7 +2901,9 @@ class YTSelectionContainer3D(YTSelectionContainer):
             from yt.data_objects.level_sets.api import identify_contours
             from yt.data_objects.level_sets.clump_handling import add_contour_field
 
-            nj, cids = identify_contours(self, field, cons[level], mv)
+            nj, cids = identify_contours(
+                self, field, cons[level], mv, cached_fields=cached_fields
+            )
             unique_contours = set([])
             for sl_list in cids.values():
                 for _sl, ff in sl_list:
@@ -249,7 +249,6 @@ class AMRGridPatch(YTSelectionContainer):
             "dims": self.ActiveDimensions + 2 * n_zones,
             "num_ghost_zones": n_zones,
             "use_pbar": False,
-            "fields": fields,
         }
         # This should update the arguments to set the field parameters to be
         # those of this grid.
@@ -263,7 +262,9 @@ class AMRGridPatch(YTSelectionContainer):
             cube = self.ds.covering_grid(
                 level, new_left_edge, field_parameters=field_parameters, **kwargs
             )
+        # The cube is filled from the grids around this one
         cube._base_grid = self
+        cube.get_data(fields)
         return cube
 
     def get_vertex_centered_data(self, fields, smoothed=True, no_ghost=False):
@@ -389,17 +390,26 @@ class AMRGridPatch(YTSelectionContainer):
         yield self, mask
 
     def _get_selector_mask(self, selector):
-        if self._cache_mask and hash(selector) == self._last_selector_id:
-            mask = self._last_mask
+        selector_id = hash(selector)
+        if self._cache_mask and selector_id == self._last_selector_id:
+            return self._last_mask
+        cache = None
+        if self._cache_mask:
+            cache = getattr(self._index, "selector_masks", None)
+        entry = None
+        if cache is not None:
+            entry = cache.get((selector_id, self.id))
+        if entry is not None:
+            mask, count = entry
         else:
             mask = selector.fill_mask(self)
-            if self._cache_mask:
-                self._last_mask = mask
-            self._last_selector_id = hash(selector)
-            if mask is None:
-                self._last_count = 0
-            else:
-                self._last_count = mask.sum()
+            count = 0 if mask is None else mask.sum()
+            if cache is not None:
+                cache.put((selector_id, self.id), mask, count)
+        if self._cache_mask:
+            self._last_mask = mask
+        self._last_selector_id = selector_id
+        self._last_count = count
         return mask
 
     def select(self, selector, source, dest, offset):
@@ -58,6 +58,10 @@ class Clump(TreeContainer):
         if base is None:
             base = self
             self.total_clumps = 0
+            # The values of the clump field by grid, shared by the whole
+            # hierarchy while find_clumps runs, so that every level does not
+            # read them again.
+            self._cached_fields = None
 
         if clump_info is None:
             self.set_default_clump_info()
@@ -149,7 +153,13 @@ class Clump(TreeContainer):
         self.children = []
         if max_val is None:
             max_val = self.max_val
-        nj, cids = identify_contours(self.data, self.field, min_val, max_val)
+        nj, cids = identify_contours(
+            self.data,
+            self.field,
+            min_val,
+            max_val,
+            cached_fields=self.base._cached_fields,
+        )
         # Here, cids is the set of slices and values, keyed by the
         # parent_grid_id, that defines the contours.  So we can figure out all
         # the unique values of the contours by examining the list here.
@@ -411,19 +421,30 @@ class Clump(TreeContainer):
 
 
 def find_clumps(clump, min_val, max_val, d_clump):
+    # The values of the clump field are read once for the whole search, and
+    # dropped once it is done.
+    base = clump.base
+    base._cached_fields = {}
+    try:
+        _find_clumps(clump, min_val, max_val, d_clump)
+    finally:
+        base._cached_fields = None
+
+
+def _find_clumps(clump, min_val, max_val, d_clump):
     mylog.info("Finding clumps: min: %e, max: %e, step: %f", min_val, max_val, d_clump)
     if min_val >= max_val:
         return
     clump.find_children(min_val, max_val=max_val)
 
     if len(clump.children) == 1:
-        find_clumps(clump, min_val * d_clump, max_val, d_clump)
+        _find_clumps(clump, min_val * d_clump, max_val, d_clump)
 
     elif len(clump.children) > 0:
         these_children = []
         mylog.info("Investigating %d children.", len(clump.children))
         for child in clump.children:
-            find_clumps(child, min_val * d_clump, max_val, d_clump)
+            _find_clumps(child, min_val * d_clump, max_val, d_clump)
             if len(child.children) > 0:
                 these_children.append(child)
             elif child._validate():
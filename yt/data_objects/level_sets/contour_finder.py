@@ -2,37 +2,65 @@ from collections import defaultdict
 
 import numpy as np
 
-from yt.funcs import get_pbar, mylog
-from yt.utilities.lib.contour_finding import (
-    ContourTree,
-    TileContourTree,
-    link_node_contours,
-    update_joins,
-)
+from yt.funcs import mylog
+from yt.utilities.lib.contour_finding import TileContourTree, find_node_joins
 from yt.utilities.lib.partitioned_grid import PartitionedGrid
+from yt.utilities.parallel_tools.local_parallelism import (
+    get_local_workers,
+    local_parallel_map,
+)
 
 
 def identify_contours(data_source, field, min_val, max_val, cached_fields=None):
-    tree = ContourTree()
+    """
+    Identify the sets of connected cells of *data_source* whose values of
+    *field* are between *min_val* and *max_val*.
+
+    The tiles of the kd-tree of *data_source* are labelled independently,
+    by batches of tiles spread over the local workers (see
+    :func:`~yt.utilities.parallel_tools.local_parallelism.local_parallelism`),
+    and the contours that touch across tile boundaries are then merged with a
+    union-find over all the contour IDs.
+
+    Returns the number of contours and a dictionary mapping grid IDs to a
+    list of (slice, contour IDs) pairs, where contours are numbered from 1
+    and cells that do not belong to any contour have an ID of -1.  If
+    *cached_fields* is a dictionary, the values of *field* are read from it
+    and stored in it by grid, so that finding contours again (for instance at
+    the next level of a clump hierarchy) does not read them again.
+    """
     gct = TileContourTree(min_val, max_val)
     total_contours = 0
     contours = {}
     node_ids = []
     DLE = data_source.ds.domain_left_edge
     masks = dict((g.id, m) for g, m in data_source.blocks)
+    # Tiles are read serially, then labelled concurrently in batches
+    batch = []
+    batch_size = 4 * max(get_local_workers(), 1)
+
+    def _label(item):
+        values, contour_ids, mask = item
+        return gct.identify_contours(values, contour_ids, mask, 0)
+
+    def _label_batch():
+        nonlocal total_contours
+        counts = local_parallel_map(_label, batch)
+        for (_values, contour_ids, _mask), count in zip(batch, counts):
+            # Make the contour IDs of each tile globally unique
+            contour_ids[contour_ids > -1] += total_contours
+            total_contours += count
+        batch.clear()
+
     for (g, node, (sl, dims, gi)) in data_source.tiles.slice_traverse():
         g.field_parameters.update(data_source.field_parameters)
         node.node_ind = len(node_ids)
         nid = node.node_id
         node_ids.append(nid)
-        values = g[field][sl].astype("float64")
+        values = _tile_values(g, field, sl, cached_fields)
         contour_ids = np.zeros(dims, "int64") - 1
         mask = masks[g.id][sl].astype("uint8")
-        total_contours += gct.identify_contours(
-            values, contour_ids, mask, total_contours
-        )
-        new_contours = tree.cull_candidates(contour_ids)
-        tree.add_contours(new_contours)
+        batch.append((values, contour_ids, mask))
         # Now we can create a partitioned grid with the contours.
         LE = (DLE + g.dds * gi).in_units("code_length").ndarray_view()
         RE = LE + (dims * g.dds).in_units("code_length").ndarray_view()
@@ -40,30 +68,73 @@ def identify_contours(data_source, field, min_val, max_val, cached_fields=None):
             g.id, [contour_ids.view("float64")], mask, LE, RE, dims.astype("int64")
         )
         contours[nid] = (g.Level, node.node_ind, pg, sl)
+        if len(batch) >= batch_size:
+            _label_batch()
+    _label_batch()
     node_ids = np.array(node_ids).astype("int64")
     if node_ids.size == 0:
         return 0, {}
     trunk = data_source.tiles.tree.trunk
     mylog.info("Linking node (%s) contours.", len(contours))
-    link_node_contours(trunk, contours, tree, node_ids)
+    joins = find_node_joins(trunk, contours, node_ids)
     mylog.info("Linked.")
-    # joins = tree.cull_joins(bt)
-    # tree.add_joins(joins)
-    joins = tree.export()
+    used = np.zeros(total_contours + 1, dtype="bool")
+    for _level, _node_ind, pg, _sl in contours.values():
+        ff = pg.my_data[0].view("int64")
+        used[ff[ff > -1]] = True
+    ncontours, labels = _merge_contours(joins, used)
     contour_ids = defaultdict(list)
-    pbar = get_pbar("Updating joins ... ", len(contours))
-    final_joins = np.unique(joins[:, 1])
-    for i, nid in enumerate(sorted(contours)):
-        level, node_ind, pg, sl = contours[nid]
+    for nid in sorted(contours):
+        _level, _node_ind, pg, sl = contours[nid]
         ff = pg.my_data[0].view("int64")
-        update_joins(joins, ff, final_joins)
+        selected = ff > -1
+        ff[selected] = labels[ff[selected]]
         contour_ids[pg.parent_grid_id].append((sl, ff))
-        pbar.update(i)
-    pbar.finish()
     rv = dict()
     rv.update(contour_ids)
-    # NOTE: Because joins can appear in both a "final join" and a subsequent
-    # "join", we can't know for sure how many unique joins there are without
-    # checking if no cells match or doing an expensive operation checking for
-    # the unique set of final join values.
-    return final_joins.size, rv
+    return ncontours, rv
+
+
+def _tile_values(g, field, sl, cached_fields):
+    # The values of field in the tile sl of grid g
+    if cached_fields is None:
+        return g[field][sl].astype("float64")
+    key = (g.id, field)
+    values = cached_fields.get(key, None)
+    if values is None:
+        values = cached_fields[key] = g[field].astype("float64").ndarray_view()
+    return values[sl]
+
+
+def _merge_contours(joins, used):
+    """
+    Merge the contours connected by *joins*, an (N, 2) array of pairs of
+    contour IDs, with a union-find over all the IDs.  *used* flags the IDs
+    that are actually held by cells.
+
+    Returns the number of merged contours and an array mapping every contour
+    ID to its merged contour, numbered from 1 in the order of the smallest ID
+    it holds.
+    """
+    parent = np.arange(used.size, dtype="int64")
+    left, right = joins[:, 0], joins[:, 1]
+    while True:
+        # Every ID points to the root of its set, which is its smallest ID
+        root_left, root_right = parent[left], parent[right]
+        linked = root_left != root_right
+        if not linked.any():
+            break
+        # Hook the larger of the two roots of each join onto the smaller one
+        low = np.minimum(root_left[linked], root_right[linked])
+        high = np.maximum(root_left[linked], root_right[linked])
+        np.minimum.at(parent, high, low)
+        # Then flatten the trees by pointer jumping
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    roots = np.unique(parent[used])
+    labels = np.full(used.size, -1, dtype="int64")
+    labels[roots] = np.arange(1, roots.size + 1)
+    return roots.size, labels[parent]
@@ -5,12 +5,18 @@ import tempfile
 import numpy as np
 
 from yt.convenience import load
-from yt.data_objects.level_sets.api import Clump, add_clump_info, find_clumps
+from yt.data_objects.level_sets.api import (
+    Clump,
+    add_clump_info,
+    find_clumps,
+    identify_contours,
+)
 from yt.data_objects.level_sets.clump_info_items import clump_info_registry
 from yt.fields.derived_field import ValidateParameter
 from yt.frontends.stream.api import load_uniform_grid
 from yt.testing import assert_array_equal, assert_equal, requires_file
 from yt.utilities.answer_testing.framework import data_dir_load
+from yt.utilities.parallel_tools.local_parallelism import local_parallelism
 
 
 def test_clump_finding():
@@ -52,6 +58,8 @@ def test_clump_finding():
     master_clump.add_info_item("total_volume")
 
     find_clumps(master_clump, 0.5, 2.0 * high_rho, 10.0)
+    # the values of the clump field are not kept past the search
+    assert master_clump._cached_fields is None
 
     # there should be two children
     assert_equal(len(master_clump.children), 2)
@@ -81,6 +89,40 @@ def test_clump_finding():
     del clump_info_registry["total_volume"]
 
 
+def test_contours_across_grids():
+    n_c = 16
+    density = np.ones((n_c, n_c, n_c))
+    # A bar crossing every grid along x, and an isolated blob
+    density[:, 3, 3] = 10.0
+    density[10:12, 10:12, 10:12] = 10.0
+    ds = load_uniform_grid({"density": density}, density.shape, nprocs=8)
+    ad = ds.all_data()
+
+    results = []
+    for nworkers in (1, 4):
+        with local_parallelism(nworkers):
+            cached_fields = {}
+            for _ in range(2):
+                ncontours, cids = identify_contours(
+                    ad, ("gas", "density"), 5.0, 20.0, cached_fields=cached_fields
+                )
+                assert_equal(ncontours, 2)
+        # contour ID of every cell, by global cell index
+        labels = {}
+        for g in ds.index.grids:
+            vals = -np.ones(g.ActiveDimensions, dtype="int64")
+            for sl, ff in cids.get(g.id, []):
+                vals[sl] = ff
+            for idx in zip(*np.nonzero(vals > 0)):
+                labels[tuple(g.get_global_startindex() + idx)] = vals[idx]
+        results.append(labels)
+    assert_equal(results[0], results[1])
+    assert_equal(len(results[0]), n_c + 8)
+    # The bar is a single contour spanning several grids
+    bar = {v for (i, j, k), v in results[0].items() if j == 3 and k == 3}
+    assert_equal(len(bar), 1)
+
+
 i30 = "IsolatedGalaxy/galaxy0030/galaxy0030"
 
 
@@ -1,3 +1,4 @@
+import os
 from collections import OrderedDict
 
 import numpy as np
@@ -5,12 +6,165 @@ import numpy as np
 from yt.config import ytcfg
 from yt.data_objects.field_data import YTFieldData
 from yt.funcs import get_pbar, mylog
+from yt.geometry.grid_geometry_handler import GridIndex
 from yt.units.yt_array import array_like_field
 from yt.utilities.exceptions import YTIllDefinedParticleData
-from yt.utilities.lib.particle_mesh_operations import CICSample_3
+from yt.utilities.io_handler import _io_obj_key
 from yt.utilities.on_demand_imports import _h5py as h5py
 from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_root_only
 
+# Bump this whenever the layout of the particle ID sidecar files changes.
+_id_index_version = 1
+
+
+class ParticleIDIndex:
+    r"""
+    Locates particles of a dataset by their IDs, io chunk by io chunk.
+
+    Particles are found in the io chunks of ``ds.all_data()`` (one per data
+    file for particle datasets), and are identified by the number of the
+    chunk and their offset within it, so that their fields can then be read
+    from those chunks only.  The range of IDs held by every chunk that has
+    been read is stored in a sidecar file next to the dataset, so that later
+    lookups, from this session or another one, skip the chunks that cannot
+    hold any of the requested IDs without reading them.
+
+    Parameters
+    ----------
+    ds : ~yt.data_objects.static_output.Dataset
+        The dataset.
+    index_field : tuple
+        The full name of the particle ID field, such as
+        ``("all", "particle_index")``.
+    """
+
+    def __init__(self, ds, index_field):
+        self.ds = ds
+        self.index_field = index_field
+        self.filename = None
+        if os.path.isfile(ds.parameter_filename):
+            self.filename = f"{ds.parameter_filename}.yt_particle_ids.npz"
+        # chunk key -> (min ID, max ID)
+        self.ranges = {}
+        self._updated = False
+        self._load()
+
+    def _validation_key(self):
+        return np.array(
+            [str(_id_index_version), self.ds._hash(), "/".join(self.index_field)]
+        )
+
+    def _load(self):
+        if self.filename is None or not os.path.isfile(self.filename):
+            return
+        try:
+            with np.load(self.filename, allow_pickle=False) as data:
+                if not np.array_equal(data["key"], self._validation_key()):
+                    return
+                keys, ranges = data["chunks"], data["ranges"]
+        except (OSError, ValueError, EOFError, KeyError) as e:
+            mylog.warning(
+                "Ignoring unreadable particle ID index %s (%s)", self.filename, e
+            )
+            return
+        self.ranges = {k: (lo, hi) for k, (lo, hi) in zip(keys.tolist(), ranges)}
+
+    def save(self):
+        """Write the ID ranges to the sidecar file, if they were updated."""
+        if self.filename is None or not self._updated:
+            return
+        wdir = os.path.dirname(os.path.abspath(self.filename))
+        if not os.access(wdir, os.W_OK):
+            return
+        keys = sorted(self.ranges)
+        tmp_fn = f"{self.filename}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_fn, "wb") as f:
+                np.savez(
+                    f,
+                    key=self._validation_key(),
+                    chunks=np.array(keys, dtype="U"),
+                    ranges=np.array([self.ranges[k] for k in keys], dtype="int64"),
+                )
+            os.replace(tmp_fn, self.filename)
+        except OSError:
+            if os.path.exists(tmp_fn):
+                os.remove(tmp_fn)
+            return
+        self._updated = False
+
+    @staticmethod
+    def _chunk_key(chunk):
+        return repr(tuple(_io_obj_key(obj) for obj in chunk._current_chunk.objs))
+
+    def locate(self, indices, fields=()):
+        """
+        Find the particles whose IDs are in the sorted array *indices*.
+
+        Returns a list of (chunk number, offsets in the chunk, positions in
+        *indices*) for every io chunk holding some of the particles, and a
+        dictionary of the values of *fields* for the particles found, in the
+        same order.  Fields are read along with the IDs, so that locating
+        particles and reading their first fields takes a single pass.
+        """
+        indices = np.asarray(indices, dtype="int64")
+        locations = []
+        values = {field: [] for field in fields}
+        for i, chunk in enumerate(self.ds.all_data().chunks([], "io")):
+            key = self._chunk_key(chunk)
+            id_range = self.ranges.get(key, None)
+            if id_range is not None and not _any_in_range(indices, *id_range):
+                continue
+            ids = chunk[self.index_field].d.astype("int64")
+            if ids.size > 0:
+                id_range = (ids.min(), ids.max())
+            else:
+                id_range = (0, -1)
+            if self.ranges.get(key, None) != id_range:
+                self.ranges[key] = id_range
+                self._updated = True
+            offsets = np.flatnonzero(np.in1d(ids, indices))
+            if offsets.size == 0:
+                continue
+            locations.append((i, offsets, np.searchsorted(indices, ids[offsets])))
+            for field in fields:
+                values[field].append(chunk[field].d[offsets])
+        self.save()
+        return locations, _concatenate_values(values)
+
+    def read(self, locations, fields):
+        """
+        Read *fields* for the particles at *locations*, as returned by
+        :meth:`locate`, from the io chunks holding them only.
+        """
+        offsets = {i: chunk_offsets for i, chunk_offsets, _ in locations}
+        values = {field: [] for field in fields}
+        for i, chunk in enumerate(self.ds.all_data().chunks([], "io")):
+            if i not in offsets:
+                continue
+            for field in fields:
+                values[field].append(chunk[field].d[offsets[i]])
+        return _concatenate_values(values)
+
+
+def _any_in_range(indices, lo, hi):
+    # Does the sorted array indices hold any value in [lo, hi]?
+    return np.searchsorted(indices, lo, "left") < np.searchsorted(indices, hi, "right")
+
+
+def _location_rows(locations):
+    # The rows of the trajectory arrays of the particles found at locations
+    if len(locations) == 0:
+        return np.empty(0, dtype="int64")
+    return np.concatenate([rows for _, _, rows in locations])
+
+
+def _concatenate_values(values):
+    return {
+        field: np.concatenate(v) if len(v) > 0 else np.empty(0)
+        for field, v in values.items()
+    }
+
 
 class ParticleTrajectories:
     r"""A collection of particle trajectories in time over a series of
@@ -57,9 +211,9 @@ class ParticleTrajectories:
         indices.sort()  # Just in case the caller wasn't careful
         self.field_data = YTFieldData()
         self.data_series = outputs
-        self.masks = []
-        self.sorts = []
-        self.array_indices = []
+        # parameter filename -> (chunk number, offsets, rows) of the io chunks
+        # holding the particles, as found by ParticleIDIndex.locate
+        self.locations = {}
         self.indices = indices
         self.num_indices = len(indices)
         self.num_steps = len(outputs)
@@ -85,25 +239,27 @@ class ParticleTrajectories:
             "particle_position_z",
         ):
             fds[field] = self._get_full_field_name(field)[0]
+        self._index_field = fds["particle_index"]
+        position_fields = [f"particle_position_{ax}" for ax in "xyz"]
 
         my_storage = {}
         pbar = get_pbar("Constructing trajectory information", len(self.data_series))
         for i, (sto, ds) in enumerate(self.data_series.piter(storage=my_storage)):
-            dd = ds.all_data()
-            newtags = dd[fds["particle_index"]].d.astype("int64")
-            mask = np.in1d(newtags, indices, assume_unique=True)
-            sort = np.argsort(newtags[mask])
-            array_indices = np.where(np.in1d(indices, newtags, assume_unique=True))[0]
-            self.array_indices.append(array_indices)
-            self.masks.append(mask)
-            self.sorts.append(sort)
-
-            pfields = {}
-            for field in (f"particle_position_{ax}" for ax in "xyz"):
-                pfields[field] = dd[fds[field]].ndarray_view()[mask][sort]
+            # Only the io chunks holding some of the particles are read, along
+            # with their positions.
+            id_index = ParticleIDIndex(ds, self._index_field)
+            locations, values = id_index.locate(
+                indices, [fds[field] for field in position_fields]
+            )
+            rows = _location_rows(locations)
+            if np.unique(rows).size != rows.size:
+                raise YTIllDefinedParticleData(
+                    "This dataset contains duplicate particle indices!"
+                )
+            pfields = {field: values[fds[field]] for field in position_fields}
 
             sto.result_id = ds.parameter_filename
-            sto.result = (ds.current_time, array_indices, pfields)
+            sto.result = (ds.current_time, locations, pfields)
             pbar.update(i)
         pbar.finish()
 
@@ -113,23 +269,16 @@ class ParticleTrajectories:
         sorted_storage = sorted(my_storage.items())
         times = [time for _fn, (time, *_) in sorted_storage]
         self.times = self.data_series[0].arr(times, times[0].units)
+        for fn, (_time, locations, _pfields) in sorted_storage:
+            self.locations[fn] = locations
 
         self.particle_fields = []
-        output_field = np.empty((self.num_indices, self.num_steps))
-        output_field.fill(np.nan)
-        for field in (f"particle_position_{ax}" for ax in "xyz"):
-            for i, (_fn, (_time, indices, pfields)) in enumerate(sorted_storage):
-                try:
-                    # This will fail if particles ids are
-                    # duplicate. This is due to the fact that the rhs
-                    # would then have a different shape as the lhs
-                    output_field[indices, i] = pfields[field]
-                except ValueError:
-                    raise YTIllDefinedParticleData(
-                        "This dataset contains duplicate particle indices!"
-                    )
+        for field in position_fields:
+            output_field = np.full((self.num_indices, self.num_steps), np.nan)
+            for i, (_fn, (_time, locations, pfields)) in enumerate(sorted_storage):
+                output_field[_location_rows(locations), i] = pfields[field]
             self.field_data[field] = array_like_field(
-                dd_first, output_field.copy(), fds[field]
+                dd_first, output_field, fds[field]
             )
             self.particle_fields.append(field)
 
@@ -236,6 +385,8 @@ class ParticleTrajectories:
         grid_fields = [
             field for field in missing_fields if field not in self.particle_fields
         ]
+        # Trajectory arrays are ordered by parameter filename
+        columns = {fn: i for i, fn in enumerate(sorted(self.locations))}
         step = int(0)
         pbar = get_pbar(
             f"Generating [{', '.join(missing_fields)}] fields in trajectories",
@@ -243,54 +394,59 @@ class ParticleTrajectories:
         )
         my_storage = {}
 
-        for i, (sto, ds) in enumerate(self.data_series.piter(storage=my_storage)):
-            mask = self.masks[i]
-            sort = self.sorts[i]
+        for sto, ds in self.data_series.piter(storage=my_storage):
+            locations = self.locations[ds.parameter_filename]
             pfield = {}
 
             if new_particle_fields:  # there's at least one particle field
-                dd = ds.all_data()
+                # Read the particle fields from the io chunks holding the
+                # tracked particles only.
+                id_index = ParticleIDIndex(ds, self._index_field)
+                values = id_index.read(
+                    locations, [fds[field] for field in new_particle_fields]
+                )
                 for field in new_particle_fields:
-                    # This is easy... just get the particle fields
-                    pfield[field] = dd[fds[field]].d[mask][sort]
+                    pfield[field] = values[fds[field]]
 
+            gfield = {}
             if grid_fields:
-                # This is hard... must loop over grids
-                for field in grid_fields:
-                    pfield[field] = np.zeros(self.num_indices)
-                x = self["particle_position_x"][:, step].d
-                y = self["particle_position_y"][:, step].d
-                z = self["particle_position_z"][:, step].d
-                particle_grids, particle_grid_inds = ds.index._find_points(x, y, z)
-
-                # This will fail for non-grid index objects
-                for grid in particle_grids:
-                    cube = grid.retrieve_ghost_zones(1, grid_fields)
-                    for field in grid_fields:
-                        CICSample_3(
-                            x,
-                            y,
-                            z,
-                            pfield[field],
-                            self.num_indices,
-                            cube[fds[field]],
-                            np.array(grid.LeftEdge).astype(np.float64),
-                            np.array(grid.ActiveDimensions).astype(np.int32),
-                            grid.dds[0],
-                        )
+                # Sample the mesh fields at the positions of the particles,
+                # reading each grid or oct domain that holds particles once.
+                # Grid fields are interpolated between cell centers; octree
+                # frontends take the value of the cell holding each particle.
+                column = columns[ds.parameter_filename]
+                coords = np.stack(
+                    [self[f"particle_position_{ax}"][:, column].d for ax in "xyz"],
+                    axis=-1,
+                )
+                valid = np.all(np.isfinite(coords), axis=1)
+                values = ds.find_field_values_at_points(
+                    [fds[field] for field in grid_fields],
+                    coords[valid],
+                    interpolate=isinstance(ds.index, GridIndex),
+                )
+                if len(grid_fields) == 1:
+                    values = [values]
+                for field, vals in zip(grid_fields, values):
+                    gfield[field] = np.full(self.num_indices, np.nan)
+                    gfield[field][valid] = vals.d
             sto.result_id = ds.parameter_filename
-            sto.result = (self.array_indices[i], pfield)
+            sto.result = (_location_rows(locations), pfield, gfield)
             pbar.update(step)
             step += 1
         pbar.finish()
 
-        output_field = np.empty((self.num_indices, self.num_steps))
-        output_field.fill(np.nan)
+        sorted_storage = sorted(my_storage.items())
         for field in missing_fields:
-            fd = fds[field]
-            for i, (_fn, (indices, pfield)) in enumerate(sorted(my_storage.items())):
-                output_field[indices, i] = pfield[field]
-            self.field_data[field] = array_like_field(dd_first, output_field.copy(), fd)
+            output_field = np.full((self.num_indices, self.num_steps), np.nan)
+            for i, (_fn, (rows, pfield, gfield)) in enumerate(sorted_storage):
+                if field in gfield:
+                    output_field[:, i] = gfield[field]
+                else:
+                    output_field[rows, i] = pfield[field]
+            self.field_data[field] = array_like_field(
+                dd_first, output_field, fds[field]
+            )
 
         if self.suppress_logging:
             mylog.setLevel(old_level)
@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 
 from yt.data_objects.field_data import YTFieldData
@@ -6,6 +8,7 @@ from yt.frontends.ytdata.utilities import save_as_dataset
 from yt.funcs import (
     ensure_list,
     get_output_filename,
+    get_pbar,
     issue_deprecation_warning,
     iterable,
     mylog,
@@ -27,6 +30,7 @@ from yt.utilities.parallel_tools.parallel_analysis_interface import (
     ParallelAnalysisInterface,
     parallel_objects,
 )
+from yt.utilities.result_cache import result_cache, result_key
 
 
 def _sanitize_min_max_units(amin, amax, finfo, registry):
@@ -77,6 +81,11 @@ class ProfileFieldAccumulator:
 class ProfileND(ParallelAnalysisInterface):
     """The profile object class"""
 
+    # If set, each io chunk is binned in batches of at most this many
+    # elements, bounding the size of the temporary arrays used for binning,
+    # and the progress and throughput of the profile are reported.
+    batch_size = None
+
     def __init__(self, data_source, weight_field=None):
         self.data_source = data_source
         self.ds = data_source.ds
@@ -114,11 +123,78 @@ been deprecated, use profile.standard_deviation instead."""
         for f in fields:
             self.field_info[f] = self.data_source.ds.field_info[f]
         temp_storage = ProfileFieldAccumulator(len(fields), self.size)
-        citer = self.data_source.chunks([], "io")
-        for chunk in parallel_objects(citer):
-            self._bin_chunk(chunk, fields, temp_storage)
+        key = None
+        if result_cache.enabled:
+            key = self._result_key(fields)
+            entry = result_cache.get(key)
+            if entry is not None:
+                mylog.info("Using cached profile of %s", fields)
+                for name in vars(temp_storage):
+                    setattr(temp_storage, name, entry[name])
+                self._finalize_storage(fields, temp_storage)
+                return
+        prefetch = list(self.bin_fields) + fields
+        if self.weight_field is not None:
+            prefetch.append(self.weight_field)
+        citer = self.data_source.chunks([], "io", prefetch=prefetch)
+        if self.batch_size is None:
+            for chunk in parallel_objects(citer):
+                self._bin_chunk(chunk, fields, temp_storage)
+        else:
+            self._bin_batches(parallel_objects(citer), fields, temp_storage)
+        if key is not None:
+            result_cache.put(key, vars(temp_storage))
         self._finalize_storage(fields, temp_storage)
 
+    def _result_key(self, fields):
+        # The binned (but not yet combined across processors) values of
+        # *fields* depend on all of these.
+        ds = self.data_source.ds
+        units = [str(ds._get_field_info(field).units) for field in fields]
+        return result_key(
+            ds,
+            "profile",
+            type(self).__name__,
+            self.data_source,
+            self.bin_fields,
+            [getattr(self, f"{ax}_bins", None) for ax in "xyz"],
+            fields,
+            units,
+            self.weight_field,
+            getattr(self, "deposition", None),
+            self.comm.rank,
+            self.comm.size,
+            fields=list(fields) + list(self.bin_fields) + [self.weight_field],
+        )
+
+    def _bin_batches(self, chunks, fields, storage):
+        # The streaming mode: chunks are binned batch_size elements at a
+        # time and fed into the same accumulator.
+        source = getattr(self.data_source, "base_object", self.data_source)
+        pbar = None
+        nobjs = nelements = 0
+        t0 = time.time()
+        for chunk in chunks:
+            if pbar is None:
+                # The io objects are only known once chunking has started.
+                pbar = get_pbar("Profiling", len(getattr(source, "_chunk_info", ())))
+            size = chunk[self.bin_fields[0]].shape[0]
+            for start in range(0, size, self.batch_size):
+                sl = slice(start, start + self.batch_size)
+                self._bin_chunk(chunk, fields, storage, sl)
+            nelements += size
+            nobjs += len(getattr(chunk._current_chunk, "objs", ()))
+            pbar.update(nobjs)
+        if pbar is not None:
+            pbar.finish()
+        elapsed = time.time() - t0
+        mylog.info(
+            "Profiled %s elements in %0.2f s (%0.3e elements per second)",
+            nelements,
+            elapsed,
+            nelements / max(elapsed, 1e-9),
+        )
+
     def set_field_unit(self, field, new_unit):
         """Sets a new unit for the requested field
 
@@ -224,7 +300,7 @@ been deprecated, use profile.standard_deviation instead."""
             else:
                 self.field_map[field] = field
 
-    def _bin_chunk(self, chunk, fields, storage):
+    def _bin_chunk(self, chunk, fields, storage, sl=slice(None)):
         raise NotImplementedError
 
     def _filter(self, bin_fields):
@@ -236,10 +312,11 @@ been deprecated, use profile.standard_deviation instead."""
             pfilter &= data < ma
         return pfilter, [data[pfilter] for data in bin_fields]
 
-    def _get_data(self, chunk, fields):
+    def _get_data(self, chunk, fields, sl=slice(None)):
         # We are using chunks now, which will manage the field parameters and
-        # the like.
-        bin_fields = [chunk[bf] for bf in self.bin_fields]
+        # the like.  Only the elements of the chunk in the slice *sl* are
+        # returned.
+        bin_fields = [chunk[bf][sl] for bf in self.bin_fields]
         for i in range(1, len(bin_fields)):
             if bin_fields[0].shape != bin_fields[i].shape:
                 raise YTProfileDataShape(
@@ -255,22 +332,24 @@ been deprecated, use profile.standard_deviation instead."""
             return None
         arr = np.zeros((bin_fields[0].size, len(fields)), dtype="float64")
         for i, field in enumerate(fields):
-            if pfilter.shape != chunk[field].shape:
+            data = chunk[field][sl]
+            if pfilter.shape != data.shape:
                 raise YTProfileDataShape(
-                    self.bin_fields[0], bin_fields[0].shape, field, chunk[field].shape
+                    self.bin_fields[0], bin_fields[0].shape, field, data.shape
                 )
             units = chunk.ds.field_info[field].output_units
-            arr[:, i] = chunk[field][pfilter].in_units(units)
+            arr[:, i] = data[pfilter].in_units(units)
         if self.weight_field is not None:
-            if pfilter.shape != chunk[self.weight_field].shape:
+            data = chunk[self.weight_field][sl]
+            if pfilter.shape != data.shape:
                 raise YTProfileDataShape(
                     self.bin_fields[0],
                     bin_fields[0].shape,
                     self.weight_field,
-                    chunk[self.weight_field].shape,
+                    data.shape,
                 )
             units = chunk.ds.field_info[self.weight_field].output_units
-            weight_data = chunk[self.weight_field].in_units(units)
+            weight_data = data.in_units(units)
         else:
             weight_data = np.ones(pfilter.shape, dtype="float64")
         weight_data = weight_data[pfilter]
@@ -510,8 +589,8 @@ class Profile1D(ProfileND):
         self.bin_fields = (self.x_field,)
         self.x = 0.5 * (self.x_bins[1:] + self.x_bins[:-1])
 
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
+    def _bin_chunk(self, chunk, fields, storage, sl=slice(None)):
+        rv = self._get_data(chunk, fields, sl)
         if rv is None:
             return
         fdata, wdata, (bf_x,) = rv
@@ -764,8 +843,8 @@ class Profile2D(ProfileND):
         self.x = 0.5 * (self.x_bins[1:] + self.x_bins[:-1])
         self.y = 0.5 * (self.y_bins[1:] + self.y_bins[:-1])
 
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
+    def _bin_chunk(self, chunk, fields, storage, sl=slice(None)):
+        rv = self._get_data(chunk, fields, sl)
         if rv is None:
             return
         fdata, wdata, (bf_x, bf_y) = rv
@@ -925,8 +1004,8 @@ class ParticleProfile(Profile2D):
 
     # Either stick the particle field in the nearest bin,
     # or spread it out using the 2D CIC deposition function
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
+    def _bin_chunk(self, chunk, fields, storage, sl=slice(None)):
+        rv = self._get_data(chunk, fields, sl)
         if rv is None:
             return
         fdata, wdata, (bf_x, bf_y) = rv
@@ -1101,8 +1180,8 @@ class Profile3D(ProfileND):
         self.y = 0.5 * (self.y_bins[1:] + self.y_bins[:-1])
         self.z = 0.5 * (self.z_bins[1:] + self.z_bins[:-1])
 
-    def _bin_chunk(self, chunk, fields, storage):
-        rv = self._get_data(chunk, fields)
+    def _bin_chunk(self, chunk, fields, storage, sl=slice(None)):
+        rv = self._get_data(chunk, fields, sl)
         if rv is None:
             return
         fdata, wdata, (bf_x, bf_y, bf_z) = rv
@@ -1200,6 +1279,7 @@ def create_profile(
     fractional=False,
     deposition="ngp",
     override_bins=None,
+    batch_size=None,
 ):
     r"""
     Create a 1, 2, or 3D profile object.
@@ -1253,7 +1333,12 @@ def create_profile(
         If set, ignores n_bins and extrema settings and uses the
         supplied bins to profile the field. If a units dict is provided,
         bins are understood to be in the units specified in the dictionary.
-
+    batch_size : int
+        If set, the profile is computed in streaming mode: each chunk of data
+        is binned at most batch_size elements at a time, which bounds the
+        memory used on top of the data being read, and the progress and
+        throughput of the profile are reported.
+        Default: None.
 
     Examples
     --------
@@ -1456,6 +1541,7 @@ def create_profile(
     obj = cls(*args, **kwargs)
     obj.accumulation = accumulation
     obj.fractional = fractional
+    obj.batch_size = batch_size
     if fields is not None:
         obj.add_fields([field for field in fields])
     for field in fields:
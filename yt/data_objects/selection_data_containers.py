@@ -1,5 +1,6 @@
 import numpy as np
 
+from yt.data_objects.cut_region_conditions import CutRegionConditions
 from yt.data_objects.data_containers import (
     YTSelectionContainer,
     YTSelectionContainer0D,
@@ -25,12 +26,7 @@ from yt.funcs import (
 )
 from yt.geometry.selection_routines import points_in_cells
 from yt.units.yt_array import YTArray, YTQuantity, udot, unorm
-from yt.utilities.exceptions import (
-    YTEllipsoidOrdering,
-    YTException,
-    YTIllDefinedCutRegion,
-    YTSphereTooSmall,
-)
+from yt.utilities.exceptions import YTEllipsoidOrdering, YTException, YTSphereTooSmall
 from yt.utilities.lib.pixelization_routines import SPHKernelInterpolationTable
 from yt.utilities.math_utils import get_rotation_matrix
 from yt.utilities.minimal_representation import MinimalSliceData
@@ -1068,6 +1064,7 @@ class YTCutRegion(YTSelectionContainer3D):
             # and set the source to be its source.
             # Preserve order of conditionals.
             self.conditionals = data_source.conditionals + self.conditionals
+            locals = {**data_source.locals, **locals}
             data_source = data_source.base_object
 
         super(YTCutRegion, self).__init__(
@@ -1076,17 +1073,26 @@ class YTCutRegion(YTSelectionContainer3D):
         self.base_object = data_source
         self.locals = locals
         self._selector = None
+        self._conditions = None
         # Need to interpose for __getitem__, fwidth, fcoords, icoords, iwidth,
         # ires and get_data
 
     def chunks(self, fields, chunking_style, **kwargs):
         # We actually want to chunk the sub-chunk, not ourselves.  We have no
         # chunks to speak of, as we do not data IO.
-        for chunk in self.index._chunk(self.base_object, chunking_style, **kwargs):
-            with self.base_object._chunked_read(chunk):
-                with self._chunked_read(chunk):
-                    self.get_data(fields)
-                    yield self
+        prefetch = kwargs.pop("prefetch", None)
+        citer = self.index._chunk(self.base_object, chunking_style, **kwargs)
+        if prefetch and chunking_style == "io":
+            citer = self.index._prefetch_chunks(citer, self.base_object, prefetch)
+        try:
+            for chunk in citer:
+                with self.base_object._chunked_read(chunk):
+                    with self._chunked_read(chunk):
+                        self.get_data(fields)
+                        yield self
+        finally:
+            if hasattr(citer, "close"):
+                citer.close()
 
     def get_data(self, fields=None):
         fields = ensure_list(fields)
@@ -1104,36 +1110,33 @@ class YTCutRegion(YTSelectionContainer3D):
     def blocks(self):
         # We have to take a slightly different approach here.  Note that all
         # that .blocks has to yield is a 3D array and a mask.
+        conditions = self._get_conditions()
         for obj, m in self.base_object.blocks:
             m = m.copy()
             with obj._field_parameter_state(self.field_parameters):
-                for cond in self.conditionals:
-                    ss = eval(cond)
-                    m = np.logical_and(m, ss, m)
+                m = conditions.evaluate(obj, self.locals, mask=m)
             if not np.any(m):
                 continue
             yield obj, m
 
-    @property
-    def _cond_ind(self):
-        ind = None
-        obj = self.base_object
-        locals = self.locals.copy()
-        if "obj" in locals:
+    def _get_conditions(self):
+        # The conditionals, parsed once into a CutRegionConditions
+        if "obj" in self.locals:
             raise RuntimeError(
                 "'obj' has been defined in the 'locals' ; "
                 "this is not supported, please rename the variable."
             )
-        locals["obj"] = obj
+        conditions = self._conditions
+        if conditions is None or conditions.conditionals != self.conditionals:
+            conditions = self._conditions = CutRegionConditions(self.conditionals)
+        return conditions
+
+    @property
+    def _cond_ind(self):
+        conditions = self._get_conditions()
+        obj = self.base_object
         with obj._field_parameter_state(self.field_parameters):
-            for cond in self.conditionals:
-                res = eval(cond, locals)
-                if ind is None:
-                    ind = res
-                if ind.shape != res.shape:
-                    raise YTIllDefinedCutRegion(self.conditionals)
-                np.logical_and(res, ind, ind)
-        return ind
+            return conditions.evaluate(obj, self.locals)
 
     def _part_ind_KDTree(self, ptype):
         """Find the particles in cells using a KDTree approach."""
@@ -15,6 +15,7 @@ from yt.data_objects.particle_filters import filter_registry
 from yt.data_objects.particle_unions import ParticleUnion
 from yt.data_objects.region_expression import RegionExpression
 from yt.fields.derived_field import ValidateSpatial
+from yt.fields.field_dependency_graph import FieldDependencyGraph
 from yt.fields.field_type_container import FieldTypeContainer
 from yt.fields.fluid_fields import setup_gradient_fields
 from yt.fields.particle_fields import DEP_MSG_SMOOTH_FIELD
@@ -563,6 +564,17 @@ class Dataset:
     def field_list(self):
         return self.index.field_list
 
+    _field_graph_instance = None
+
+    @property
+    def _field_graph(self):
+        # The memoized dependency graph of our fields; it is rebuilt whenever
+        # the field dependencies are reset by create_field_info.
+        graph = self._field_graph_instance
+        if graph is None or graph.field_dependencies is not self.field_dependencies:
+            graph = self._field_graph_instance = FieldDependencyGraph(self)
+        return graph
+
     def create_field_info(self):
         self.field_dependencies = {}
         self.derived_field_list = []
@@ -978,18 +990,29 @@ class Dataset:
         else:
             return ret
 
-    def find_field_values_at_points(self, fields, coords):
+    def find_field_values_at_points(self, fields, coords, interpolate=False):
         """
         Returns the values [field1, field2,...] of the fields at the given
         [(x1, y1, z2), (x2, y2, z2),...] points.  Returns a list of field
         values in the same order as the input *fields*.
 
+        Grid and octree indices sample all the points in a single pass,
+        reading each grid or oct domain that contains points once.  With
+        *interpolate* set to True, values are trilinearly interpolated
+        between cell centers instead of taken from the containing cell; this
+        is only available for grid indices.
+
         """
         # If an optimized version exists on the Index object we'll use that
-        try:
-            return self.index._find_field_values_at_points(fields, coords)
-        except AttributeError:
-            pass
+        if hasattr(self.index, "_find_field_values_at_points"):
+            return self.index._find_field_values_at_points(
+                fields, coords, interpolate=interpolate
+            )
+        if interpolate:
+            raise NotImplementedError(
+                "Interpolation of field values at points is not implemented "
+                f"for {type(self.index).__name__}."
+            )
 
         fields = ensure_list(fields)
         out = []
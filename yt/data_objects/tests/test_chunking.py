@@ -1,3 +1,7 @@
+import numpy as np
+
+import yt
+from yt.config import ytcfg
 from yt.testing import assert_equal, assert_true, fake_random_ds
 from yt.units.yt_array import uconcatenate
 
@@ -56,3 +60,53 @@ def test_ds_hold():
     assert_true(dd.ds.__hash__() == ds1.__hash__())
     assert_true(dd.index is ds1.index)
     assert_equal(dd["ones"].size, 64 ** 3)
+
+
+def test_local_parallelism():
+    from yt.utilities.parallel_tools.local_parallelism import local_parallelism
+
+    ds = fake_random_ds(32, nprocs=8, particles=32 ** 3)
+    for dobj in [ds.all_data(), ds.sphere("c", (0.3, "unitary"))]:
+        serial = dobj["gas", "density"], dobj["all", "particle_mass"]
+        dobj.clear_data()
+        with local_parallelism(4):
+            threaded = dobj["gas", "density"], dobj["all", "particle_mass"]
+        assert_equal(serial[0], threaded[0])
+        assert_equal(serial[1], threaded[1])
+
+
+def test_chunk_prefetch():
+    from yt.geometry.geometry_handler import PrefetchChunkIterator
+
+    ds = fake_random_ds(32, nprocs=8, particles=32 ** 3)
+    dd = ds.all_data()
+    fields = [("gas", "density"), ("all", "particle_mass")]
+    ref = [np.concatenate([chunk[f] for chunk in dd.chunks([], "io")]) for f in fields]
+    old_depth = ytcfg.get("yt", "chunk_prefetch_depth")
+    ytcfg["yt", "chunk_prefetch_depth"] = "2"
+    try:
+        citer = ds.index._prefetch_chunks(ds.index._chunk_io(dd), dd, fields)
+        assert isinstance(citer, PrefetchChunkIterator)
+        citer.close()
+        values = {f: [] for f in fields}
+        for chunk in dd.chunks([], "io", prefetch=fields):
+            for f in fields:
+                values[f].append(chunk[f])
+        prof = yt.create_profile(dd, ("gas", "density"), ("gas", "velocity_x"))
+    finally:
+        ytcfg["yt", "chunk_prefetch_depth"] = old_depth
+    for f, r in zip(fields, ref):
+        assert_equal(np.concatenate(values[f]), r)
+    ref_prof = yt.create_profile(dd, ("gas", "density"), ("gas", "velocity_x"))
+    assert_equal(prof["gas", "velocity_x"], ref_prof["gas", "velocity_x"])
+    # Particle chunks are charged the size of the data read from them, so a
+    # budget of one byte never lets more than one chunk be read ahead
+    particles = [("all", "particle_mass")]
+    citer = PrefetchChunkIterator(
+        ds.index._chunk_io(dd), ds.index.io, dd.selector, [], particles, 4, 1
+    )
+    nchunks = 0
+    for chunk in citer:
+        assert len(citer._pending) <= 1
+        nchunks += 1
+    assert_equal(nchunks, len(list(ds.index._chunk_io(dd))))
@@ -1,3 +1,7 @@
+import os
+import shutil
+import tempfile
+
 import numpy as np
 
 from yt.convenience import load
@@ -7,6 +11,7 @@ from yt.testing import (
     assert_almost_equal,
     assert_array_equal,
     assert_equal,
+    fake_amr_ds,
     fake_octree_ds,
     fake_random_ds,
     requires_file,
@@ -154,6 +159,70 @@ def test_smoothed_covering_grid():
                     assert_equal(f, g["density"])
 
 
+def test_smoothed_covering_grid_amr():
+    ds = fake_amr_ds(fields=("Density",))
+    level = int(ds.index.grid_levels.max())
+    dn = ds.refine_by ** level
+    cg = ds.smoothed_covering_grid(
+        level, ds.domain_left_edge, dn * ds.domain_dimensions
+    )
+    assert_equal(cg["index", "ones"], 1.0)
+    assert_equal(cg["gas", "cell_volume"].sum(), ds.domain_width.prod())
+    # Cells covered by the finest grids hold their values
+    for g in ds.index.grids:
+        if g.Level != level:
+            continue
+        si = g.get_global_startindex()
+        ei = si + g.ActiveDimensions
+        assert_equal(
+            cg["stream", "Density"][si[0] : ei[0], si[1] : ei[1], si[2] : ei[2]],
+            g["stream", "Density"],
+        )
+    # The same cells, selected by a region at every level
+    ref = ds.smoothed_covering_grid(
+        level, ds.domain_left_edge, dn * ds.domain_dimensions
+    )
+    ref._level_grids = lambda boxes: None
+    assert_equal(cg["stream", "Density"], ref["stream", "Density"])
+
+
+def test_ghost_zones_from_neighbors():
+    ds = fake_amr_ds(fields=("Density",))
+    field = ("stream", "Density")
+    for g in ds.index.grids[::5]:
+        for smoothed in (False, True):
+            cube = g.retrieve_ghost_zones(2, [field], smoothed=smoothed)
+            # The same covering grid, selecting its cells from the whole index
+            make_grid = ds.smoothed_covering_grid if smoothed else ds.covering_grid
+            ref = make_grid(
+                g.Level,
+                cube.left_edge,
+                cube.ActiveDimensions,
+                num_ghost_zones=2,
+                use_pbar=False,
+            )
+            assert_equal(cube[field], ref[field])
+    from yt.config import ytcfg
+
+    ad = ds.all_data()
+    ref = []
+    for chunk in ad.chunks([], "spatial", ngz=1):
+        ref.append(chunk[field])
+        # The grids read so far are kept for the traversal, within its budget
+        data = ds.index._ghost_zone_data
+        assert 0 < data.nbytes <= data.max_bytes
+    assert ds.index._ghost_zone_data is None
+    # Without any memory for it, grids are read again for every neighbour
+    old = ytcfg.get("yt", "ghost_zone_cache_size")
+    ytcfg["yt", "ghost_zone_cache_size"] = "0"
+    try:
+        for chunk, values in zip(ad.chunks([], "spatial", ngz=1), ref):
+            assert_equal(chunk[field], values)
+            assert_equal(len(ds.index._ghost_zone_data), 0)
+    finally:
+        ytcfg["yt", "ghost_zone_cache_size"] = old
+
+
 def test_arbitrary_grid():
     for ncells in [32, 64]:
         for px in [0.125, 0.25, 0.55519]:
@@ -212,6 +281,29 @@ def test_octree_cg():
     assert_equal((density_field == 0.0).sum(), 0)
 
 
+def test_covering_grid_storage():
+    ds = fake_amr_ds(fields=("Density",))
+    fields = [("stream", "Density"), ("index", "x"), ("gas", "cell_volume")]
+    tmpdir = tempfile.mkdtemp()
+    try:
+        cg = ds.covering_grid(2, ds.domain_left_edge, 4 * ds.domain_dimensions)
+        stored = ds.covering_grid(
+            2,
+            ds.domain_left_edge,
+            4 * ds.domain_dimensions,
+            fields=fields[:1],
+            storage=tmpdir,
+            slab_size=7,
+        )
+        for field in fields:
+            assert_equal(stored[field], cg[field])
+            on_disk = np.load(os.path.join(tmpdir, "%s-%s.npy" % field))
+            assert_equal(on_disk, cg[field].d)
+            assert_equal(str(stored[field].units), str(cg[field].units))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
 def test_smoothed_covering_grid_2d_dataset():
     ds = fake_random_ds([32, 32, 1], nprocs=4)
     ds.periodicity = (True, True, True)
@@ -61,6 +61,38 @@ def test_cut_region():
         assert_equal(p2["density"].max() > 0.25, True)
 
 
+def test_cut_region_expressions():
+    ds = fake_random_ds(32, nprocs=4, fields=("density", "temperature", "velocity_x"))
+    dd = ds.all_data()
+    rho, T, vx = dd["density"], dd["temperature"], dd["velocity_x"]
+    cuts = [
+        ("0.25 < obj['density'] <= 0.75", (rho > 0.25) & (rho <= 0.75)),
+        ("0.5 > obj['temperature']", T < 0.5),
+        (
+            "(obj['density'] > 0.5) | ~(obj['temperature'] < 0.25)",
+            (rho > 0.5) | ~(T < 0.25),
+        ),
+        (
+            "(obj['density'] > 0.1) & (obj['velocity_x'] < vmax) & "
+            "(obj['temperature'] != 0.5)",
+            (rho > 0.1) & (vx < 0.5) & (T != 0.5),
+        ),
+        ("obj['density'] > ds.quan(500.0, 'mg/cm**3')", rho > 0.5),
+        ("obj['density'] * obj['temperature'] > 0.2", rho * T > 0.2),
+        ("obj['density'] > obj['temperature']", rho > T),
+        ("obj['density'] > 2", np.zeros(rho.shape, dtype="bool")),
+    ]
+    for cond, expected in cuts:
+        cr = dd.cut_region([cond], locals={"vmax": 0.5, "ds": ds})
+        assert_equal(np.sort(cr["density"]), np.sort(rho[expected]))
+        # The same conditionals split across nested cut regions
+        for other, other_expected in cuts[:2]:
+            cr2 = cr.cut_region([other])
+            assert_equal(
+                np.sort(cr2["density"]), np.sort(rho[expected & other_expected])
+            )
+
+
 def test_region_and_particles():
     ds = fake_amr_ds(particles=10000)
 
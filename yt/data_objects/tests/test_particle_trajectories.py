@@ -127,3 +127,35 @@ def test_ptype():
 
     # Build trajectories
     ts.particle_trajectories(ids, ptype="dummy")
+
+
+def test_trajectories_from_id_index():
+    n_particles = 64
+    fields = pfields + ["particle_index", "particle_mass"]
+    negative = [False] * len(fields)
+    units = ["cm", "cm", "cm", "1", "g"]
+    rng = np.random.RandomState(0x4D3D3D3)
+    all_ds = []
+    for _ in range(3):
+        ids = rng.permutation(n_particles)
+        all_ds.append(
+            fake_particle_ds(
+                fields=fields,
+                negative=negative,
+                units=units,
+                npart=n_particles,
+                data={"particle_index": ids, "particle_mass": ids + 1.0},
+            )
+        )
+    # Trajectory steps are ordered by parameter filename
+    all_ds.sort(key=lambda ds: ds.parameter_filename)
+    ts = DatasetSeries(all_ds)
+    indices = np.array([3, 17, 42, 63])
+    traj = ts.particle_trajectories(indices, fields=["particle_mass"])
+    for i, ds in enumerate(all_ds):
+        dd = ds.all_data()
+        order = np.argsort(dd["all", "particle_index"].d)
+        for field in pfields:
+            expected = dd["all", field].d[order][indices]
+            np.testing.assert_equal(traj[field][:, i].d, expected)
+    np.testing.assert_equal(traj["particle_mass"].d[:, 0], indices + 1.0)
@@ -1,7 +1,13 @@
 import numpy as np
 
 import yt
-from yt.testing import assert_equal, fake_random_ds
+from yt.testing import (
+    assert_equal,
+    assert_rel_equal,
+    fake_amr_ds,
+    fake_octree_ds,
+    fake_random_ds,
+)
 
 
 def setup():
@@ -73,3 +79,34 @@ def test_fast_find_field_values_at_points():
     assert_equal(len(ppos_den_vel), 2)
     assert_equal(ppos_den_vel[0], ppos_den)
     assert_equal(ppos_den_vel[1], ppos_vel)
+
+
+def test_batch_find_field_values_at_points():
+    ds = fake_amr_ds(fields=["Density"])
+    np.random.seed(0x4D3D3D3)
+    ppos = ds.arr(np.random.uniform(0.05, 0.95, size=(50, 3)), "code_length")
+
+    vals = ds.find_field_values_at_points([("stream", "Density"), "x"], ppos)
+    for i, p in enumerate(ppos):
+        point = ds.point(p)
+        assert_equal(vals[0][i], point["stream", "Density"])
+        assert_equal(vals[1][i], point["x"])
+
+    # x is linear in position, so interpolating it is exact
+    interp = ds.find_field_values_at_points(("index", "x"), ppos, interpolate=True)
+    assert_rel_equal(interp, ppos[:, 0], 10)
+
+    outside = ds.find_field_values_at_points("x", [[2.0, 0.5, 0.5]])
+    assert np.isnan(outside[0])
+
+
+def test_octree_find_field_values_at_points():
+    ds = fake_octree_ds(partial_coverage=0)
+    np.random.seed(0x4D3D3D3)
+    ppos = ds.arr(np.random.uniform(0.05, 0.95, size=(20, 3)), "code_length")
+
+    vals = ds.find_field_values_at_points(["x", "dx"], ppos)
+    for i, p in enumerate(ppos):
+        point = ds.point(p)
+        assert_equal(vals[0][i], point["x"])
+        assert_equal(vals[1][i], point["dx"])
@@ -655,3 +655,25 @@ def test_export_pandas():
     assert "velocity_x" not in df2.columns
     assert_equal(prof.x.d[prof.used], df2["radius"])
     assert_equal(prof["density"].d[prof.used], df2["density"])
+
+
+def test_streaming_profiles():
+    ds = fake_random_ds(32, nprocs=4, fields=_fields, units=_units, particles=16 ** 3)
+    dd = ds.all_data()
+    bin_fields = [
+        [("gas", "density")],
+        [("gas", "density"), ("gas", "temperature")],
+        [("all", "particle_position_x")],
+    ]
+    fields = [
+        [("gas", "temperature"), ("gas", "dinosaurs")],
+        [("gas", "dinosaurs")],
+        [("all", "particle_mass")],
+    ]
+    weights = [("gas", "cell_mass"), None, None]
+    for bf, f, w in zip(bin_fields, fields, weights):
+        ref = create_profile(dd, bf, f, weight_field=w)
+        streamed = create_profile(dd, bf, f, weight_field=w, batch_size=1000)
+        for field in f:
+            assert_rel_equal(streamed[field], ref[field], 12)
+        assert_equal(streamed.used, ref.used)
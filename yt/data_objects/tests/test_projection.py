@@ -4,6 +4,7 @@ import tempfile
 import mock
 import numpy as np
 
+import yt
 from yt.testing import assert_equal, assert_rel_equal, fake_amr_ds, fake_random_ds
 from yt.units.unit_object import Unit
 
@@ -124,3 +125,18 @@ def test_max_level():
 
     proj = ds.proj("Density", 2, method="mip")
     assert proj["grid_level"].max() == ds.index.max_level
+
+
+def test_local_parallel_projection():
+    ds = fake_amr_ds(fields=("Density", "Temperature"))
+    for method, weight_field in [
+        ("integrate", None),
+        ("integrate", "Temperature"),
+        ("mip", None),
+    ]:
+        serial = ds.proj("Density", 2, weight_field=weight_field, method=method)
+        with yt.local_parallelism(4):
+            threaded = ds.proj("Density", 2, weight_field=weight_field, method=method)
+        for field in ("px", "py", "pdx", "pdy"):
+            assert_equal(serial[field], threaded[field])
+        assert_rel_equal(serial["Density"], threaded["Density"], 12)
@@ -2,8 +2,9 @@ import os
 import tempfile
 from pathlib import Path
 
-from yt.data_objects.time_series import get_filenames_from_glob_pattern
-from yt.testing import assert_raises
+from yt.data_objects.time_series import DatasetSeries, get_filenames_from_glob_pattern
+from yt.testing import assert_equal, assert_raises, fake_random_ds
+from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_objects
 
 
 def test_pattern_expansion():
@@ -25,3 +26,20 @@ def test_no_match_pattern():
     with tempfile.TemporaryDirectory() as tmpdir:
         pattern = os.path.join(tmpdir, "fake_data_file_*")
         assert_raises(OSError, get_filenames_from_glob_pattern, pattern)
+
+
+def test_piter_process_backend():
+    ts = DatasetSeries([fake_random_ds(8) for _ in range(5)])
+    serial = {}
+    for sto, ds in ts.piter(storage=serial):
+        sto.result = float(ds.all_data()["gas", "density"].sum())
+    storage = {}
+    for sto, ds in ts.piter(storage=storage, backend="process"):
+        sto.result = float(ds.all_data()["gas", "density"].sum())
+    assert_equal(storage, serial)
+    assert_equal(sorted(storage), list(range(5)))
+
+    # Without storage, only the calling process gets past the loop
+    for _ in parallel_objects(range(4), njobs=2, backend="process"):
+        pass
+    assert_raises(ValueError, lambda: list(parallel_objects(range(4), backend="spam")))
@@ -231,7 +231,7 @@ class DatasetSeries:
     def outputs(self):
         return self._pre_outputs
 
-    def piter(self, storage=None, dynamic=False):
+    def piter(self, storage=None, dynamic=False, backend="mpi"):
         r"""Iterate over time series components in parallel.
 
         This allows you to iterate over a time series while dispatching
@@ -265,6 +265,13 @@ class DatasetSeries:
             is enabled with a set of 128 processors available, only
             127 will be available to iterate over objects as one will
             be load balancing the rest.
+        backend : "mpi" or "process"
+            With "mpi" (the default), datasets are dispatched to MPI
+            processors.  With "process", they are dispatched to a pool of
+            forked local processes, one per available core (or as many as
+            *parallel* if it is an integer), which take the next dataset as
+            soon as they are done with the previous one.  This does not
+            require mpi4py.
 
 
         Examples
@@ -302,8 +309,22 @@ class DatasetSeries:
         ...     ProjectionPlot(ds, "x", "Density").save()
         ...
 
+        This uses every core of the machine, without MPI:
+
+        >>> my_storage = {}
+        >>> for sto, ds in ts.piter(storage=my_storage, backend="process"):
+        ...     sto.result = ds.current_time
+        ...
+
         """
-        if not self.parallel:
+        if backend == "process":
+            if self.parallel is True:
+                njobs = 0
+            elif not self.parallel:
+                njobs = 1
+            else:
+                njobs = self.parallel
+        elif not self.parallel:
             njobs = 1
         elif not dynamic:
             if self.parallel:
@@ -321,7 +342,11 @@ class DatasetSeries:
                 njobs = nsize - 1
 
         for output in parallel_objects(
-            self._pre_outputs, njobs=njobs, storage=storage, dynamic=dynamic
+            self._pre_outputs,
+            njobs=njobs,
+            storage=storage,
+            dynamic=dynamic,
+            backend=backend,
         ):
             if storage is not None:
                 sto, output = output
@@ -0,0 +1,111 @@
+import weakref
+
+
+class FieldDependencyGraph:
+    """
+    The graph of dependencies between the fields of a dataset.
+
+    Dependencies are found once per field with the
+    :class:`~yt.fields.field_detector.FieldDetector` (or taken from
+    ``ds.field_dependencies``) and memoized, as are the generation plans built
+    from them, so that data containers do not have to rediscover them for
+    every chunk.  Entries are checked against the current contents of
+    ``ds.field_dependencies``, so that redefining a field invalidates them.
+    """
+
+    def __init__(self, ds):
+        self.ds = weakref.proxy(ds)
+        self.field_dependencies = ds.field_dependencies
+        # field -> (FieldDependencies object, resolved dependencies)
+        self._resolved = {}
+        # Fields whose dependencies could not be detected
+        self._undetectable = set()
+        # tuple of fields -> (validation key, generation order, consumers)
+        self._plans = {}
+
+    def _field_deps(self, field):
+        if not isinstance(field, tuple):
+            # Container fields do not depend on anything.
+            return None
+        fd = self.field_dependencies.get(field, None)
+        if fd is None:
+            fd = self.field_dependencies.get(field[1], None)
+        if fd is None and field not in self._undetectable:
+            fi = self.ds._get_field_info(*field)
+            try:
+                fd = fi.get_dependencies(ds=self.ds)
+            except Exception:
+                self._undetectable.add(field)
+            else:
+                self.field_dependencies[field] = fd
+        return fd
+
+    def dependencies(self, field, dobj):
+        """
+        Return the fields that *field* directly depends on, as fully
+        qualified field tuples, resolving field names against *dobj*.
+        """
+        fd = self._field_deps(field)
+        if fd is None:
+            return []
+        cached = self._resolved.get(field, None)
+        if cached is not None and cached[0] is fd:
+            return cached[1]
+        requested = list(set(fd.requested))
+        deps = dobj._determine_fields(requested)
+        # Bare field names are resolved using the state of dobj, so those
+        # cannot be memoized.
+        if all(isinstance(f, tuple) for f in requested):
+            self._resolved[field] = (fd, deps)
+        return deps
+
+    def closure(self, fields, dobj):
+        """
+        Return *fields* along with everything they depend on, directly or
+        not, sorted.
+        """
+        fields_to_get = list(fields)
+        seen = set(fields_to_get)
+        for field in fields_to_get:
+            for dep in self.dependencies(field, dobj):
+                if dep not in seen:
+                    seen.add(dep)
+                    fields_to_get.append(dep)
+        return sorted(fields_to_get)
+
+    def generation_plan(self, fields, dobj):
+        """
+        Order *fields* so that each one comes after the ones it depends on.
+
+        Returns the ordered list of fields and a dictionary mapping each
+        field to the number of fields of the list that depend on it.  Fields
+        involved in dependency cycles, which should not happen, are kept in
+        their original order at the end.
+        """
+        key = tuple(fields)
+        validation = [self._field_deps(field) for field in fields]
+        plan = self._plans.get(key, None)
+        if plan is not None and all(a is b for a, b in zip(plan[0], validation)):
+            return list(plan[1]), dict(plan[2])
+        deps = {field: self.dependencies(field, dobj) for field in fields}
+        in_plan = set(fields)
+        consumers = {field: 0 for field in fields}
+        pending = {}
+        for field in fields:
+            local_deps = {d for d in deps[field] if d in in_plan and d != field}
+            pending[field] = local_deps
+            for dep in local_deps:
+                consumers[dep] += 1
+        order = []
+        done = set()
+        while len(order) < len(fields):
+            ready = [
+                f for f in fields if f not in done and pending[f].issubset(done)
+            ]
+            if len(ready) == 0:
+                order += [f for f in fields if f not in done]
+                break
+            order += ready
+            done.update(ready)
+        self._plans[key] = (validation, order, consumers)
+        return list(order), dict(consumers)
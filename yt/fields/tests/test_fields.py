@@ -481,3 +481,38 @@ def test_ion_field_labels():
     for f in fields:
         label = getattr(fobj, f).get_latex_display_name()
         assert_equal(label, pm_labels[f])
+
+
+def test_generation_order_and_release():
+    from yt.fields.field_detector import FieldDetector
+
+    ds = fake_random_ds(16)
+    in_memory = []
+
+    def _a(field, data):
+        return 2 * data["gas", "density"]
+
+    def _b(field, data):
+        return 2 * data["gas", "a"]
+
+    def _c(field, data):
+        if not isinstance(data, FieldDetector):
+            in_memory.append(("gas", "a") in data.field_data)
+        return data["gas", "b"] + data["gas", "density"]
+
+    for name, func in [("c", _c), ("b", _b), ("a", _a)]:
+        ds.add_field(("gas", name), func, sampling_type="cell", units="g/cm**3")
+    dd = ds.all_data()
+    graph = ds._field_graph
+    assert_equal(
+        graph.closure([("gas", "c")], dd),
+        [("gas", "a"), ("gas", "b"), ("gas", "c"), ("gas", "density")],
+    )
+    order, consumers = graph.generation_plan(
+        [("gas", "c"), ("gas", "b"), ("gas", "a")], dd
+    )
+    assert_equal(order, [("gas", "a"), ("gas", "b"), ("gas", "c")])
+    assert_equal(consumers[("gas", "a")], 1)
+    assert_array_almost_equal_nulp(dd["gas", "c"], 5 * dd["gas", "density"], 4)
+    # The intermediate "a" was dropped once "b" had been generated
+    assert in_memory == [False]
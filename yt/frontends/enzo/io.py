@@ -1,3 +1,6 @@
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
 from yt.geometry.selection_routines import GridSelector
@@ -10,11 +13,78 @@ _convert_mass = ("particle_mass", "mass")
 _particle_position_names = {}
 
 
+class HDF5HandlePool:
+    """
+    A bounded pool of low-level HDF5 file ids, kept open across chunks and
+    calls.  When more than *max_open* files are in use, the least recently
+    used one is closed.
+    """
+
+    def __init__(self, max_open=32):
+        self.max_open = max_open
+        self._fids = OrderedDict()
+
+    def __len__(self):
+        return len(self._fids)
+
+    def get(self, filename):
+        """Return an open, read-only file id for *filename*."""
+        fid = self._fids.get(filename, None)
+        if fid is not None:
+            self._fids.move_to_end(filename)
+            return fid
+        while len(self._fids) >= self.max_open:
+            _, old_fid = self._fids.popitem(last=False)
+            old_fid.close()
+        fid = h5py.h5f.open(filename.encode("latin-1"), h5py.h5f.ACC_RDONLY)
+        self._fids[filename] = fid
+        return fid
+
+    def get_file(self, filename):
+        """
+        Return a high-level view of the pooled file *filename*.  It must not
+        be closed, as that would close the pooled file id as well.
+        """
+        return h5py.File(self.get(filename))
+
+    def close(self):
+        while self._fids:
+            _, fid = self._fids.popitem()
+            fid.close()
+
+
+def _read_order(grids):
+    # Sort grids by file and, within a file, by id: this is the order in which
+    # Enzo writes grids, so reads proceed sequentially through each file.
+    return sorted(range(len(grids)), key=lambda i: (grids[i].filename, grids[i].id))
+
+
 class IOHandlerPackedHDF5(BaseIOHandler):
 
     _dataset_type = "enzo_packed_3d"
     _base = slice(None)
     _field_dtype = "float64"
+    # Maximum number of files each thread keeps open between reads
+    _max_open_files = 32
+
+    def __init__(self, ds, *args, **kwargs):
+        super(IOHandlerPackedHDF5, self).__init__(ds, *args, **kwargs)
+        # Each thread (see local_parallelism) gets its own pool, so that a
+        # file id is never closed while another thread is reading from it.
+        self._pools = threading.local()
+
+    @property
+    def _handles(self):
+        pool = getattr(self._pools, "pool", None)
+        if pool is None:
+            pool = self._pools.pool = HDF5HandlePool(self._max_open_files)
+        return pool
+
+    def close(self):
+        """Close the files kept open by the calling thread."""
+        pool = getattr(self._pools, "pool", None)
+        if pool is not None:
+            pool.close()
 
     def _read_field_names(self, grid):
         if grid.filename is None:
@@ -63,17 +133,15 @@ class IOHandlerPackedHDF5(BaseIOHandler):
 
     def _read_particle_fields(self, chunks, ptf, selector):
         chunks = list(chunks)
-        for chunk in chunks:  # These should be organized by grid filename
-            f = None
-            for g in chunk.objs:
-                if g.filename is None:
-                    continue
-                if f is None:
-                    # print("Opening (read) %s" % g.filename)
-                    f = h5py.File(g.filename, mode="r")
+        handles = self._handles
+        for chunk in chunks:
+            grids = [g for g in chunk.objs if g.filename is not None]
+            for i in _read_order(grids):
+                g = grids[i]
                 nap = sum(g.NumberOfActiveParticles.values())
                 if g.NumberOfParticles == 0 and nap == 0:
                     continue
+                f = handles.get_file(g.filename)
                 ds = f.get("/Grid%08i" % g.id)
                 for ptype, field_list in sorted(ptf.items()):
                     if ptype != "io":
@@ -99,45 +167,45 @@ class IOHandlerPackedHDF5(BaseIOHandler):
                         if field in _convert_mass:
                             data *= g.dds.prod(dtype="f8")
                         yield (ptype, field), data[mask]
-            if f:
-                f.close()
 
     def io_iter(self, chunks, fields):
-        h5_dtype = self._field_dtype
+        # The data has to be yielded in the order of chunk.objs, but we read
+        # it in file order.  If the two differ, the chunk is buffered.
         for chunk in chunks:
-            fid = None
-            filename = -1
-            for obj in chunk.objs:
-                if obj.filename is None:
-                    continue
-                if obj.filename != filename:
-                    # Note one really important thing here: even if we do
-                    # implement LRU caching in the _read_obj_field function,
-                    # we'll still be doing file opening and whatnot.  This is a
-                    # problem, but one we can return to.
-                    if fid is not None:
-                        fid.close()
-                    fid = h5py.h5f.open(
-                        obj.filename.encode("latin-1"), h5py.h5f.ACC_RDONLY
-                    )
-                    filename = obj.filename
+            objs = [obj for obj in chunk.objs if obj.filename is not None]
+            order = _read_order(objs)
+            if order == list(range(len(objs))):
+                yield from self._read_objs(objs, fields)
+                continue
+            buffered = {}
+            for field, obj, data in self._read_objs([objs[i] for i in order], fields):
+                buffered[obj.id, field] = data
+            for obj in objs:
                 for field in fields:
-                    nodal_flag = self.ds.field_info[field].nodal_flag
-                    dims = obj.ActiveDimensions[::-1] + nodal_flag[::-1]
-                    data = np.empty(dims, dtype=h5_dtype)
-                    yield field, obj, self._read_obj_field(obj, field, (fid, data))
-        if fid is not None:
-            fid.close()
+                    yield field, obj, buffered.pop((obj.id, field))
+
+    def _read_objs(self, objs, fields):
+        h5_dtype = self._field_dtype
+        handles = self._handles
+        for obj in objs:
+            for field in fields:
+                data = self._cached_obj_field(obj, field)
+                if data is not None:
+                    # Served from the io cache; no need to touch the file.
+                    yield field, obj, data
+                    continue
+                fid = handles.get(obj.filename)
+                nodal_flag = self.ds.field_info[field].nodal_flag
+                dims = obj.ActiveDimensions[::-1] + nodal_flag[::-1]
+                data = np.empty(dims, dtype=h5_dtype)
+                yield field, obj, self._read_obj_field(obj, field, (fid, data))
 
     def _read_obj_field(self, obj, field, fid_data):
         if fid_data is None:
             fid_data = (None, None)
         fid, data = fid_data
         if fid is None:
-            close = True
-            fid = h5py.h5f.open(obj.filename.encode("latin-1"), h5py.h5f.ACC_RDONLY)
-        else:
-            close = False
+            fid = self._handles.get(obj.filename)
         if data is None:
             data = np.empty(obj.ActiveDimensions[::-1], dtype=self._field_dtype)
         ftype, fname = field
@@ -153,8 +221,6 @@ class IOHandlerPackedHDF5(BaseIOHandler):
         # I don't know why, but on some installations of h5py this works, but
         # on others, nope.  Doesn't seem to be a version thing.
         # dg.close()
-        if close:
-            fid.close()
         return data.T
 
 
@@ -175,6 +241,7 @@ class IOHandlerPackedHDF5GhostZones(IOHandlerPackedHDF5):
 class IOHandlerInMemory(BaseIOHandler):
 
     _dataset_type = "enzo_inline"
+    _cache_reads = False
 
     def __init__(self, ds, ghost_zones=3):
         self.ds = ds
@@ -284,3 +284,21 @@ def test_nonzero_omega_radiation():
         4,
         err_msg="Simulation time not consistent with cosmology calculator.",
     )
+
+
+@requires_file(enzotiny)
+def test_hdf5_handle_pool():
+    ds = data_dir_load(enzotiny)
+    dd = ds.all_data()
+    ref = dd["gas", "density"], dd["all", "particle_mass"]
+
+    ds = data_dir_load(enzotiny)
+    io = ds.index.io
+    # Force files to be closed and reopened as we go
+    io._max_open_files = 1
+    dd = ds.all_data()
+    assert_array_equal(dd["gas", "density"], ref[0])
+    assert_array_equal(dd["all", "particle_mass"], ref[1])
+    assert len(io._handles) <= 1
+    io.close()
+    assert_equal(len(io._handles), 0)
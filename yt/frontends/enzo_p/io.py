@@ -127,18 +127,19 @@ class EnzoPIOHandler(BaseIOHandler):
             for obj in chunk.objs:
                 if obj.filename is None:
                     continue
-                if obj.filename != filename:
-                    # Note one really important thing here: even if we do
-                    # implement LRU caching in the _read_obj_field function,
-                    # we'll still be doing file opening and whatnot.  This is a
-                    # problem, but one we can return to.
-                    if fid is not None:
-                        fid.close()
-                    fid = h5py.h5f.open(
-                        obj.filename.encode("latin-1"), h5py.h5f.ACC_RDONLY
-                    )
-                    filename = obj.filename
                 for field in fields:
+                    data = self._cached_obj_field(obj, field)
+                    if data is not None:
+                        # Served from the io cache; no need to open the file.
+                        yield field, obj, data
+                        continue
+                    if obj.filename != filename:
+                        if fid is not None:
+                            fid.close()
+                        fid = h5py.h5f.open(
+                            obj.filename.encode("latin-1"), h5py.h5f.ACC_RDONLY
+                        )
+                        filename = obj.filename
                     data = None
                     yield field, obj, self._read_obj_field(obj, field, (fid, data))
         if fid is not None:
@@ -61,6 +61,12 @@ class IOHandlerFLASH(BaseIOHandler):
                 ftype, fname = field
                 ds = f[f"/{fname}"]
                 for gs in grid_sequences(chunk.objs):
+                    cached = [self._cached_obj_field(g, field) for g in gs]
+                    if all(data is not None for data in cached):
+                        # No need to read the whole sequence from disk.
+                        for g, data in zip(gs, cached):
+                            yield field, g, data
+                        continue
                     start = gs[0].id - gs[0]._id_offset
                     end = gs[-1].id - gs[-1]._id_offset + 1
                     data = ds[start:end, :, :, :]
@@ -4,10 +4,9 @@ from collections import defaultdict
 import numpy as np
 
 from yt.frontends.sph.io import IOHandlerSPH
-from yt.units.yt_array import uconcatenate
-from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
+from yt.utilities.parallel_tools.parallel_analysis_interface import communication_system
 
 from .definitions import SNAP_FORMAT_2_OFFSET, gadget_hdf5_ptypes
 
@@ -87,54 +86,64 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
             yield key, pos
         f.close()
 
-    def _generate_smoothing_length(self, data_files, kdtree):
+    def _generate_smoothing_length(self, index):
         if not self.ds.gen_hsmls:
             return
+        data_files = index.data_files
+        comm = communication_system.communicators[-1]
         hsml_fn = data_files[0].filename.replace(".hdf5", ".hsml.hdf5")
         if os.path.exists(hsml_fn):
             with h5py.File(hsml_fn, "r") as f:
-                file_hash = f.attrs["q"]
-            if file_hash != self.ds._file_hash:
+                file_hash = f.attrs.get("q", None)
+            if file_hash == self.ds._file_hash:
+                return
+            if comm.rank == 0:
                 mylog.warning("Replacing hsml files.")
                 for data_file in data_files:
                     hfn = data_file.filename.replace(".hdf5", ".hsml.hdf5")
-                    os.remove(hfn)
-            else:
-                return
-        positions = []
+                    if os.path.exists(hfn):
+                        os.remove(hfn)
+            comm.barrier()
+        ptype = self.ds._sph_ptypes[0]
+        domains = index._smoothing_length_domains()
+        if domains.total_particles == 0:
+            return
         counts = defaultdict(int)
+        dtype = None
         for data_file in data_files:
-            for _, ppos in self._yield_coordinates(
-                data_file, needed_ptype=self.ds._sph_ptypes[0]
-            ):
-                counts[data_file.filename] += ppos.shape[0]
-                positions.append(ppos)
-        if not positions:
-            return
-        offsets = {}
-        offset = 0
-        for fn, count in counts.items():
-            offsets[fn] = offset
-            offset += count
-        positions = uconcatenate(positions)[kdtree.idx]
-        hsml = generate_smoothing_length(positions, kdtree, self.ds._num_neighbors)
-        dtype = positions.dtype
-        hsml = hsml[np.argsort(kdtree.idx)].astype(dtype)
-        mylog.warning("Writing smoothing lengths to hsml files.")
-        for i, data_file in enumerate(data_files):
-            si, ei = data_file.start, data_file.end
-            fn = data_file.filename
-            hsml_fn = data_file.filename.replace(".hdf5", ".hsml.hdf5")
+            counts[data_file.filename] += data_file.total_particles[ptype]
+            if dtype is None and data_file.total_particles[ptype] > 0:
+                with h5py.File(data_file.filename, mode="r") as f:
+                    dtype = f[ptype]["Coordinates"].dtype.newbyteorder("N")
+        if comm.rank == 0:
+            mylog.warning("Writing smoothing lengths to hsml files.")
+            # The files are created empty, and the hash of the data is only
+            # stored once all the smoothing lengths are written, so that
+            # interrupted runs start over.
+            for fn, count in counts.items():
+                with h5py.File(fn.replace(".hdf5", ".hsml.hdf5"), mode="a") as f:
+                    g = f.require_group(ptype)
+                    g.require_dataset("SmoothingLength", dtype=dtype, shape=(count,))
+        comm.barrier()
+
+        def _write(i, indices, hsml):
+            data_file = data_files[i]
+            fn = data_file.filename.replace(".hdf5", ".hsml.hdf5")
+            with h5py.File(fn, mode="a") as f:
+                d = f[ptype]["SmoothingLength"]
+                # Indices are sorted; write the range they span at once
+                begin = data_file.start + indices[0]
+                end = data_file.start + indices[-1] + 1
+                values = d[begin:end]
+                values[indices - indices[0]] = hsml
+                d[begin:end] = values
+
+        kdtree = index.kdtree if domains.ndomains == 1 else None
+        domains.generate(_write, kdtree=kdtree)
+        if comm.rank == 0:
             with h5py.File(hsml_fn, mode="a") as f:
-                if i == 0:
-                    f.attrs["q"] = self.ds._file_hash
-                g = f.require_group(self.ds._sph_ptypes[0])
-                d = g.require_dataset(
-                    "SmoothingLength", dtype=dtype, shape=(counts[fn],)
-                )
-                begin = si + offsets[fn]
-                end = min(ei, d.size) + offsets[fn]
-                d[si:ei] = hsml[begin:end]
+                f.attrs["q"] = self.ds._file_hash
+        comm.barrier()
 
     def _get_smoothing_length(self, data_file, position_dtype, position_shape):
         ptype = self.ds._sph_ptypes[0]
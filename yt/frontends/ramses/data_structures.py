@@ -16,21 +16,36 @@ from yt.geometry.oct_geometry_handler import OctreeIndex
 from yt.utilities.cython_fortran_utils import FortranFile as fpu
 from yt.utilities.lib.cosmology_time import friedman
 from yt.utilities.on_demand_imports import _f90nml as f90nml
+from yt.utilities.parallel_tools.local_parallelism import local_parallel_map
 from yt.utilities.physical_constants import kb, mp
 
 from .definitions import field_aliases, particle_families, ramses_header
 from .field_handlers import get_field_handlers
 from .fields import _X, RAMSESFieldInfo
 from .hilbert import get_cpu_list
+from .index_cache import RAMSESIndexCache
 from .io_utils import fill_hydro, read_amr
 from .particle_handlers import get_particle_handlers
 
 
+def _detect_handler_classes(ds):
+    """
+    Return the field and particle handler classes present in the dataset.
+    This only depends on the dataset, so it is done once and shared by all
+    the domains.
+    """
+    field_handlers = [FH for FH in get_field_handlers() if FH.any_exist(ds)]
+    for FH in field_handlers:
+        FH.detect_fields(ds)
+    particle_handlers = [PH for PH in get_particle_handlers() if PH.any_exist(ds)]
+    return field_handlers, particle_handlers
+
+
 class RAMSESDomainFile:
     _last_mask = None
     _last_selector_id = None
 
-    def __init__(self, ds, domain_id):
+    def __init__(self, ds, domain_id, handler_classes=None, index_cache=None):
         self.ds = ds
         self.domain_id = domain_id
 
@@ -52,20 +67,20 @@ class RAMSESDomainFile:
         for t in ["grav", "amr"]:
             setattr(self, f"{t}_fn", basename % t)
         self._part_file_descriptor = part_file_descriptor
-        self._read_amr_header()
 
-        # Autodetect field files
-        field_handlers = [FH(self) for FH in get_field_handlers() if FH.any_exist(ds)]
+        if handler_classes is None:
+            handler_classes = _detect_handler_classes(ds)
+        field_handler_classes, particle_handler_classes = handler_classes
+
+        # Field files, whose fields were detected once for all the domains
+        field_handlers = [FH(self) for FH in field_handler_classes]
         self.field_handlers = field_handlers
         for fh in field_handlers:
             mylog.debug("Detected fluid type %s in domain_id=%s", fh.ftype, domain_id)
-            fh.detect_fields(ds)
             # self._add_ftype(fh.ftype)
 
         # Autodetect particle files
-        particle_handlers = [
-            PH(ds, self) for PH in get_particle_handlers() if PH.any_exist(ds)
-        ]
+        particle_handlers = [PH(ds, self) for PH in particle_handler_classes]
         self.particle_handlers = particle_handlers
         for ph in particle_handlers:
             mylog.debug(
@@ -74,8 +89,19 @@ class RAMSESDomainFile:
             ph.read_header()
             # self._add_ptype(ph.ptype)
 
-        # Load the AMR structure
-        self._read_amr()
+        # Load the AMR structure, from the index cache if it is up to date
+        entry = None
+        if index_cache is not None:
+            entry = index_cache.get(self, self._force_max_level)
+        if entry is not None:
+            self._load_from_cache(entry)
+        else:
+            # Only keep what the cache needs if it can be written
+            record = index_cache is not None and index_cache.writable
+            self._read_amr_header()
+            self._read_amr(record=record)
+            if record:
+                index_cache.put(self, self._force_max_level, self._cache_entry())
 
     _hydro_offset = None
     _level_count = None
@@ -105,6 +131,13 @@ class RAMSESDomainFile:
         f.seek(0)
         return f
 
+    @property
+    def _force_max_level(self):
+        force_max_level, convention = self.ds._force_max_level
+        if convention == "yt":
+            force_max_level += self.ds.min_level + 1
+        return force_max_level
+
     def _read_amr_header(self):
         hvals = {}
         f = self.amr_file
@@ -123,35 +156,31 @@ class RAMSESDomainFile:
         f.skip()
         if hvals["nboundary"] > 0:
             f.skip(2)
-            self.ngridbound = f.read_vector("i").astype("int64")
+            ngridbound = f.read_vector("i").astype("int64")
         else:
-            self.ngridbound = np.zeros(hvals["nlevelmax"], dtype="int64")
+            ngridbound = np.zeros(hvals["nlevelmax"], dtype="int64")
         free_mem = f.read_attrs((("free_mem", 5, "i"),))  # NOQA
         ordering = f.read_vector("c")  # NOQA
         f.skip(4)
         # Now we're at the tree itself
+        self.amr_offset = f.tell()
+        self._raw_amr_header = hvals.copy()
+        self._setup_amr_header(hvals, ngridbound)
+
+    def _setup_amr_header(self, hvals, ngridbound):
         # Now we iterate over each level and each CPU.
+        self.ngridbound = ngridbound
         self.amr_header = hvals
         # update levelmax
-        force_max_level, convention = self.ds._force_max_level
-        if convention == "yt":
-            force_max_level += self.ds.min_level + 1
         self.amr_header["nlevelmax"] = min(
-            force_max_level, self.amr_header["nlevelmax"]
+            self._force_max_level, self.amr_header["nlevelmax"]
         )
-        self.amr_offset = f.tell()
         self.local_oct_count = hvals["numbl"][
             self.ds.min_level :, self.domain_id - 1
         ].sum()
         self.total_oct_count = hvals["numbl"][self.ds.min_level :, :].sum(axis=0)
 
-    def _read_amr(self):
-        """Open the oct file, read in octs level-by-level.
-           For each oct, only the position, index, level and domain
-           are needed - its position in the octree is found automatically.
-           The most important is finding all the information to feed
-           oct_handler.add
-        """
+    def _new_oct_handler(self):
         self.oct_handler = RAMSESOctreeContainer(
             self.ds.domain_dimensions / 2,
             self.ds.domain_left_edge,
@@ -166,12 +195,28 @@ class RAMSESDomainFile:
             self.ngridbound.sum(),
         )
 
+    def _read_amr(self, record=False):
+        """Open the oct file, read in octs level-by-level.
+           For each oct, only the position, index, level and domain
+           are needed - its position in the octree is found automatically.
+           The most important is finding all the information to feed
+           oct_handler.add.  If record is True, the octs added are kept
+           for the index cache.
+        """
+        self._new_oct_handler()
+
         f = self.amr_file
         f.seek(self.amr_offset)
 
         min_level = self.ds.min_level
+        self._oct_blocks = [] if record else None
         max_level = read_amr(
-            f, self.amr_header, self.ngridbound, min_level, self.oct_handler
+            f,
+            self.amr_header,
+            self.ngridbound,
+            min_level,
+            self.oct_handler,
+            self._oct_blocks,
         )
 
         self.max_level = max_level
@@ -180,6 +225,51 @@ class RAMSESDomainFile:
         # Close AMR file
         f.close()
 
+    def _cache_entry(self):
+        # Flatten everything needed to rebuild this domain into arrays.  The
+        # fluid file offsets are computed now, so that they need not be
+        # recomputed on the first field access of later sessions.
+        entry = {f"header/{k}": np.asarray(v) for k, v in self._raw_amr_header.items()}
+        entry["ngridbound"] = self.ngridbound
+        blocks = self._oct_blocks
+        entry["oct_blocks"] = np.array(
+            [(cpu, level, pos.shape[0]) for cpu, level, pos in blocks], dtype="int64"
+        ).reshape(-1, 3)
+        if len(blocks) > 0:
+            entry["oct_pos"] = np.concatenate([pos for _, _, pos in blocks])
+        else:
+            entry["oct_pos"] = np.empty((0, 3), dtype="float64")
+        del self._oct_blocks
+        for fh in self.field_handlers:
+            entry[f"{fh.ftype}/offset"] = fh.offset
+            entry[f"{fh.ftype}/level_count"] = fh.level_count
+        return entry
+
+    def _load_from_cache(self, entry):
+        hvals = {}
+        for key, val in entry.items():
+            if key.startswith("header/"):
+                hvals[key[len("header/") :]] = val.item() if val.ndim == 0 else val
+        self._raw_amr_header = hvals.copy()
+        self._setup_amr_header(hvals, entry["ngridbound"])
+        self._new_oct_handler()
+        # Replay the oct insertions recorded when the AMR file was read
+        max_level = 0
+        pos = entry["oct_pos"]
+        ind = 0
+        for cpu, level, count in entry["oct_blocks"]:
+            n = self.oct_handler.add(
+                int(cpu), int(level), pos[ind : ind + count, :], count_boundary=1
+            )
+            if n > 0:
+                max_level = max(int(level), max_level)
+            ind += count
+        self.max_level = max_level
+        self.oct_handler.finalize()
+        for fh in self.field_handlers:
+            fh._offset = entry[f"{fh.ftype}/offset"]
+            fh._level_count = entry[f"{fh.ftype}/level_count"]
+
     def included(self, selector):
         if getattr(selector, "domain_id", None) is not None:
             return selector.domain_id == self.domain_id
@@ -374,7 +464,17 @@ class RAMSESIndex(OctreeIndex):
         else:
             cpu_list = range(self.dataset["ncpu"])
 
-        self.domains = [RAMSESDomainFile(self.dataset, i + 1) for i in cpu_list]
+        # The domains are independent of each other, so they can be parsed
+        # concurrently; the handler detection is done once up front.
+        handler_classes = _detect_handler_classes(self.dataset)
+        index_cache = RAMSESIndexCache(self.dataset)
+        self.domains = local_parallel_map(
+            lambda i: RAMSESDomainFile(
+                self.dataset, i + 1, handler_classes, index_cache
+            ),
+            cpu_list,
+        )
+        index_cache.save()
         total_octs = sum(
             dom.local_oct_count for dom in self.domains  # + dom.ngridbound.sum()
         )
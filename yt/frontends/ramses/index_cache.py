@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+
+from yt.funcs import mylog
+
+# Bump this whenever the layout of the cache file changes.
+_cache_version = 1
+
+
+def _file_stamp(fname):
+    st = os.stat(fname)
+    return np.array([st.st_size, st.st_mtime_ns], dtype="int64")
+
+
+class RAMSESIndexCache:
+    """
+    A sidecar file next to the RAMSES info file that stores, for each domain,
+    the AMR header, the octs that were added to its oct handler and the
+    offsets and level counts of its fluid files.  With it, re-opening an
+    output only needs to replay the oct insertions instead of skimming every
+    ``amr_*.out*`` file, and fluid files need not be skimmed to compute their
+    offsets.
+
+    Each domain entry is validated against the size and modification time of
+    the files it was built from, so that stale entries are rebuilt.  This is
+    the RAMSES counterpart of the ``.ewah`` file written by
+    :class:`~yt.geometry.particle_geometry_handler.ParticleIndex`.
+
+    Entries are only built when the cache can be written (see
+    :attr:`writable`), since building them means keeping the octs of every
+    domain and skimming its fluid files up front.
+    """
+
+    def __init__(self, ds):
+        self.filename = ds.parameter_filename + ".yt_index.npz"
+        self._min_level = ds.min_level
+        wdir = os.path.dirname(os.path.abspath(self.filename))
+        # Whether updated entries can be written out
+        self.writable = os.access(wdir, os.W_OK)
+        self._stored = {}
+        self._updated = {}
+        self._load()
+
+    def _global_key(self, force_max_level):
+        return np.array(
+            [_cache_version, self._min_level, force_max_level], dtype="int64"
+        )
+
+    def _load(self):
+        if not os.path.isfile(self.filename):
+            return
+        try:
+            with np.load(self.filename, allow_pickle=False) as data:
+                stored = {k: data[k] for k in data.files}
+        except (OSError, ValueError, EOFError) as e:
+            mylog.warning(
+                "Ignoring unreadable RAMSES index cache %s (%s)", self.filename, e
+            )
+            return
+        for key, val in stored.items():
+            domain_id, _, name = key.partition("/")
+            self._stored.setdefault(domain_id, {})[name] = val
+
+    def get(self, domain, force_max_level):
+        """
+        Return the cached entry of *domain* as a dictionary of arrays, or
+        None if it is missing or out of date.
+        """
+        entry = self._stored.get(f"{domain.domain_id:05d}", None)
+        if entry is None:
+            return None
+        if not np.array_equal(entry["key"], self._global_key(force_max_level)):
+            return None
+        if not np.array_equal(entry["amr_stamp"], _file_stamp(domain.amr_fn)):
+            return None
+        for fh in domain.field_handlers:
+            stamp = entry.get(f"{fh.ftype}/stamp", None)
+            if stamp is None or not np.array_equal(stamp, _file_stamp(fh.fname)):
+                return None
+        return entry
+
+    def put(self, domain, force_max_level, entry):
+        """Store the entry of *domain*, as built from its files on disk."""
+        entry = dict(entry)
+        entry["key"] = self._global_key(force_max_level)
+        entry["amr_stamp"] = _file_stamp(domain.amr_fn)
+        for fh in domain.field_handlers:
+            entry[f"{fh.ftype}/stamp"] = _file_stamp(fh.fname)
+        self._updated[f"{domain.domain_id:05d}"] = entry
+
+    def save(self):
+        """Write the cache to disk if any domain entry has been updated."""
+        if len(self._updated) == 0 or not self.writable:
+            return
+        self._stored.update(self._updated)
+        self._updated = {}
+        arrays = {}
+        for domain_id, entry in self._stored.items():
+            for name, val in entry.items():
+                arrays[f"{domain_id}/{name}"] = val
+        tmp_fn = f"{self.filename}.{os.getpid()}.tmp"
+        # Sometimes os mis-reports whether a directory is writable, so pass if
+        # writing the cache fails.  We write to a temporary file first so that
+        # concurrent readers never see a partial cache.
+        try:
+            with open(tmp_fn, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_fn, self.filename)
+        except OSError:
+            if os.path.exists(tmp_fn):
+                os.remove(tmp_fn)
@@ -20,7 +20,13 @@ ctypedef np.float64_t DOUBLE_t
 @cython.nonecheck(False)
 def read_amr(FortranFile f, dict headers,
              np.ndarray[np.int64_t, ndim=1] ngridbound, INT64_t min_level,
-             RAMSESOctreeContainer oct_handler):
+             RAMSESOctreeContainer oct_handler, list record=None):
+    """Read the octs of an AMR file into *oct_handler*.
+
+    If *record* is a list, a ``(domain, level, positions)`` tuple is appended
+    to it for every block of octs added, so that the oct handler can later
+    be rebuilt without reading the file again.
+    """
 
     cdef INT64_t ncpu, nboundary, max_level, nlevelmax, ncpu_and_bound
     cdef DOUBLE_t nx, ny, nz
@@ -77,6 +83,8 @@ def read_amr(FortranFile f, dict headers,
             if ilevel >= min_level:
                 n = oct_handler.add(icpu + 1, ilevel - min_level, pos[:ng, :],
                                     count_boundary = 1)
+                if record is not None:
+                    record.append((icpu + 1, ilevel - min_level, pos[:ng, :].copy()))
                 if n > 0:
                     max_level = max(ilevel - min_level, max_level)
 
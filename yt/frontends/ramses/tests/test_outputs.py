@@ -599,3 +599,45 @@ def test_invalid_max_level():
     for lvl, convention in invalid_type_args:
         with assert_raises(TypeError):
             yt.load(output_00080, max_level=lvl, max_level_convention=convention)
+
+
+@requires_file(output_00080)
+def test_concurrent_domain_loading():
+    from yt.utilities.parallel_tools.local_parallelism import local_parallelism
+
+    ds_serial = yt.load(output_00080)
+    ds_serial.index
+    with local_parallelism(4):
+        ds_local = yt.load(output_00080)
+        ds_local.index
+
+    assert_equal(
+        [dom.domain_id for dom in ds_local.index.domains],
+        [dom.domain_id for dom in ds_serial.index.domains],
+    )
+    assert_equal(ds_local.index.num_grids, ds_serial.index.num_grids)
+    assert_equal(ds_local.index.max_level, ds_serial.index.max_level)
+    assert_equal(ds_local.r["gas", "density"], ds_serial.r["gas", "density"])
+
+
+@requires_file(output_00080)
+def test_index_cache():
+    ds = yt.load(output_00080)
+    ad = ds.all_data()
+    dens = ad["gas", "density"]
+    fn = ds.parameter_filename + ".yt_index.npz"
+    if not os.path.exists(fn):
+        # The data directory is not writable
+        return
+
+    # This load goes through the cache rather than the AMR files
+    ds_cached = yt.load(output_00080)
+    ad_cached = ds_cached.all_data()
+    assert_equal(ds_cached.index.num_grids, ds.index.num_grids)
+    assert_equal(ds_cached.index.max_level, ds.index.max_level)
+    for dom, dom_cached in zip(ds.index.domains, ds_cached.index.domains):
+        assert_equal(dom.local_oct_count, dom_cached.local_oct_count)
+        for fh, fh_cached in zip(dom.field_handlers, dom_cached.field_handlers):
+            assert_equal(fh.offset, fh_cached.offset)
+            assert_equal(fh.level_count, fh_cached.level_count)
+    assert_equal(ad_cached["gas", "density"], dens)
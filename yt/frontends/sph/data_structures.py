@@ -6,6 +6,8 @@ from yt.data_objects.static_output import ParticleDataset
 from yt.funcs import mylog
 from yt.geometry.particle_geometry_handler import ParticleIndex
 
+from .smoothing_length import SmoothingLengthDomains
+
 
 class SPHDataset(ParticleDataset):
     default_kernel_name = "cubic"
@@ -84,10 +86,31 @@ class SPHParticleIndex(ParticleIndex):
         ds._file_hash = self._generate_hash()
 
         if hasattr(self.io, "_generate_smoothing_length"):
-            self.io._generate_smoothing_length(self.data_files, self.kdtree)
+            self.io._generate_smoothing_length(self)
 
         super(SPHParticleIndex, self)._initialize_index()
 
+    def _smoothing_length_domains(self):
+        # The decomposition of the SPH particles into subdomains, in which
+        # their smoothing lengths are generated one subdomain at a time.
+        # The particles are bucketed next to the dataset when running in
+        # parallel, where the scratch space has to be shared by all the
+        # processes.
+        ds = self.ds
+        scratch_dir = None
+        if self.comm.size > 1:
+            scratch_dir = os.path.dirname(os.path.abspath(ds.parameter_filename))
+        return SmoothingLengthDomains(
+            self.io,
+            self.data_files,
+            ds._sph_ptypes[0],
+            ds.domain_left_edge.to("code_length").d,
+            ds.domain_right_edge.to("code_length").d,
+            ds.periodicity,
+            ds.num_neighbors,
+            scratch_dir=scratch_dir,
+        )
+
     def _generate_kdtree(self, fname):
         from yt.utilities.lib.cykdtree import PyKDTree
 
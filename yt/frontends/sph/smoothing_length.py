@@ -0,0 +1,431 @@
+"""
+Generation of the smoothing lengths of SPH particles, domain by domain.
+
+The smoothing length of a particle is the distance to its n-th nearest
+neighbour.  Rather than building a single kd-tree over every particle, which
+does not fit in memory for large simulations, the domain is cut into a
+regular lattice of subdomains holding about ``sph_domain_particles`` particles
+each.  The particles are first bucketed by subdomain in a single scan over the
+data files: the particles of every subdomain, and those of a halo around it,
+including periodic images, are spilled to files in a scratch directory.  A
+kd-tree is then built over the particles of each subdomain and its halo to
+find the smoothing lengths of the particles of the subdomain.  The few
+particles whose neighbours may lie beyond the halo are done again by brute
+force, against the particles of the subdomains around them.  Subdomains are
+spread over MPI ranks or local worker processes, and their smoothing lengths
+are written out as soon as each batch of subdomains is done, by the process
+that found them, one process at a time.
+
+The scratch directory holds the positions of the particles and of their
+halos, somewhat more than the positions in the dataset.  Under MPI, it must
+be shared by all the processes.
+
+"""
+import itertools
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+
+import numpy as np
+
+from yt.config import ytcfg
+from yt.funcs import mylog
+from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+from yt.utilities.parallel_tools.local_parallelism import get_local_workers
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    communication_system,
+    parallel_objects,
+)
+
+# The number of pairs of particles whose distances are computed at once when
+# smoothing lengths are found by brute force
+_brute_force_pairs = 2 ** 22
+
+# The particles spilled to the scratch directory: their positions, and the
+# data file they come from with their index in it
+_bucket_dtype = np.dtype(
+    [("pos", "float64", (3,)), ("file", "int64"), ("index", "int64")]
+)
+
+
+class SmoothingLengthDomains:
+    r"""
+    The decomposition of a particle dataset into subdomains for the
+    generation of smoothing lengths.
+
+    Parameters
+    ----------
+    io : IOHandlerSPH
+        The IO handler the positions of the particles are read with, through
+        its ``_yield_coordinates`` method.
+    data_files : list of data files
+        The data files holding the particles.
+    ptype : string
+        The type of the SPH particles.
+    left_edge, right_edge : array_like
+        The edges of the domain, in the units of the positions.
+    periodicity : tuple of bools
+        Whether the domain is periodic along each axis.
+    num_neighbors : int
+        The smoothing length of a particle is the distance to this neighbour.
+    domain_particles : int, optional
+        The number of particles to aim for in each subdomain; defaults to the
+        ``sph_domain_particles`` configuration option.
+    scratch_dir : string, optional
+        The directory in which a temporary directory is made to bucket the
+        particles by subdomain, and removed once done; defaults to the
+        temporary directory of the system.
+    """
+
+    def __init__(
+        self,
+        io,
+        data_files,
+        ptype,
+        left_edge,
+        right_edge,
+        periodicity,
+        num_neighbors,
+        domain_particles=None,
+        scratch_dir=None,
+    ):
+        self.io = io
+        self.data_files = data_files
+        self.ptype = ptype
+        self.left_edge = np.asarray(left_edge, dtype="float64")
+        self.domain_width = np.asarray(right_edge, dtype="float64") - self.left_edge
+        self.periodic = np.array(periodicity, dtype="bool")
+        self.num_neighbors = int(num_neighbors)
+        if domain_particles is None:
+            domain_particles = ytcfg.getint("yt", "sph_domain_particles")
+        self.scratch_dir = scratch_dir
+        self.counts = np.array(
+            [data_file.total_particles[ptype] for data_file in data_files],
+            dtype="int64",
+        )
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts)])
+        self.total_particles = int(self.offsets[-1])
+        nd = int(np.ceil((self.total_particles / max(domain_particles, 1)) ** (1 / 3)))
+        self.shape = (max(nd, 1),) * 3
+        self.width = self.domain_width / np.array(self.shape)
+        # Every particle in a halo this thick around a subdomain is used to
+        # find the smoothing lengths of its particles.  It starts at a few
+        # times the mean distance to the n-th neighbour, and is no thicker
+        # than half a subdomain so that periodic images are never needed
+        # twice.
+        density = self.total_particles / max(np.prod(self.domain_width), 1e-300)
+        halo = 2.0 * (self.num_neighbors / max(density, 1e-300)) ** (1 / 3)
+        self.halo = np.minimum(halo, 0.5 * self.width)
+        self.scratch = None
+        self._ngroups = 1
+
+    @property
+    def ndomains(self):
+        """The number of subdomains."""
+        return int(np.prod(self.shape))
+
+    @property
+    def domains(self):
+        """The indices of the subdomains along each axis."""
+        return [tuple(ijk) for ijk in np.ndindex(*self.shape)]
+
+    def generate(self, write, kdtree=None):
+        """
+        Find the smoothing lengths of all the particles, calling
+        ``write(i, indices, hsml)`` with the smoothing lengths *hsml* of the
+        particles *indices* of the i-th data file as they are found.  Under
+        MPI, every process writes the smoothing lengths it found, one process
+        at a time.
+
+        If there is a single subdomain, the smoothing lengths are found with
+        *kdtree*, a kd-tree of all the particles, if given.
+        """
+        comm = communication_system.communicators[-1]
+        if self.total_particles == 0:
+            return
+        if self.ndomains == 1 and kdtree is not None:
+            if comm.rank == 0:
+                self._generate_from_kdtree(write, kdtree)
+            comm.barrier()
+            return
+        kwargs = {}
+        nworkers = get_local_workers()
+        if comm.size == 1 and nworkers > 1:
+            kwargs = {"njobs": nworkers, "backend": "process"}
+        domains = self.domains
+        batch_size = max(comm.size, nworkers, 1)
+        mylog.info(
+            "Generating smoothing lengths of %s particles in %s subdomains",
+            self.total_particles,
+            len(domains),
+        )
+        scratch = None
+        if comm.rank == 0:
+            scratch = tempfile.mkdtemp(prefix="yt_hsml_", dir=self.scratch_dir)
+        self.scratch = comm.mpi_bcast(scratch)
+        try:
+            self._bucket(batch_size, kwargs)
+            for start in range(0, len(domains), batch_size):
+                batch = domains[start : start + batch_size]
+                if comm.size > 1:
+                    # The smoothing lengths are not gathered on any process:
+                    # each writes out those of its own subdomains in turn.
+                    results = [
+                        self._domain_smoothing_lengths(domain)
+                        for domain in parallel_objects(batch)
+                    ]
+                    for rank in range(comm.size):
+                        if rank == comm.rank:
+                            for result in results:
+                                self._write(write, result)
+                        comm.barrier()
+                    continue
+                storage = {}
+                for sto, domain in parallel_objects(batch, storage=storage, **kwargs):
+                    sto.result = self._domain_smoothing_lengths(domain)
+                for _, result in sorted(storage.items()):
+                    self._write(write, result)
+        finally:
+            if comm.rank == 0:
+                shutil.rmtree(self.scratch, ignore_errors=True)
+            self.scratch = None
+
+    def _write(self, write, result):
+        for i, (indices, hsml) in sorted(result.items()):
+            write(i, indices, hsml)
+
+    def _read(self, i):
+        # The positions of the particles of the i-th data file
+        positions = [
+            pos
+            for _, pos in self.io._yield_coordinates(
+                self.data_files[i], needed_ptype=self.ptype
+            )
+        ]
+        if not positions:
+            return np.empty((0, 3), dtype="float64")
+        return np.concatenate(positions).astype("float64")
+
+    def _generate_from_kdtree(self, write, kdtree):
+        positions = np.concatenate(
+            [self._read(i) for i in range(len(self.data_files))]
+        )
+        hsml = generate_smoothing_length(
+            positions[kdtree.idx], kdtree, self.num_neighbors
+        )
+        hsml = hsml[np.argsort(kdtree.idx)]
+        for i, count in enumerate(self.counts):
+            if count > 0:
+                start = self.offsets[i]
+                write(i, np.arange(count), hsml[start : start + count])
+
+    def _bucket(self, ngroups, kwargs):
+        # Spill the particles of every subdomain, and of its halo, to the
+        # scratch directory in a single scan over the data files.  The data
+        # files are split into groups, each scanned by a single process which
+        # appends to files of its own.
+        self._ngroups = ngroups
+        groups = np.array_split(np.arange(len(self.data_files)), ngroups)
+        for group, files in parallel_objects(list(enumerate(groups)), **kwargs):
+            for i in files:
+                self._bucket_file(group, int(i))
+
+    def _bucket_file(self, group, i):
+        pos = self._read(i)
+        if pos.shape[0] == 0:
+            return
+        indices = np.arange(pos.shape[0])
+        shape = np.array(self.shape)
+        own = self._domain_of(pos)
+        buckets = {
+            "core": self._split(np.ravel_multi_index(own.T, self.shape), pos, i),
+            "halo": defaultdict(list),
+        }
+        # The halo of a subdomain is no thicker than half of it, so the
+        # particles, or their periodic images, in the halo of a subdomain are
+        # in it or in the subdomains next to it.
+        for shift in self._shifts():
+            shifted = pos + shift
+            cell = self._domain_of(shifted)
+            for offset in itertools.product((-1, 0, 1), repeat=3):
+                if not np.any(shift) and not np.any(offset):
+                    continue
+                domain = cell + np.array(offset)
+                valid = np.all((domain >= 0) & (domain < shape), axis=1)
+                outer_left, outer_right = self._domain_box(domain[valid])
+                inside = np.all(
+                    (shifted[valid] >= outer_left) & (shifted[valid] < outer_right),
+                    axis=1,
+                )
+                selected = indices[valid][inside]
+                if not np.any(shift):
+                    # Particles are never in the halo of their own subdomain
+                    selected = selected[
+                        np.any(domain[selected] != own[selected], axis=1)
+                    ]
+                flat = np.ravel_multi_index(domain[selected].T, self.shape)
+                for d, particles in self._split(
+                    flat, shifted[selected], i, selected
+                ).items():
+                    buckets["halo"][d].append(particles)
+        for kind, bucket in buckets.items():
+            for d, particles in bucket.items():
+                if isinstance(particles, list):
+                    particles = np.concatenate(particles)
+                with open(self._bucket_name(d, group, kind), "ab") as f:
+                    f.write(particles.tobytes())
+
+    def _split(self, flat, pos, i, indices=None):
+        # The particles at pos of the i-th data file, with the given indices
+        # in it, split by subdomain
+        if indices is None:
+            indices = np.arange(pos.shape[0])
+        particles = np.empty(pos.shape[0], dtype=_bucket_dtype)
+        particles["pos"] = pos
+        particles["file"] = i
+        particles["index"] = indices
+        order = np.argsort(flat, kind="stable")
+        bounds = np.searchsorted(flat[order], np.arange(self.ndomains + 1))
+        return {
+            int(d): particles[order[bounds[d] : bounds[d + 1]]]
+            for d in np.flatnonzero(np.diff(bounds))
+        }
+
+    def _bucket_name(self, d, group, kind):
+        return os.path.join(self.scratch, f"{d}-{group}-{kind}.bin")
+
+    def _load(self, d, kind):
+        # The particles bucketed in the d-th subdomain, or in its halo
+        particles = [np.empty(0, dtype=_bucket_dtype)]
+        for group in range(self._ngroups):
+            fn = self._bucket_name(d, group, kind)
+            if os.path.exists(fn):
+                particles.append(np.fromfile(fn, dtype=_bucket_dtype))
+        return np.concatenate(particles)
+
+    def _shifts(self):
+        # The periodic images of the domain that may hold neighbours
+        axes = [(0, -1, 1) if p else (0,) for p in self.periodic]
+        return [
+            np.array(shift) * self.domain_width
+            for shift in np.array(np.meshgrid(*axes, indexing="ij")).reshape(3, -1).T
+        ]
+
+    def _domains_in_box(self, left, right):
+        # The flat indices of the subdomains holding particles, or periodic
+        # images of them, within the box (left, right)
+        axes = []
+        for ax in range(3):
+            n = self.shape[ax]
+            lo = (left[ax] - self.left_edge[ax]) / self.width[ax]
+            hi = (right[ax] - self.left_edge[ax]) / self.width[ax]
+            if not np.isfinite(hi - lo) or (self.periodic[ax] and hi - lo >= n):
+                axes.append(range(n))
+            elif self.periodic[ax]:
+                cells = range(int(np.floor(lo)), int(np.floor(hi)) + 1)
+                axes.append(sorted({c % n for c in cells}))
+            else:
+                lo, hi = np.clip(np.floor([lo, hi]).astype("int64"), 0, n - 1)
+                axes.append(range(lo, hi + 1))
+        return [
+            np.ravel_multi_index(ijk, self.shape) for ijk in itertools.product(*axes)
+        ]
+
+    def _domain_box(self, domain):
+        # The edges of the halos of subdomains.  Along axes that are not
+        # periodic, the outermost subdomains extend to infinity, so that they
+        # hold the particles outside the domain as well.
+        domain = np.array(domain)
+        left = self.left_edge + domain * self.width
+        right = left + self.width
+        outer_left = left - self.halo
+        outer_right = right + self.halo
+        first = (domain == 0) & ~self.periodic
+        last = (domain == np.array(self.shape) - 1) & ~self.periodic
+        outer_left[first] = -np.inf
+        outer_right[last] = np.inf
+        return outer_left, outer_right
+
+    def _domain_of(self, pos):
+        # The indices of the subdomains holding the particles at pos
+        ijk = np.floor((pos - self.left_edge) / self.width).astype("int64")
+        return np.clip(ijk, 0, np.array(self.shape) - 1)
+
+    def _domain_smoothing_lengths(self, domain):
+        # The smoothing lengths of the particles of a subdomain, as a
+        # dictionary mapping data files to (indices, hsml) pairs.
+        d = np.ravel_multi_index(domain, self.shape)
+        core = self._load(d, "core")
+        if core.size == 0:
+            return {}
+        particles = np.concatenate([core, self._load(d, "halo")])
+        positions = particles["pos"]
+        hsml = np.full(positions.shape[0], np.inf)
+        if positions.shape[0] > self.num_neighbors:
+            tree = self._kdtree(positions)
+            hsml[tree.idx.astype("int64")] = generate_smoothing_length(
+                positions[tree.idx], tree, self.num_neighbors
+            )
+        positions = core["pos"]
+        owners = np.stack([core["file"], core["index"]])
+        hsml = hsml[: core.size]
+        # A smoothing length is right if no particle outside the halo can be
+        # closer than its n-th neighbour
+        outer_left, outer_right = self._domain_box(domain)
+        margin = np.minimum(positions - outer_left, outer_right - positions)
+        resolved = hsml <= margin.min(axis=1)
+        if not resolved.all():
+            missing = ~resolved
+            hsml[missing] = self._brute_force(
+                positions[missing], owners[:, missing], hsml[missing]
+            )
+        result = {}
+        for i in np.unique(owners[0]):
+            mine = owners[0] == i
+            order = np.argsort(owners[1, mine])
+            result[int(i)] = (owners[1, mine][order], hsml[mine][order])
+        return result
+
+    def _kdtree(self, positions):
+        from yt.utilities.lib.cykdtree import PyKDTree
+
+        return PyKDTree(
+            positions,
+            left_edge=positions.min(axis=0),
+            right_edge=positions.max(axis=0),
+            periodic=False,
+            leafsize=2 * self.num_neighbors,
+        )
+
+    def _brute_force(self, positions, owners, upper):
+        # The smoothing lengths of the particles at positions, found against
+        # the particles of every subdomain that may hold particles closer
+        # than upper, an upper bound of their smoothing lengths.
+        k = self.num_neighbors
+        best = np.full((positions.shape[0], k), np.inf)
+        reach = upper.max()
+        left = positions.min(axis=0) - reach
+        right = positions.max(axis=0) + reach
+        for domain in self._domains_in_box(left, right):
+            others = self._load(domain, "core")
+            if others.size == 0:
+                continue
+            pos = others["pos"]
+            block = max(1, _brute_force_pairs // pos.shape[0])
+            for start in range(0, positions.shape[0], block):
+                end = start + block
+                dist2 = np.zeros((positions[start:end].shape[0], pos.shape[0]))
+                for ax in range(3):
+                    dx = np.abs(positions[start:end, ax, None] - pos[None, :, ax])
+                    if self.periodic[ax]:
+                        dx = np.minimum(dx, self.domain_width[ax] - dx)
+                    dist2 += dx * dx
+                # A particle is not its own neighbour
+                own = (owners[0, start:end, None] == others["file"][None, :]) & (
+                    owners[1, start:end, None] == others["index"][None, :]
+                )
+                dist2[own] = np.inf
+                candidates = np.concatenate([best[start:end], dist2], axis=1)
+                best[start:end] = np.partition(candidates, k - 1, axis=1)[:, :k]
+        return np.sqrt(best.max(axis=1))
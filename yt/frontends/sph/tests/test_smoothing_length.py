@@ -0,0 +1,85 @@
+import numpy as np
+
+from yt.frontends.sph.smoothing_length import SmoothingLengthDomains
+from yt.testing import assert_rel_equal
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+
+
+class _DataFile:
+    def __init__(self, positions):
+        self.positions = positions
+        self.total_particles = {"Gas": positions.shape[0]}
+
+
+class _IO:
+    def __init__(self):
+        self.reads = []
+
+    def _yield_coordinates(self, data_file, needed_ptype=None):
+        self.reads.append(data_file)
+        yield "Gas", data_file.positions
+
+
+def _particles():
+    np.random.seed(0x4D3D3D3)
+    # A dense clump near a corner and sparse particles everywhere, so that
+    # some particles have neighbours beyond the halo of their subdomain
+    clump = np.random.normal(0.9, 0.05, (4000, 3)) % 1.0
+    sparse = np.random.random((200, 3))
+    return np.concatenate([clump, sparse])
+
+
+def test_domain_smoothing_lengths():
+    positions = _particles()
+    data_files = [_DataFile(pos) for pos in np.array_split(positions, 7)]
+    for periodic in (True, False):
+        tree = PyKDTree(
+            positions,
+            left_edge=np.zeros(3),
+            right_edge=np.ones(3),
+            periodic=periodic,
+            leafsize=64,
+        )
+        expected = generate_smoothing_length(positions[tree.idx], tree, 32)
+        expected = expected[np.argsort(tree.idx)]
+        domains = SmoothingLengthDomains(
+            _IO(),
+            data_files,
+            "Gas",
+            np.zeros(3),
+            np.ones(3),
+            (periodic,) * 3,
+            32,
+            domain_particles=200,
+        )
+        assert domains.ndomains == 27
+        hsml = np.zeros(positions.shape[0])
+
+        def _write(i, indices, values):
+            hsml[domains.offsets[i] + indices] = values
+
+        domains.generate(_write)
+        assert_rel_equal(hsml, expected, 10)
+
+
+def test_domain_buckets(tmp_path):
+    positions = _particles()
+    data_files = [_DataFile(pos) for pos in np.array_split(positions, 7)]
+    io = _IO()
+    domains = SmoothingLengthDomains(
+        io,
+        data_files,
+        "Gas",
+        np.zeros(3),
+        np.ones(3),
+        (True,) * 3,
+        32,
+        domain_particles=200,
+        scratch_dir=str(tmp_path),
+    )
+    domains.generate(lambda i, indices, values: None)
+    # Every data file is read once, to bucket its particles by subdomain,
+    # and the buckets are removed once done
+    assert sorted(map(id, io.reads)) == sorted(map(id, data_files))
+    assert list(tmp_path.iterdir()) == []
@@ -8,6 +8,7 @@ from yt.utilities.logger import ytLogger as mylog
 class IOHandlerStream(BaseIOHandler):
 
     _dataset_type = "stream"
+    _cache_reads = False
     _vector_fields = ("particle_velocity", "particle_position")
 
     def __init__(self, ds):
@@ -90,6 +91,7 @@ class StreamParticleIOHandler(BaseIOHandler):
 
     _vector_fields = ("particle_position", "particle_velocity")
     _dataset_type = "stream_particles"
+    _cache_reads = False
     _vector_fields = ("particle_velocity", "particle_position")
 
     def __init__(self, ds):
@@ -208,6 +210,7 @@ class StreamParticleIOHandler(BaseIOHandler):
 
 class IOHandlerStreamHexahedral(BaseIOHandler):
     _dataset_type = "stream_hexahedral"
+    _cache_reads = False
     _vector_fields = ("particle_velocity", "particle_position")
 
     def __init__(self, ds):
@@ -243,6 +246,7 @@ class IOHandlerStreamHexahedral(BaseIOHandler):
 
 class IOHandlerStreamOctree(BaseIOHandler):
     _dataset_type = "stream_octree"
+    _cache_reads = False
     _vector_fields = ("particle_velocity", "particle_position")
 
     def __init__(self, ds):
@@ -268,6 +272,7 @@ class IOHandlerStreamOctree(BaseIOHandler):
 
 class IOHandlerStreamUnstructured(BaseIOHandler):
     _dataset_type = "stream_unstructured"
+    _cache_reads = False
 
     def __init__(self, ds):
         self.fields = ds.stream_handler.fields
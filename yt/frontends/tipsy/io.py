@@ -8,8 +8,8 @@ from numpy.lib.recfunctions import append_fields
 from yt.frontends.sph.io import IOHandlerSPH
 from yt.frontends.tipsy.definitions import npart_mapping
 from yt.geometry.particle_geometry_handler import CHUNKSIZE
-from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
 from yt.utilities.logger import ytLogger as mylog
+from yt.utilities.parallel_tools.parallel_analysis_interface import communication_system
 
 
 class IOHandlerTipsyBinary(IOHandlerSPH):
@@ -117,29 +117,47 @@ class IOHandlerTipsyBinary(IOHandlerSPH):
     def hsml_filename(self):
         return f"{self.ds.parameter_filename}-{'hsml'}"
 
-    def _generate_smoothing_length(self, data_files, kdtree):
+    def _generate_smoothing_length(self, index):
+        comm = communication_system.communicators[-1]
         if os.path.exists(self.hsml_filename):
             with open(self.hsml_filename, "rb") as f:
                 file_hash = struct.unpack("q", f.read(struct.calcsize("q")))[0]
-            if file_hash != self.ds._file_hash:
-                os.remove(self.hsml_filename)
-            else:
+            if file_hash == self.ds._file_hash:
                 return
-        positions = []
-        for data_file in data_files:
-            for _, ppos in self._yield_coordinates(
-                data_file, needed_ptype=self.ds._sph_ptypes[0]
-            ):
-                positions.append(ppos)
-        if positions == []:
+            if comm.rank == 0:
+                os.remove(self.hsml_filename)
+            comm.barrier()
+        domains = index._smoothing_length_domains()
+        if domains.total_particles == 0:
             return
-        positions = np.concatenate(positions)[kdtree.idx]
-        hsml = generate_smoothing_length(positions, kdtree, self.ds._num_neighbors)
-        hsml = hsml[np.argsort(kdtree.idx)]
         dtype = self._pdtypes["Gas"]["Coordinates"][0]
-        with open(self.hsml_filename, "wb") as f:
-            f.write(struct.pack("q", self.ds._file_hash))
-            f.write(hsml.astype(dtype).tostring())
+        header = struct.calcsize("q")
+        if comm.rank == 0:
+            # The hash of the data is only stored once all the smoothing
+            # lengths are written, so that interrupted runs start over.
+            with open(self.hsml_filename, "wb") as f:
+                f.write(struct.pack("q", ~self.ds._file_hash))
+                f.truncate(header + domains.total_particles * dtype.itemsize)
+        comm.barrier()
+
+        def _write(i, indices, hsml):
+            hsmls = np.memmap(
+                self.hsml_filename,
+                dtype=dtype,
+                mode="r+",
+                offset=header,
+                shape=(domains.total_particles,),
+            )
+            hsmls[domains.offsets[i] + indices] = hsml
+            hsmls.flush()
+            del hsmls
+
+        kdtree = index.kdtree if domains.ndomains == 1 else None
+        domains.generate(_write, kdtree=kdtree)
+        if comm.rank == 0:
+            with open(self.hsml_filename, "r+b") as f:
+                f.write(struct.pack("q", self.ds._file_hash))
+        comm.barrier()
 
     def _read_smoothing_length(self, data_file, count):
         dtype = self._pdtypes["Gas"]["Coordinates"][0]
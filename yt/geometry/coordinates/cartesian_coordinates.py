@@ -516,13 +516,24 @@ class CartesianCoordinateHandler(CoordinateHandler):
                 )
             buff = buff.transpose()
         else:
+            px, py = data_source["px"], data_source["py"]
+            pdx, pdy = data_source["pdx"], data_source["pdy"]
+            data = data_source[field]
+            if hasattr(data_source, "_elements_in_window") and data.shape == px.shape:
+                # Only pixelize the elements that overlap the window
+                ind = data_source._elements_in_window(
+                    bounds, period if periodic else None
+                )
+                if ind.size < px.size:
+                    px, py, pdx, pdy = px[ind], py[ind], pdx[ind], pdy[ind]
+                    data = data[ind]
             pixelize_cartesian(
                 buff,
-                data_source["px"],
-                data_source["py"],
-                data_source["pdx"],
-                data_source["pdy"],
-                data_source[field],
+                px,
+                py,
+                pdx,
+                pdy,
+                data,
                 bounds,
                 int(antialias),
                 period,
@@ -0,0 +1,178 @@
+"""
+A spatial index over the elements of two-dimensional data objects.
+
+Slices and projections are made of rectangular elements, given by their
+centers (``px``, ``py``) and half-widths (``pdx``, ``pdy``).  Pixelizing a
+window of such an object only needs the elements that overlap it, which for a
+deep zoom into a large object are a tiny fraction of them.  The index sorts
+the elements once so that the ones overlapping any window are found in a
+time that depends on how many of them there are rather than on the total
+number of elements.
+
+Elements are grouped by level, that is by the power of two of their widths,
+and the elements of each level are binned on a regular lattice whose cells
+are as wide as the widest element of the level, so that every element
+overlaps at most two cells along each axis.  Within a level, elements are
+sorted by the row-major index of the cell holding their lower left corner, so
+that the elements of each row of cells within a window are a contiguous range
+of the sorted elements.
+
+"""
+import numpy as np
+
+# Lattices are coarsened until their cells can be numbered with int64 values.
+_max_cells = 2 ** 62
+
+
+class _Level:
+    # The elements of one level, binned on a lattice of cells of size
+    # (wx, wy) whose origin is the lower left corner of all the elements.
+    def __init__(self, indices, left, bottom, width, height, origin, extent):
+        wx, wy = width.max(), height.max()
+        nx = int(extent[0] / wx) + 2
+        ny = int(extent[1] / wy) + 2
+        while nx * ny >= _max_cells:
+            wx, wy = 2 * wx, 2 * wy
+            nx, ny = nx // 2 + 1, ny // 2 + 1
+        self.origin = origin
+        self.cell_size = (wx, wy)
+        self.shape = (nx, ny)
+        ix = ((left - origin[0]) / wx).astype("int64").clip(0, nx - 1)
+        iy = ((bottom - origin[1]) / wy).astype("int64").clip(0, ny - 1)
+        keys = iy * nx + ix
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.indices = indices[order]
+
+    def query(self, bounds):
+        # The indices of the elements of this level that may overlap bounds
+        nx, ny = self.shape
+        wx, wy = self.cell_size
+        x0, y0 = self.origin
+        # An element overlaps the window only if its lower left corner is
+        # less than one cell to the left of or below it.
+        ix0 = max(int(np.floor((bounds[0] - x0) / wx)) - 1, 0)
+        ix1 = min(int(np.floor((bounds[1] - x0) / wx)), nx - 1)
+        iy0 = max(int(np.floor((bounds[2] - y0) / wy)) - 1, 0)
+        iy1 = min(int(np.floor((bounds[3] - y0) / wy)), ny - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return self.indices[:0]
+        nrows = iy1 - iy0 + 1
+        if (ix0 == 0 and ix1 == nx - 1) or nrows > self.keys.size:
+            # The rows are contiguous in the sorted elements; take them whole
+            # rather than searching each of them.
+            start = np.searchsorted(self.keys, iy0 * nx + ix0, side="left")
+            end = np.searchsorted(self.keys, iy1 * nx + ix1, side="right")
+            return self.indices[start:end]
+        rows = np.arange(iy0, iy1 + 1, dtype="int64") * nx
+        starts = np.searchsorted(self.keys, rows + ix0, side="left")
+        ends = np.searchsorted(self.keys, rows + ix1, side="right")
+        counts = ends - starts
+        total = counts.sum()
+        if total == 0:
+            return self.indices[:0]
+        # Concatenate the ranges [starts[i], ends[i])
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.indices[np.arange(total) + offsets]
+
+
+class ElementIndex:
+    r"""
+    A level-aware spatial index over rectangular two-dimensional elements.
+
+    Parameters
+    ----------
+    px, py : array_like
+        The centers of the elements.
+    pdx, pdy : array_like
+        Their half-widths.
+    """
+
+    def __init__(self, px, py, pdx, pdy):
+        self.px = np.asarray(px, dtype="float64")
+        self.py = np.asarray(py, dtype="float64")
+        self.pdx = np.asarray(pdx, dtype="float64")
+        self.pdy = np.asarray(pdy, dtype="float64")
+        self.levels = []
+        if self.px.size == 0:
+            self.bbox = None
+            return
+        left = self.px - self.pdx
+        bottom = self.py - self.pdy
+        origin = (left.min(), bottom.min())
+        self.bbox = (
+            origin[0],
+            (self.px + self.pdx).max(),
+            origin[1],
+            (self.py + self.pdy).max(),
+        )
+        extent = (self.bbox[1] - origin[0], self.bbox[3] - origin[1])
+        # The level of an element is the binary exponent of its width and
+        # height; elements of zero width all go to the same level.
+        _, xlevel = np.frexp(self.pdx)
+        _, ylevel = np.frexp(self.pdy)
+        level_keys = xlevel.astype("int64") * 4096 + ylevel
+        order = np.argsort(level_keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(level_keys[order])) + 1
+        for indices in np.split(order, bounds):
+            width = 2.0 * self.pdx[indices]
+            height = 2.0 * self.pdy[indices]
+            if width.max() <= 0 or height.max() <= 0:
+                # Degenerate elements cover no pixel; keep them all.
+                width = np.full(indices.size, extent[0] or 1.0)
+                height = np.full(indices.size, extent[1] or 1.0)
+            self.levels.append(
+                _Level(
+                    indices,
+                    left[indices],
+                    bottom[indices],
+                    width,
+                    height,
+                    origin,
+                    extent,
+                )
+            )
+
+    def query(self, bounds, period=None):
+        """
+        Return the sorted indices of the elements that overlap the window
+        *bounds*, given as (xmin, xmax, ymin, ymax).  If *period* is given,
+        the elements whose periodic images, shifted by one period along
+        either axis, overlap the window are included as well.
+        """
+        if self.bbox is None:
+            return np.zeros(0, dtype="int64")
+        windows = [tuple(bounds)]
+        if period is not None:
+            windows = [
+                (
+                    bounds[0] + sx * period[0],
+                    bounds[1] + sx * period[0],
+                    bounds[2] + sy * period[1],
+                    bounds[3] + sy * period[1],
+                )
+                for sx in ((0,) if period[0] == 0 else (-1, 0, 1))
+                for sy in ((0,) if period[1] == 0 else (-1, 0, 1))
+            ]
+        found = []
+        for window in windows:
+            if (
+                window[0] >= self.bbox[1]
+                or window[1] <= self.bbox[0]
+                or window[2] >= self.bbox[3]
+                or window[3] <= self.bbox[2]
+            ):
+                continue
+            for level in self.levels:
+                ind = level.query(window)
+                overlaps = (
+                    (self.px[ind] + self.pdx[ind] > window[0])
+                    & (self.px[ind] - self.pdx[ind] < window[1])
+                    & (self.py[ind] + self.pdy[ind] > window[2])
+                    & (self.py[ind] - self.pdy[ind] < window[3])
+                )
+                found.append(ind[overlaps])
+        if not found:
+            return np.zeros(0, dtype="int64")
+        # Keep the order of the elements, which matters where they overlap
+        return np.unique(np.concatenate(found))
@@ -1,17 +1,26 @@
 import abc
 import os
 import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
 from yt.config import ytcfg
+from yt.fields.field_exceptions import NeedsGridType
 from yt.units.yt_array import YTArray, uconcatenate
 from yt.utilities.exceptions import YTFieldNotFound
 from yt.utilities.io_handler import io_registry
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
+from yt.utilities.parallel_tools.local_parallelism import (
+    _run_in_worker,
+    local_parallel_enabled,
+    local_parallel_map,
+)
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     ParallelAnalysisInterface,
+    communication_system,
     parallel_root_only,
 )
 
@@ -201,13 +210,22 @@ class Index(ParallelAnalysisInterface, abc.ABC):
         fields_to_read, fields_to_generate = self._split_fields(fields)
         if len(fields_to_read) == 0:
             return {}, fields_to_generate
+        prefetched, fields_to_read = _pop_prefetched(chunk, fields_to_read)
+        if len(fields_to_read) == 0:
+            return prefetched, fields_to_generate
         selector = dobj.selector
         if chunk is None:
             self._identify_base_chunk(dobj)
         chunks = self._chunk_io(dobj, cache=False)
-        fields_to_return = self.io._read_particle_selection(
-            chunks, selector, fields_to_read
-        )
+        if local_parallel_enabled():
+            fields_to_return = self._read_particle_chunks_local(
+                chunks, selector, fields_to_read
+            )
+        else:
+            fields_to_return = self.io._read_particle_selection(
+                chunks, selector, fields_to_read
+            )
+        fields_to_return.update(prefetched)
         return fields_to_return, fields_to_generate
 
     def _read_fluid_fields(self, fields, dobj, chunk=None):
@@ -216,17 +234,92 @@ class Index(ParallelAnalysisInterface, abc.ABC):
         fields_to_read, fields_to_generate = self._split_fields(fields)
         if len(fields_to_read) == 0:
             return {}, fields_to_generate
+        prefetched, fields_to_read = _pop_prefetched(chunk, fields_to_read)
+        if len(fields_to_read) == 0:
+            return prefetched, fields_to_generate
         selector = dobj.selector
         if chunk is None:
             self._identify_base_chunk(dobj)
             chunk_size = dobj.size
         else:
             chunk_size = chunk.data_size
-        fields_to_return = self.io._read_fluid_selection(
-            self._chunk_io(dobj), selector, fields_to_read, chunk_size
-        )
+        if local_parallel_enabled():
+            fields_to_return = self._read_fluid_chunks_local(
+                self._chunk_io(dobj, cache=False), selector, fields_to_read
+            )
+        else:
+            fields_to_return = self.io._read_fluid_selection(
+                self._chunk_io(dobj), selector, fields_to_read, chunk_size
+            )
+        fields_to_return.update(prefetched)
         return fields_to_return, fields_to_generate
 
+    def _read_fluid_chunks_local(self, chunks, selector, fields):
+        # Each io chunk is read and selected independently by a local worker;
+        # the per-chunk arrays are then concatenated in chunk order, so the
+        # result is identical to a serial read.
+        chunks = list(chunks)
+
+        def _read_chunk(chunk):
+            if chunk.data_size is None:
+                # This sets chunk.data_size as a side effect.
+                chunk.ires
+            return self.io._read_fluid_selection(
+                [chunk], selector, fields, chunk.data_size
+            )
+
+        if len(chunks) == 0:
+            return self.io._read_fluid_selection(chunks, selector, fields, 0)
+        elif len(chunks) == 1:
+            return _read_chunk(chunks[0])
+        return _merge_chunk_fields(local_parallel_map(_read_chunk, chunks), fields)
+
+    def _read_particle_chunks_local(self, chunks, selector, fields):
+        chunks = list(chunks)
+        if len(chunks) <= 1:
+            return self.io._read_particle_selection(chunks, selector, fields)
+
+        def _read_chunk(chunk):
+            return self.io._read_particle_selection([chunk], selector, fields)
+
+        return _merge_chunk_fields(local_parallel_map(_read_chunk, chunks), fields)
+
+    def _prefetch_chunks(self, chunks, dobj, fields):
+        # Wrap an iterator of io chunks of dobj so that the on-disk fields
+        # needed by *fields* are read ahead, if this is enabled.
+        depth = ytcfg.getint("yt", "chunk_prefetch_depth")
+        if depth <= 0 or communication_system.communicators[-1].size > 1:
+            # In parallel, each process only handles some of the chunks.
+            return chunks
+        fluids, particles = self._prefetch_fields(dobj, fields)
+        if len(fluids) == 0 and len(particles) == 0:
+            return chunks
+        max_bytes = ytcfg.getint("yt", "chunk_prefetch_memory") * 1024 ** 2
+        return PrefetchChunkIterator(
+            chunks, self.io, dobj.selector, fluids, particles, depth, max_bytes
+        )
+
+    def _prefetch_fields(self, dobj, fields):
+        # The on-disk fluid and particle fields that dobj.get_data would read
+        # to get *fields*.  Fields that need ghost zones or particle filters
+        # are read differently, so they are left alone.
+        fields_to_get = []
+        for field in dobj._determine_fields(fields):
+            if field[0] in self.ds.filtered_particle_types:
+                continue
+            try:
+                self.ds._get_field_info(*field).check_available(dobj)
+            except NeedsGridType:
+                continue
+            fields_to_get.append(field)
+        fluids, particles = [], []
+        for field in dobj._identify_dependencies(fields_to_get, dobj._spatial):
+            if self.ds._get_field_info(*field).sampling_type == "particle":
+                particles.append(field)
+            else:
+                fluids.append(field)
+        return self._split_fields(fluids)[0], self._split_fields(particles)[0]
+
     def _chunk(self, dobj, chunking_style, ngz=0, **kwargs):
         # A chunk is either None or (grids, size)
         if dobj._current_chunk is None:
@@ -243,6 +336,21 @@ class Index(ParallelAnalysisInterface, abc.ABC):
             raise NotImplementedError
 
 
+def _pop_prefetched(chunk, fields):
+    # Split fields into those that were read ahead for this chunk, returned
+    # with their data, and those that still have to be read.
+    prefetched = getattr(chunk, "_prefetched", None)
+    if not prefetched:
+        return {}, fields
+    found = {field: prefetched.pop(field) for field in fields if field in prefetched}
+    return found, [field for field in fields if field not in found]
+
+
+def _merge_chunk_fields(chunk_data, fields):
+    # Concatenate per-chunk field dictionaries, preserving chunk order.
+    return {field: np.concatenate([cd[field] for cd in chunk_data]) for field in fields}
+
+
 def cached_property(func):
     n = f"_{func.__name__}"
 
@@ -279,6 +387,8 @@ class YTDataChunk:
         self._field_type = field_type
         self._cache = cache
         self._fast_index = fast_index
+        # Data read ahead of time by a PrefetchChunkIterator
+        self._prefetched = None
 
     def _accumulate_values(self, method):
         # We call this generically.  It's somewhat slower, since we're doing
@@ -444,6 +554,105 @@ class ChunkDataCache:
         return g
 
 
+class PrefetchChunkIterator:
+    """
+    Iterate over io chunks, reading the on-disk fields of the next *depth*
+    chunks in a background thread while the current one is being processed
+    (selected, used to generate derived fields, binned, ...).
+
+    Reading stops getting ahead once the data read in advance exceeds
+    *max_bytes*.  Chunks whose size is not known beforehand (particle and
+    octree chunks) are charged the size of the arrays read from them, and no
+    further chunk is read until that is known.  The data of each chunk is
+    attached to it and picked
+    up by :meth:`Index._read_fluid_fields` and
+    :meth:`Index._read_particle_fields`.
+    """
+
+    def __init__(
+        self, base_iter, io, selector, fluids, particles, depth=1, max_bytes=None
+    ):
+        self.base_iter = iter(base_iter)
+        self.io = io
+        self.selector = selector
+        self.fluids = fluids
+        self.particles = particles
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self._pending = deque()
+        self._exhausted = False
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._submit()
+        if len(self._pending) == 0:
+            self.close()
+            raise StopIteration
+        chunk, future, _ = self._pending.popleft()
+        # Start reading the following chunks before handing this one over.
+        self._submit()
+        chunk._prefetched = future.result()
+        return chunk
+
+    def _submit(self):
+        # The base iterator is only ever advanced from the consuming thread.
+        while not self._exhausted and len(self._pending) < self.depth:
+            if len(self._pending) > 0 and self.max_bytes is not None:
+                nbytes = self._pending_bytes()
+                if nbytes is None or nbytes >= self.max_bytes:
+                    break
+            try:
+                chunk = next(self.base_iter)
+            except StopIteration:
+                self._exhausted = True
+                break
+            nbytes = None
+            if len(self.particles) == 0 and chunk.data_size is not None:
+                nbytes = chunk.data_size * 8 * len(self.fluids)
+            future = self._executor.submit(_run_in_worker, self._read, chunk)
+            self._pending.append([chunk, future, nbytes])
+
+    def _pending_bytes(self):
+        # The size of the data read ahead, or None while the size of a chunk
+        # still being read is not known.
+        total = 0
+        for entry in self._pending:
+            if entry[2] is None:
+                if not entry[1].done():
+                    return None
+                entry[2] = sum(v.nbytes for v in entry[1].result().values())
+            total += entry[2]
+        return total
+
+    def _read(self, chunk):
+        rv = {}
+        if len(self.fluids) > 0:
+            if chunk.data_size is None:
+                # This sets chunk.data_size as a side effect.
+                chunk.ires
+            rv.update(
+                self.io._read_fluid_selection(
+                    [chunk], self.selector, self.fluids, chunk.data_size
+                )
+            )
+        if len(self.particles) > 0:
+            rv.update(
+                self.io._read_particle_selection([chunk], self.selector, self.particles)
+            )
+        return rv
+
+    def close(self):
+        """Stop reading ahead and wait for reads in progress to finish."""
+        for _, future, _ in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._exhausted = True
+        self._executor.shutdown(wait=True)
+
+
 def is_curvilinear(geo):
     # tell geometry is curvilinear or not
     if geo in ["polar", "cylindrical", "spherical"]:
@@ -1,4 +1,5 @@
 import abc
+import itertools
 import weakref
 from collections import defaultdict
 
@@ -9,19 +10,32 @@ from yt.config import ytcfg
 from yt.fields.derived_field import ValidateSpatial
 from yt.fields.field_detector import FieldDetector
 from yt.funcs import ensure_list, ensure_numpy_array
+from yt.geometry.element_index import ElementIndex
 from yt.geometry.geometry_handler import ChunkDataCache, Index, YTDataChunk
+from yt.geometry.mask_cache import SelectorMaskCache
 from yt.utilities.definitions import MAXLEVEL
+from yt.utilities.io_handler import IOCache
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 from .grid_container import GridTree, MatchPointsToGrids
 
+# The memory, in bytes, the graph of neighbouring grids may use
+_grid_neighbors_bytes = 16 * 1024 ** 2
+
 
 class GridIndex(Index, abc.ABC):
     """The index class for patch and block AMR datasets. """
 
     float_type = "float64"
     _preload_implemented = False
+    _grid_box_index = None
+    # The grids around every grid, by level and box of ghost zones, and the
+    # data of the grids read for ghost zones during a traversal, both kept
+    # in least recently used caches bounded by the bytes they hold
+    _grid_neighbors = None
+    _ghost_zone_data = None
+    _mask_cache = None
     _index_properties = (
         "grid_left_edge",
         "grid_right_edge",
@@ -118,6 +132,17 @@ class GridIndex(Index, abc.ABC):
             g.clear_data()
         self.io.queue.clear()
 
+    @property
+    def selector_masks(self):
+        """
+        The masks of the selectors the grids were selected with, kept by
+        :class:`~yt.geometry.mask_cache.SelectorMaskCache` and shared by all
+        the data objects of this index.
+        """
+        if self._mask_cache is None:
+            self._mask_cache = SelectorMaskCache()
+        return self._mask_cache
+
     def get_smallest_dx(self):
         """
         Returns (in code units) the smallest cell size in the simulation.
@@ -251,43 +276,239 @@ class GridIndex(Index, abc.ABC):
         for item in ("Mpc", "pc", "AU", "cm"):
             print("\tWidth: %0.3e %s" % (dx.in_units(item), item))
 
-    def _find_field_values_at_points(self, fields, coords):
+    def _find_field_values_at_points(self, fields, coords, interpolate=False):
         r"""Find the value of fields at a set of coordinates.
 
         Returns the values [field1, field2,...] of the fields at the given
-        (x, y, z) points. Returns a numpy array of field values cross coords
+        (x, y, z) points.  Points are sorted by the leaf grid that contains
+        them, so that each grid is read once, for all the fields, and its
+        values are gathered for all of its points at once.  If *interpolate*
+        is True, values are trilinearly interpolated from the cell centers:
+        points whose 2x2x2 stencil lies within their grid are interpolated
+        from the grid itself, and those near its edges from a covering grid
+        over only the cells their stencils reach into.  Points that are not
+        within any grid get a value of NaN.
         """
         coords = self.ds.arr(ensure_numpy_array(coords), "code_length")
-        grids = self._find_points(coords[:, 0], coords[:, 1], coords[:, 2])[0]
+        coords = coords.d.reshape(-1, 3)
         fields = ensure_list(fields)
-        mark = np.zeros(3, dtype=np.int)
-        out = []
-
-        # create point -> grid mapping
-        grid_index = {}
-        for coord_index, grid in enumerate(grids):
-            if grid not in grid_index:
-                grid_index[grid] = []
-            grid_index[grid].append(coord_index)
-
-        out = []
-        for field in fields:
-            funit = self.ds._get_field_info(field).units
-            out.append(self.ds.arr(np.empty((len(coords))), funit))
-
-        for grid in grid_index:
-            cellwidth = (grid.RightEdge - grid.LeftEdge) / grid.ActiveDimensions
-            for field_index, field in enumerate(fields):
-                for coord_index in grid_index[grid]:
-                    mark = (coords[coord_index, :] - grid.LeftEdge) / cellwidth
-                    mark = np.array(mark, dtype="int64")
-                    out[field_index][coord_index] = grid[field][
-                        mark[0], mark[1], mark[2]
-                    ]
+        grid_ind = self._find_points(coords[:, 0], coords[:, 1], coords[:, 2])[1]
+
+        out = [np.full(coords.shape[0], np.nan, dtype="float64") for f in fields]
+        units = [self.ds._get_field_info(field).units for field in fields]
+        order = np.argsort(grid_ind, kind="stable")
+        sorted_ind = grid_ind[order]
+        starts = np.flatnonzero(np.diff(sorted_ind, prepend=-2))
+        ends = np.append(starts[1:], sorted_ind.size)
+        for start, end in zip(starts, ends):
+            if sorted_ind[start] < 0:
+                continue
+            grid = self.grids[sorted_ind[start]]
+            points = order[start:end]
+            values = self._sample_grid(grid, fields, coords[points], interpolate)
+            for field_index, vals in enumerate(values):
+                out[field_index][points] = vals.d
+                units[field_index] = vals.units
+        out = [self.ds.arr(vals, unit) for vals, unit in zip(out, units)]
         if len(fields) == 1:
             return out[0]
         return out
 
+    def _sample_grid(self, grid, fields, points, interpolate):
+        # Values of *fields* in *grid* at the (N, 3) code_length *points*
+        dds = grid.dds.d
+        left_edge = grid.LeftEdge.d
+        dims = grid.ActiveDimensions
+        if not interpolate:
+            ijk = ((points - left_edge) / dds).astype("int64")
+            ijk = np.clip(ijk, 0, dims - 1)
+            return [
+                self.ds.arr(data[ijk[:, 0], ijk[:, 1], ijk[:, 2]], data.units)
+                for data in self._read_grid(grid, fields)
+            ]
+        # Position in units of cells relative to the center of the first cell
+        # of the grid, and the first cell of the 2x2x2 stencil around it
+        u = (points - left_edge) / dds - 0.5
+        corner = np.floor(u).astype("int64")
+        w1 = np.clip(u - corner, 0.0, 1.0)
+        inside = np.all((corner >= 0) & (corner + 1 < dims), axis=1)
+        values = [np.empty(points.shape[0], dtype="float64") for f in fields]
+        units = [None for f in fields]
+        if inside.any():
+            # The stencils of these points are within the grid itself.
+            for field_index, data in enumerate(self._read_grid(grid, fields)):
+                values[field_index][inside] = _trilinear(
+                    data.d, corner[inside], w1[inside]
+                )
+                units[field_index] = data.units
+        if not inside.all():
+            # Only cover the cells that the stencils of the points near the
+            # edges of the grid reach into, rather than the whole grid and a
+            # layer of ghost zones around it.
+            edge = ~inside
+            cmin = corner[edge].min(axis=0)
+            cmax = corner[edge].max(axis=0) + 1
+            start_index = grid.get_global_startindex() + cmin
+            cube = self.ds.covering_grid(
+                grid.Level,
+                start_index * grid.dds + self.ds.domain_left_edge,
+                cmax - cmin + 1,
+                fields=fields,
+                field_parameters=dict(grid.field_parameters),
+                use_pbar=False,
+            )
+            for field_index, field in enumerate(fields):
+                data = cube[field]
+                values[field_index][edge] = _trilinear(
+                    data.d, corner[edge] - cmin, w1[edge]
+                )
+                units[field_index] = data.units
+        return [self.ds.arr(vals, unit) for vals, unit in zip(values, units)]
+
+    def _read_grid(self, grid, fields):
+        # Read *fields* in *grid*, without keeping them around in the grid
+        # when they were not there before.
+        known = set(grid.field_data)
+        grid.get_data(fields)
+        data = [grid[field] for field in fields]
+        for key in list(grid.field_data):
+            if key not in known:
+                grid.field_data.pop(key)
+        return data
+
+    def _grids_in_box(self, left_edge, right_edge, level):
+        # The indices of the grids of level that overlap the box between
+        # left_edge and right_edge (in code units), or whose periodic images
+        # do.  Grids are found through a spatial index over their x and y
+        # extents, built once.
+        if self._grid_box_index is None:
+            LE = self.grid_left_edge.d
+            RE = self.grid_right_edge.d
+            self._grid_box_index = ElementIndex(
+                0.5 * (LE[:, 0] + RE[:, 0]),
+                0.5 * (LE[:, 1] + RE[:, 1]),
+                0.5 * (RE[:, 0] - LE[:, 0]),
+                0.5 * (RE[:, 1] - LE[:, 1]),
+            )
+        period = np.where(self.ds.periodicity, self.ds.domain_width.d, 0.0)
+        ind = self._grid_box_index.query(
+            (left_edge[0], right_edge[0], left_edge[1], right_edge[1]), period[:2]
+        )
+        ind = ind[self.grid_levels[ind, 0] == level]
+        zlo = self.grid_left_edge.d[ind, 2]
+        zhi = self.grid_right_edge.d[ind, 2]
+        overlaps = np.zeros(ind.size, dtype="bool")
+        for shift in (0.0,) if period[2] == 0 else (0.0, -period[2], period[2]):
+            overlaps |= (zlo + shift < right_edge[2]) & (zhi + shift > left_edge[2])
+        return ind[overlaps]
+
+    def _neighbor_cells(
+        self, grid, fields, level, left_edge, right_edge, loose=True, masked=False
+    ):
+        """
+        Yield the values of *fields*, the icoords and the ires of the cells of
+        the grids of *level* around *grid* that overlap the box between
+        *left_edge* and *right_edge* (in code units), or whose centers are in
+        it if *loose* is False.  If *masked* is True, the cells covered by
+        child grids are left out.
+
+        This is how the ghost zones of grids are filled: the grids around
+        every grid are looked up once and kept as a graph of neighbours, and
+        only the parts of them within the box are used.  Within a traversal
+        of the grids by spatial chunks with ghost zones, the data of every
+        grid is read once and shared by all of its neighbours.
+        """
+        left_edge = np.asarray(left_edge, dtype="float64")
+        right_edge = np.asarray(right_edge, dtype="float64")
+        if self._grid_neighbors is None:
+            self._grid_neighbors = IOCache(max_bytes=_grid_neighbors_bytes)
+        key = (grid.id, level, tuple(left_edge), tuple(right_edge))
+        neighbors = self._grid_neighbors.get(key)
+        if neighbors is None:
+            neighbors = self._grids_in_box(left_edge, right_edge, level)
+            self._grid_neighbors.put(key, neighbors)
+        yield from self._box_cells(
+            neighbors,
+            fields,
+            level,
+            left_edge,
+            right_edge,
+            loose=loose,
+            masked=masked,
+            data=self._ghost_zone_data,
+        )
+
+    def _box_cells(
+        self,
+        grid_indices,
+        fields,
+        level,
+        left_edge,
+        right_edge,
+        loose=True,
+        masked=False,
+        data=None,
+    ):
+        # Yield the values of fields, the icoords and the ires of the cells of
+        # the grids of level with indices grid_indices within the box between
+        # left_edge and right_edge, selected as in _neighbor_cells.  The
+        # values read are shared through data, when given, and only held
+        # while the cells of their grid are yielded otherwise.
+        DLE = self.ds.domain_left_edge.d
+        nd = self.ds.dimensionality
+        level_dims = self.ds.domain_dimensions.astype("int64")
+        level_dims[:nd] *= self.ds.relative_refinement(0, level)
+        shifts = [(0, -1, 1) if p else (0,) for p in self.ds.periodicity]
+        for gi in grid_indices:
+            g = self.grids[gi]
+            dx = g.dds.d
+            if loose:
+                lo = np.floor((left_edge - DLE) / dx)
+                hi = np.ceil((right_edge - DLE) / dx)
+            else:
+                lo = np.ceil((left_edge - DLE) / dx - 0.5)
+                hi = np.ceil((right_edge - DLE) / dx - 0.5)
+            lo, hi = lo.astype("int64"), hi.astype("int64")
+            start = g.get_global_startindex().astype("int64")
+            values = None
+            for shift in itertools.product(*shifts):
+                offset = start + np.array(shift, dtype="int64") * level_dims
+                cell_lo = np.maximum(lo, offset)
+                cell_hi = np.minimum(hi, offset + g.ActiveDimensions)
+                if np.any(cell_hi <= cell_lo):
+                    continue
+                if values is None:
+                    values = self._ghost_zone_values(g, fields, data)
+                sl = tuple(
+                    slice(l - o, h - o) for l, h, o in zip(cell_lo, cell_hi, offset)
+                )
+                icoords = np.indices(cell_hi - cell_lo, dtype="int64")
+                icoords = icoords.reshape(3, -1).T + cell_lo
+                input_fields = [v[sl].ravel() for v in values]
+                if masked:
+                    selected = g.child_mask[sl].ravel()
+                    icoords = icoords[selected]
+                    input_fields = [v[selected] for v in input_fields]
+                ires = np.full(icoords.shape[0], level, dtype="int64")
+                yield input_fields, np.ascontiguousarray(icoords), ires
+
+    def _ghost_zone_values(self, grid, fields, data):
+        # The values of fields in grid, shared by its neighbours through data,
+        # a cache of the data read so far, if given
+        values = {}
+        if data is not None:
+            for field in fields:
+                v = data.get((grid.id, field))
+                if v is not None:
+                    values[field] = v
+        missing = [f for f in fields if f not in values]
+        if missing:
+            for field, v in zip(missing, self._read_grid(grid, missing)):
+                values[field] = v.d.astype("float64", copy=False)
+                if data is not None:
+                    data.put((grid.id, field), values[field])
+        return [values[f] for f in fields]
+
     def _find_points(self, x, y, z):
         """
         Returns the (objects, indices) of leaf grids
@@ -392,17 +613,27 @@ class GridIndex(Index, abc.ABC):
         preload_fields, _ = self._split_fields(preload_fields)
         if self._preload_implemented and len(preload_fields) > 0 and ngz == 0:
             giter = ChunkDataCache(list(giter), preload_fields, self)
-        for og in giter:
-            if ngz > 0:
-                g = og.retrieve_ghost_zones(ngz, [], smoothed=True)
-            else:
-                g = og
-            size = self._count_selection(dobj, [og])
-            if size == 0:
-                continue
-            # We don't want to cache any of the masks or icoords or fcoords for
-            # individual grids.
-            yield YTDataChunk(dobj, "spatial", [g], size, cache=False)
+        # Share the data read for the ghost zones of every grid with those of
+        # its neighbours during the traversal, within a memory budget
+        own_data = ngz > 0 and self._ghost_zone_data is None
+        if own_data:
+            max_bytes = ytcfg.getint("yt", "ghost_zone_cache_size") * 1024 ** 2
+            self._ghost_zone_data = IOCache(max_bytes=max_bytes)
+        try:
+            for og in giter:
+                if ngz > 0:
+                    g = og.retrieve_ghost_zones(ngz, [], smoothed=True)
+                else:
+                    g = og
+                size = self._count_selection(dobj, [og])
+                if size == 0:
+                    continue
+                # We don't want to cache any of the masks or icoords or fcoords
+                # for individual grids.
+                yield YTDataChunk(dobj, "spatial", [g], size, cache=False)
+        finally:
+            if own_data:
+                self._ghost_zone_data = None
 
     _grid_chunksize = 1000
 
@@ -496,3 +727,20 @@ def _grid_sort_mixed(g):
     if g.filename is None:
         return str(g.id)
     return g.filename
+
+
+def _trilinear(data, corner, w1):
+    # Trilinear interpolation in the 3D array data, between the cells
+    # corner and corner + 1 along each axis, with weights w1 for the latter.
+    w0 = 1.0 - w1
+    vals = 0.0
+    for di in (0, 1):
+        wx = w1[:, 0] if di else w0[:, 0]
+        for dj in (0, 1):
+            wy = w1[:, 1] if dj else w0[:, 1]
+            for dk in (0, 1):
+                wz = w1[:, 2] if dk else w0[:, 2]
+                vals = vals + wx * wy * wz * data[
+                    corner[:, 0] + di, corner[:, 1] + dj, corner[:, 2] + dk
+                ]
+    return vals
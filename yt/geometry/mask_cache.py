@@ -0,0 +1,112 @@
+"""
+A cache of the masks of selectors over the grids of an index.
+
+Filling the mask of a selector over a grid runs the selector over every cell
+of the grid.  Grids keep the mask of the last selector they were selected
+with, but alternating between data objects (for instance a sphere and a cut
+region of it, or a profile and a projection) evicts it every time.  The index
+keeps a cache of the masks of several selectors instead, compressed to one bit
+per cell, so that selecting the same cells again only has to unpack them.
+Masks selecting every cell of a grid or none of them are stored without any
+bits at all.
+
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from yt.config import ytcfg
+
+# The size we account for every entry on top of its bits
+_entry_overhead = 128
+
+
+class SelectorMaskCache:
+    r"""
+    A least-recently-used cache of compressed selector masks, bounded by the
+    number of bytes it holds.
+
+    Masks are stored by (selector hash, grid ID).  The size of the cache is
+    given in megabytes by the ``mask_cache_size`` configuration option,
+    unless *max_bytes* is set.  A size of 0 disables caching.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The maximum number of bytes held by the cache.
+    """
+
+    def __init__(self, max_bytes=None):
+        self._max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return ytcfg.getint("yt", "mask_cache_size") * 1024 ** 2
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """
+        Return a (mask, count) pair for *key*, where mask is None if nothing
+        is selected, or None if there is no mask stored under *key*.
+        """
+        with self._lock:
+            entry = self._data.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        bits, shape, count = entry
+        if count == 0:
+            return None, 0
+        size = int(np.prod(shape))
+        if bits is None:
+            return np.ones(shape, dtype="bool"), count
+        mask = np.unpackbits(bits)[:size].view("bool").reshape(shape)
+        return mask, count
+
+    def put(self, key, mask, count):
+        """
+        Store *mask*, which selects *count* cells, under *key*.  *mask* may
+        be None if nothing is selected.
+        """
+        if mask is None or count == 0:
+            bits, shape, count = None, (), 0
+        elif count == mask.size:
+            bits, shape = None, mask.shape
+        else:
+            bits, shape = np.packbits(mask.ravel()), mask.shape
+        nbytes = _entry_overhead + (0 if bits is None else bits.nbytes)
+        max_bytes = self.max_bytes
+        if nbytes > max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= self._entry_nbytes(old)
+            while self._data and self.nbytes + nbytes > max_bytes:
+                _, old = self._data.popitem(last=False)
+                self.nbytes -= self._entry_nbytes(old)
+            self._data[key] = (bits, shape, int(count))
+            self.nbytes += nbytes
+
+    @staticmethod
+    def _entry_nbytes(entry):
+        bits = entry[0]
+        return _entry_overhead + (0 if bits is None else bits.nbytes)
+
+    def clear(self):
+        """Empty the cache.  The counters are left untouched."""
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
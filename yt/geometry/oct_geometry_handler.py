@@ -1,6 +1,7 @@
 import numpy as np
 
 from yt.fields.field_detector import FieldDetector
+from yt.funcs import ensure_list, ensure_numpy_array
 from yt.geometry.geometry_handler import Index
 from yt.utilities.logger import ytLogger as mylog
 
@@ -24,6 +25,72 @@ class OctreeIndex(Index):
     def convert(self, unit):
         return self.dataset.conversion_factors[unit]
 
+    def _find_field_values_at_points(self, fields, coords, interpolate=False):
+        r"""Find the value of fields at a set of coordinates.
+
+        Returns the values [field1, field2,...] of the fields at the given
+        (x, y, z) points.  The octs containing the points are located in each
+        domain subset that overlaps their bounding box, and each subset is
+        read at most once, for all the fields, before its values are gathered
+        for all of its points at once.  Points that are not within the domain
+        get a value of NaN.
+        """
+        if interpolate:
+            raise NotImplementedError(
+                "Interpolation of field values at points is only "
+                "implemented for grid indices."
+            )
+        coords = self.ds.arr(ensure_numpy_array(coords), "code_length")
+        coords = coords.reshape(-1, 3)
+        fields = ensure_list(fields)
+        out = [np.full(coords.shape[0], np.nan, dtype="float64") for f in fields]
+        units = [self.ds._get_field_info(field).units for field in fields]
+
+        DLE = self.ds.domain_left_edge.to("code_length").d
+        DRE = self.ds.domain_right_edge.to("code_length").d
+        remaining = np.all((coords.d >= DLE) & (coords.d < DRE), axis=1)
+        if remaining.any():
+            # Pad the bounding box by a root cell so that the octs holding the
+            # outermost points are selected.
+            pad = (DRE - DLE) / self.ds.domain_dimensions
+            left_edge = np.maximum(coords.d[remaining].min(axis=0) - pad, DLE)
+            right_edge = np.minimum(coords.d[remaining].max(axis=0) + pad, DRE)
+            dobj = self.ds.box(left_edge, right_edge)
+            for chunk in dobj.chunks([], "io"):
+                for subset in chunk.objs:
+                    if not remaining.any():
+                        break
+                    points = np.flatnonzero(remaining)
+                    points = self._sample_subset(
+                        subset, dobj, fields, coords, points, out, units
+                    )
+                    remaining[points] = False
+        out = [self.ds.arr(vals, unit) for vals, unit in zip(out, units)]
+        if len(fields) == 1:
+            return out[0]
+        return out
+
+    def _sample_subset(self, subset, dobj, fields, coords, points, out, units):
+        # Locate *points* among the cells of *subset* and, if any of them is
+        # found there, read the fields and fill *out* in place.  Returns the
+        # points that were found.
+        ncells = (subset.domain_ind >= 0).sum() * 8
+        cell_index = subset.mesh_sampling_particle_field(
+            coords[points], np.arange(ncells, dtype="float64")
+        )
+        found = ~np.isnan(cell_index)
+        if not found.any():
+            return points[found]
+        points = points[found]
+        cell_index = cell_index[found].astype("int64")
+        subset.field_parameters = dobj.field_parameters
+        subset.get_data(fields)
+        for field_index, field in enumerate(fields):
+            data = subset[field].T.reshape(-1)
+            out[field_index][points] = data.d[cell_index]
+            units[field_index] = data.units
+        return points
+
     def _add_mesh_sampling_particle_field(self, deposit_field, ftype, ptype):
         units = self.ds.field_info[ftype, deposit_field].units
         take_log = self.ds.field_info[ftype, deposit_field].take_log
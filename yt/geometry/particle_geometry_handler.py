@@ -1,5 +1,6 @@
 import collections
 import errno
+import functools
 import os
 import struct
 import weakref
@@ -10,8 +11,13 @@ from yt.data_objects.particle_container import ParticleContainer
 from yt.funcs import get_pbar, only_on_root
 from yt.geometry.geometry_handler import Index, YTDataChunk
 from yt.geometry.particle_oct_container import ParticleBitmap
+from yt.utilities.lib.ewah_bool_wrap import BoolArrayCollection
 from yt.utilities.lib.fnv_hash import fnv_hash
 from yt.utilities.logger import ytLogger as mylog
+from yt.utilities.parallel_tools.local_parallelism import (
+    local_parallel_enabled,
+    local_parallel_map,
+)
 
 CHUNKSIZE = 64 ** 3
 
@@ -162,29 +168,69 @@ class ParticleIndex(Index):
                     pass
             rflag = self.regions.check_bitmasks()
 
+    def _get_data_file_hsml(self, data_file, ptype, pos):
+        if hasattr(self.ds, "_sph_ptypes") and ptype == self.ds._sph_ptypes[0]:
+            return self.io._get_smoothing_length(data_file, pos.dtype, pos.shape)
+        return None
+
     def _initialize_coarse_index(self):
+        if local_parallel_enabled() and len(self.data_files) > 1:
+            self._initialize_coarse_index_local()
+            return
         pb = get_pbar("Initializing coarse index ", len(self.data_files))
         for i, data_file in enumerate(self.data_files):
             pb.update(i)
             for ptype, pos in self.io._yield_coordinates(data_file):
-                ds = self.ds
-                if hasattr(ds, "_sph_ptypes") and ptype == ds._sph_ptypes[0]:
-                    hsml = self.io._get_smoothing_length(
-                        data_file, pos.dtype, pos.shape
-                    )
-                else:
-                    hsml = None
+                hsml = self._get_data_file_hsml(data_file, ptype, pos)
                 self.regions._coarse_index_data_file(pos, hsml, data_file.file_id)
             self.regions._set_coarse_index_data_file(data_file.file_id)
         pb.finish()
         self.regions.find_collisions_coarse()
 
+    def _new_file_bitmap(self):
+        # A single-file bitmap with the same geometry as self.regions, used to
+        # index one data file independently of all the others.
+        return ParticleBitmap(
+            self.ds.domain_left_edge,
+            self.ds.domain_right_edge,
+            self.ds.periodicity,
+            self.ds._file_hash,
+            1,
+            index_order1=self.regions.index_order1,
+            index_order2=self.regions.index_order2,
+        )
+
+    def _coarse_index_worker(self, i):
+        # Build the coarse index of a single data file and return only the
+        # coarse cells it touches, so that results are cheap to send back.
+        data_file = self.data_files[i]
+        regions = self._new_file_bitmap()
+        for ptype, pos in self.io._yield_coordinates(data_file):
+            hsml = self._get_data_file_hsml(data_file, ptype, pos)
+            regions._coarse_index_data_file(pos, hsml, 0)
+        mask_ind = np.nonzero(regions.masks[:, 0])[0]
+        count_ind = np.nonzero(regions.particle_counts)[0]
+        return mask_ind, count_ind, regions.particle_counts[count_ind]
+
+    def _initialize_coarse_index_local(self):
+        # Each data file is indexed in a pool of local worker processes; the
+        # per-file masks and particle counts are then merged here.
+        mylog.info("Initializing coarse index with local workers")
+        results = local_parallel_map(
+            self._coarse_index_worker, range(len(self.data_files)), backend="process"
+        )
+        pb = get_pbar("Merging coarse index ", len(self.data_files))
+        for i, (mask_ind, count_ind, counts) in enumerate(results):
+            pb.update(i)
+            file_id = self.data_files[i].file_id
+            self.regions.masks[mask_ind, file_id] = 1
+            self.regions.particle_counts[count_ind] += counts
+            self.regions._set_coarse_index_data_file(file_id)
+        pb.finish()
+        self.regions.find_collisions_coarse()
+
     def _initialize_refined_index(self):
         mask = self.regions.masks.sum(axis=1).astype("uint8")
-        max_npart = max(sum(d.total_particles.values()) for d in self.data_files) * 28
-        sub_mi1 = np.zeros(max_npart, "uint64")
-        sub_mi2 = np.zeros(max_npart, "uint64")
-        pb = get_pbar("Initializing refined index", len(self.data_files))
         mask_threshold = getattr(self, "_index_mask_threshold", 2)
         count_threshold = getattr(self, "_index_count_threshold", 256)
         mylog.debug(
@@ -201,6 +247,13 @@ class ParticleIndex(Index):
             total_coarse_refined,
             100 * total_coarse_refined / mask.size,
         )
+        if local_parallel_enabled() and len(self.data_files) > 1:
+            self._initialize_refined_index_local(mask, count_threshold, mask_threshold)
+            return
+        max_npart = max(sum(d.total_particles.values()) for d in self.data_files) * 28
+        sub_mi1 = np.zeros(max_npart, "uint64")
+        sub_mi2 = np.zeros(max_npart, "uint64")
+        pb = get_pbar("Initializing refined index", len(self.data_files))
         for i, data_file in enumerate(self.data_files):
             coll = None
             pb.update(i)
@@ -208,12 +261,7 @@ class ParticleIndex(Index):
             for ptype, pos in self.io._yield_coordinates(data_file):
                 if pos.size == 0:
                     continue
-                if hasattr(self.ds, "_sph_ptypes") and ptype == self.ds._sph_ptypes[0]:
-                    hsml = self.io._get_smoothing_length(
-                        data_file, pos.dtype, pos.shape
-                    )
-                else:
-                    hsml = None
+                hsml = self._get_data_file_hsml(data_file, ptype, pos)
                 nsub_mi, coll = self.regions._refined_index_data_file(
                     coll,
                     pos,
@@ -231,6 +279,58 @@ class ParticleIndex(Index):
         pb.finish()
         self.regions.find_collisions_refined()
 
+    def _refined_index_worker(self, i, mask, count_threshold, mask_threshold):
+        # The refined index of a data file only depends on the global coarse
+        # mask and particle counts, so each file can be done on its own.  The
+        # resulting collection is returned serialized.
+        data_file = self.data_files[i]
+        regions = self._new_file_bitmap()
+        regions.particle_counts = self.regions.particle_counts
+        sub_mi = np.zeros(0, "uint64")
+        coll = None
+        for ptype, pos in self.io._yield_coordinates(data_file):
+            if pos.size == 0:
+                continue
+            hsml = self._get_data_file_hsml(data_file, ptype, pos)
+            _, coll = regions._refined_index_data_file(
+                coll,
+                pos,
+                hsml,
+                mask,
+                sub_mi,
+                sub_mi,
+                0,
+                0,
+                count_threshold=count_threshold,
+                mask_threshold=mask_threshold,
+            )
+        if coll is None:
+            return None
+        return coll.dumps()
+
+    def _initialize_refined_index_local(self, mask, count_threshold, mask_threshold):
+        mylog.info("Initializing refined index with local workers")
+        results = local_parallel_map(
+            functools.partial(
+                self._refined_index_worker,
+                mask=mask,
+                count_threshold=count_threshold,
+                mask_threshold=mask_threshold,
+            ),
+            range(len(self.data_files)),
+            backend="process",
+        )
+        pb = get_pbar("Merging refined index", len(self.data_files))
+        for i, serialized in enumerate(results):
+            pb.update(i)
+            coll = None
+            if serialized is not None:
+                coll = BoolArrayCollection()
+                coll.loads(serialized)
+            self.regions.bitmasks.append(self.data_files[i].file_id, coll)
+        pb.finish()
+        self.regions.find_collisions_refined()
+
     def _detect_output_fields(self):
         # TODO: Add additional fields
         self._setup_filenames()
@@ -1144,13 +1144,15 @@ cdef class RegionSelector(SelectorObject):
                 ("left_edge[2]", self.left_edge[2]),
                 ("right_edge[0]", self.right_edge[0]),
                 ("right_edge[1]", self.right_edge[1]),
-                ("right_edge[2]", self.right_edge[2]))
+                ("right_edge[2]", self.right_edge[2]),
+                ("loose_selection", self.loose_selection))
 
 region_selector = RegionSelector
 
 cdef class CutRegionSelector(SelectorObject):
     cdef set _positions
     cdef tuple _conditionals
+    cdef np.int64_t _base_selector_hash
 
     def __init__(self, dobj):
         axis_name = dobj.ds.coordinates.axis_name
@@ -1159,6 +1161,8 @@ cdef class CutRegionSelector(SelectorObject):
                               dobj['index', axis_name[2]]]).T
         self._conditionals = tuple(dobj.conditionals)
         self._positions = set(tuple(position) for position in positions)
+        # The same conditionals select different cells from different objects
+        self._base_selector_hash = hash(dobj.base_object.selector)
 
     cdef int select_bbox(self,  np.float64_t left_edge[3],
                      np.float64_t right_edge[3]) nogil:
@@ -1185,7 +1189,8 @@ cdef class CutRegionSelector(SelectorObject):
         t = ()
         for i, c in enumerate(self._conditionals):
             t += ("conditional[%s]" % i, c)
-        return ("conditionals", t)
+        return (("conditionals", t),
+                ("base_selector", self._base_selector_hash))
 
 cut_region_selector = CutRegionSelector
 
@@ -0,0 +1,88 @@
+import numpy as np
+
+from yt.geometry.element_index import ElementIndex
+from yt.testing import assert_equal, fake_amr_ds
+from yt.utilities.lib.pixelization_routines import pixelize_cartesian
+
+
+def _brute_force(px, py, pdx, pdy, bounds):
+    return np.flatnonzero(
+        (px + pdx > bounds[0])
+        & (px - pdx < bounds[1])
+        & (py + pdy > bounds[2])
+        & (py - pdy < bounds[3])
+    )
+
+
+def test_element_index_windows():
+    np.random.seed(0x4D3D3D3)
+    n = 5000
+    # Elements of widths spread over several levels, and of uneven widths
+    pdx = 0.5 ** np.random.randint(3, 10, n) * np.random.uniform(0.6, 1.0, n)
+    pdy = 0.5 ** np.random.randint(3, 10, n)
+    px = np.random.random(n)
+    py = np.random.random(n)
+    index = ElementIndex(px, py, pdx, pdy)
+    for _ in range(50):
+        x0, y0 = np.random.uniform(-0.1, 1.0, 2)
+        w = 10 ** np.random.uniform(-4, 0)
+        bounds = (x0, x0 + w, y0, y0 + w)
+        assert_equal(index.query(bounds), _brute_force(px, py, pdx, pdy, bounds))
+    # Periodic images shifted by one period along either axis
+    bounds = (0.9, 1.1, -0.05, 0.05)
+    expected = np.unique(
+        np.concatenate(
+            [
+                _brute_force(px + sx, py + sy, pdx, pdy, bounds)
+                for sx in (-1, 0, 1)
+                for sy in (-1, 0, 1)
+            ]
+        )
+    )
+    assert_equal(index.query(bounds, period=(1.0, 1.0)), expected)
+    assert_equal(ElementIndex([], [], [], []).query(bounds).size, 0)
+
+
+def test_slice_elements_in_window():
+    ds = fake_amr_ds()
+    slc = ds.slice(2, 0.5)
+    px, py = slc["px"].d, slc["py"].d
+    pdx, pdy = slc["pdx"].d, slc["pdy"].d
+    for bounds in [(0.4, 0.45, 0.1, 0.3), (0.0, 1.0, 0.0, 1.0), (0.9, 1.2, 0, 0.1)]:
+        assert_equal(
+            slc._elements_in_window(bounds), _brute_force(px, py, pdx, pdy, bounds)
+        )
+    # Windows give the same images as pixelizing every element
+    field = ("stream", "Density")
+    for bounds in [(0.3, 0.31, 0.6, 0.61), (0.95, 1.05, -0.05, 0.05)]:
+        expected = np.zeros((64, 64))
+        pixelize_cartesian(
+            expected, px, py, pdx, pdy, slc[field].d, bounds, 1, (1.0, 1.0), 1
+        )
+        image = ds.coordinates.pixelize(2, slc, field, bounds, (64, 64))
+        assert_equal(image, expected)
+
+
+def test_elements_in_window_units():
+    # The plot callbacks give windows with units
+    ds = fake_amr_ds()
+    slc = ds.slice(2, 0.5)
+    px, py = slc["px"].d, slc["py"].d
+    pdx, pdy = slc["pdx"].d, slc["pdy"].d
+    bounds = (0.9, 1.1, -0.05, 0.05)
+    period = ds.domain_width[:2]
+    expected = slc._elements_in_window(bounds, period=(1.0, 1.0))
+    assert_equal(
+        slc._elements_in_window(ds.arr(bounds, "code_length"), period), expected
+    )
+    assert_equal(
+        slc._elements_in_window(ds.arr(bounds, "code_length").to("cm"), period),
+        expected,
+    )
+    assert expected.size < px.size
+    images = [
+        _brute_force(px + sx, py + sy, pdx, pdy, bounds)
+        for sx in (-1, 0, 1)
+        for sy in (-1, 0, 1)
+    ]
+    assert_equal(expected, np.unique(np.concatenate(images)))
@@ -0,0 +1,78 @@
+import numpy as np
+
+from yt.geometry.mask_cache import SelectorMaskCache
+from yt.testing import assert_equal, fake_amr_ds
+
+
+def test_mask_cache_round_trip():
+    np.random.seed(0x4D3D3D3)
+    cache = SelectorMaskCache(max_bytes=10 ** 6)
+    mask = np.random.random((7, 9, 5)) > 0.5
+    cache.put("partial", mask, mask.sum())
+    cache.put("full", np.ones((4, 4, 4), dtype="bool"), 64)
+    cache.put("empty", None, 0)
+    for key, expected in [
+        ("partial", mask),
+        ("full", np.ones((4, 4, 4), dtype="bool")),
+    ]:
+        cached, count = cache.get(key)
+        assert_equal(cached, expected)
+        assert_equal(count, expected.sum())
+    assert_equal(cache.get("empty"), (None, 0))
+    assert cache.get("missing") is None
+    # The least recently used masks go first
+    cache = SelectorMaskCache(max_bytes=cache.nbytes - 1)
+    cache.put("partial", mask, mask.sum())
+    cache.put("full", np.ones((4, 4, 4), dtype="bool"), 64)
+    cache.get("partial")
+    cache.put("empty", None, 0)
+    assert cache.get("full") is None
+    assert cache.get("partial") is not None
+
+
+def test_alternating_selections():
+    ds = fake_amr_ds(fields=("Density",))
+    sp = ds.sphere([0.5, 0.5, 0.5], 0.25)
+    reg = ds.region([0.5, 0.5, 0.5], [0.2, 0.3, 0.1], [0.7, 0.8, 0.6])
+    expected = [sp["index", "ones"].sum(), reg["index", "ones"].sum()]
+    masks = ds.index.selector_masks
+    assert len(masks) > 0
+    misses = masks.misses
+    for _ in range(2):
+        for obj, count in zip(
+            [
+                ds.sphere([0.5, 0.5, 0.5], 0.25),
+                ds.region([0.5, 0.5, 0.5], [0.2, 0.3, 0.1], [0.7, 0.8, 0.6]),
+            ],
+            expected,
+        ):
+            assert_equal(obj["index", "ones"].sum(), count)
+    # Every mask was found in the cache
+    assert_equal(masks.misses, misses)
+
+
+def test_selections_sharing_edges():
+    ds = fake_amr_ds(fields=("Density",))
+    le, re = [0.21, 0.33, 0.12], [0.67, 0.81, 0.59]
+    loose = ds.region([0.5, 0.5, 0.5], le, re)
+    loose.loose_selection = True
+    strict = ds.region([0.5, 0.5, 0.5], le, re)
+    assert hash(loose.selector) != hash(strict.selector)
+    # Selected in turn on one index, each keeps its own masks
+    counts = [loose["index", "ones"].sum(), strict["index", "ones"].sum()]
+    assert counts[0] > counts[1]
+    loose = ds.region([0.5, 0.5, 0.5], le, re)
+    loose.loose_selection = True
+    assert_equal(loose["index", "ones"].sum(), counts[0])
+    assert_equal(ds.region([0.5, 0.5, 0.5], le, re)["index", "ones"].sum(), counts[1])
+    # Cut regions with the same conditions on different objects
+    conditions = ["obj['stream', 'Density'] > 0.5"]
+    sp1 = ds.sphere([0.5, 0.5, 0.5], 0.2)
+    sp2 = ds.sphere([0.5, 0.5, 0.5], 0.3)
+    cut1, cut2 = sp1.cut_region(conditions), sp2.cut_region(conditions)
+    assert hash(cut1.selector) != hash(cut2.selector)
+    count1 = cut1["index", "ones"].sum()
+    count2 = cut2["index", "ones"].sum()
+    assert count1 < count2
+    assert_equal(sp2.cut_region(conditions)["index", "ones"].sum(), count2)
+    assert_equal(sp1.cut_region(conditions)["index", "ones"].sum(), count1)
@@ -6,7 +6,7 @@ import yt.units.dimensions as dimensions
 from yt.geometry.oct_container import _ORDER_MAX
 from yt.geometry.particle_oct_container import ParticleBitmap, ParticleOctreeContainer
 from yt.geometry.selection_routines import RegionSelector
-from yt.testing import assert_array_equal, assert_equal, assert_true
+from yt.testing import assert_array_equal, assert_equal, assert_true, fake_particle_ds
 from yt.units.unit_registry import UnitRegistry
 from yt.units.yt_array import YTArray
 from yt.utilities.lib.geometry_utils import (
@@ -785,3 +785,18 @@ def fake_decomp(
         pickle.dump(pos, fd)
         fd.close()
     return pos
+
+
+def test_bitmap_local_parallel():
+    from yt.utilities.parallel_tools.local_parallelism import local_parallelism
+
+    # Enough particles to be split over several data files
+    npart = 3 * 64 ** 3
+    ds_serial = fake_particle_ds(npart=npart)
+    ds_serial.index
+    with local_parallelism(3):
+        ds_local = fake_particle_ds(npart=npart)
+        ds_local.index
+    assert_true(len(ds_local.index.data_files) > 1)
+    assert_true(ds_serial.index.regions.iseq_bitmask(ds_local.index.regions))
+    assert_array_equal(ds_serial.index.regions.masks, ds_local.index.regions.masks)
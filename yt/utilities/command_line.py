@@ -996,7 +996,10 @@ class YTMapserverCmd(YTCommand):
 
     def __call__(self, args):
         from yt.frontends.ramses.data_structures import RAMSESDataset
-        from yt.visualization.mapserver.pannable_map import PannableMapServer
+        from yt.visualization.mapserver.pannable_map import (
+            PannableMapServer,
+            ThreadedWSGIRefServer,
+        )
 
         # For RAMSES datasets, use the bbox feature to make the dataset load faster
         if RAMSESDataset._is_valid(args.ds) and args.center and args.width:
@@ -1059,9 +1062,9 @@ class YTMapserverCmd(YTCommand):
                 args.host = args.host[:colonpl]
             else:
                 port = 8080
-            bottle.run(server="auto", host=args.host, port=port)
+            bottle.run(server=ThreadedWSGIRefServer, host=args.host, port=port)
         else:
-            bottle.run(server="auto")
+            bottle.run(server=ThreadedWSGIRefServer)
 
 
 class YTPastebinCmd(YTCommand):
@@ -118,8 +118,9 @@ cdef class FortranFile:
         >>> rv = f.read_vector("d")  # Read a float64 array
         >>> rv = f.read_vector("i")  # Read an int32 array
         """
-        cdef INT32_t s1, s2, size
+        cdef INT32_t s1, s2, size, nelem
         cdef np.ndarray data
+        cdef void *buf
 
         if self._closed:
             raise ValueError("I/O operation on closed file.")
@@ -133,8 +134,13 @@ cdef class FortranFile:
             raise ValueError('Size obtained (%s) does not match with the expected '
                              'size (%s) of multi-item record' % (s1, size))
 
-        data = np.empty(s1 // size, dtype=dtype)
-        fread(<void *>data.data, size, s1 // size, self.cfile)
+        nelem = s1 // size
+        data = np.empty(nelem, dtype=dtype)
+        buf = <void *>data.data
+        # Release the GIL for the bulk read, so that several files can be
+        # read concurrently from different threads.
+        with nogil:
+            fread(buf, size, nelem, self.cfile)
         fread(&s2, INT32_SIZE, 1, self.cfile)
 
         if s1 != s2:
@@ -1,22 +1,151 @@
 import os
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
-from functools import _make_key, lru_cache
+from functools import wraps
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.geometry.selection_routines import GridSelector
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 io_registry = {}
 
-use_caching = 0
+# Set while a cached reader is running in the current thread, so that readers
+# calling their parent class' reader do not cache the same data twice.
+_cache_state = threading.local()
 
 
-def _make_io_key(args, *_args, **kwargs):
-    self, obj, field, ctx = args
-    # Ignore self because we have a self-specific cache
-    return _make_key((obj.id, field), *_args, **kwargs)
+def _array_nbytes(arr):
+    # Views keep their base array alive, so that is what we account for.
+    while isinstance(getattr(arr, "base", None), np.ndarray):
+        arr = arr.base
+    return getattr(arr, "nbytes", 0)
+
+
+class IOCache:
+    """
+    A least-recently-used cache of arrays read from disk, bounded by the total
+    number of bytes it holds rather than by its number of entries.
+
+    A single instance, ``io_cache``, is shared by the IO handlers of every
+    dataset; keys include the identity of the dataset the data belongs to.
+    Its size is given in megabytes by the ``io_cache_size`` configuration
+    option, unless *max_bytes* is set.  A size of 0 disables caching.
+    """
+
+    def __init__(self, max_bytes=None):
+        self._max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return ytcfg.getint("yt", "io_cache_size") * 1024 ** 2
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        self._max_bytes = value
+        with self._lock:
+            self._evict(0)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        """Return the array stored under *key*, or None."""
+        with self._lock:
+            entry = self._data.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        Store *value* under *key*, evicting the least recently used entries
+        to stay within the memory budget, and return the number of evicted
+        entries.  Arrays larger than the whole budget are not stored.
+        """
+        nbytes = _array_nbytes(value)
+        max_bytes = self.max_bytes
+        if nbytes > max_bytes:
+            return 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            nevicted = self._evict(nbytes, max_bytes)
+            self._data[key] = (value, nbytes)
+            self.nbytes += nbytes
+        return nevicted
+
+    def _evict(self, nbytes, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        nevicted = 0
+        while self._data and self.nbytes + nbytes > max_bytes:
+            _, (_, old_nbytes) = self._data.popitem(last=False)
+            self.nbytes -= old_nbytes
+            nevicted += 1
+        self.evictions += nevicted
+        return nevicted
+
+    def clear(self):
+        """Empty the cache.  The counters are left untouched."""
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+io_cache = IOCache()
+
+
+def _io_obj_key(obj):
+    # Something that identifies the on-disk data an io chunk object refers
+    # to, or None if we do not know how to identify it.
+    data_files = getattr(obj, "data_files", None)
+    if data_files is not None:
+        return tuple((df.filename, df.start, df.end) for df in data_files)
+    return getattr(obj, "id", None)
+
+
+def _cached_obj_reader(func):
+    # Wraps a _read_obj_field implementation so that its results go through
+    # the shared io_cache.
+    @wraps(func)
+    def _read_obj_field(self, obj, field, *args, **kwargs):
+        if getattr(_cache_state, "active", False):
+            return func(self, obj, field, *args, **kwargs)
+        key = self._io_cache_key("obj", obj.id, field)
+        if key is None:
+            return func(self, obj, field, *args, **kwargs)
+        data = self._io_cache_get(key)
+        if data is not None:
+            return data
+        _cache_state.active = True
+        try:
+            data = func(self, obj, field, *args, **kwargs)
+        finally:
+            _cache_state.active = False
+        # Cached arrays are shared between readers, so nobody may modify them.
+        data.flags.writeable = False
+        self._io_cache_put(key, data)
+        return data
+
+    return _read_obj_field
 
 
 class BaseIOHandler:
@@ -24,17 +153,20 @@ class BaseIOHandler:
     _dataset_type = None
     _particle_reader = False
     _cache_on = False
+    # Whether reads may go through the shared io_cache; handlers of in-memory
+    # data, which can be modified in place, turn this off.
+    _cache_reads = True
+    _ds_cache_key = None
     _misses = 0
     _hits = 0
+    _evictions = 0
 
     def __init_subclass__(cls, *args, **kwargs):
         super().__init_subclass__(*args, **kwargs)
         if hasattr(cls, "_dataset_type"):
             io_registry[cls._dataset_type] = cls
-        if use_caching and hasattr(cls, "_read_obj_field"):
-            cls._read_obj_field = lru_cache(
-                maxsize=use_caching, typed=True, make_key=_make_io_key
-            )(cls._read_obj_field)
+        if "_read_obj_field" in cls.__dict__:
+            cls._read_obj_field = _cached_obj_reader(cls._read_obj_field)
 
     def __init__(self, ds):
         self.queue = defaultdict(dict)
@@ -48,6 +180,33 @@ class BaseIOHandler:
         if not isinstance(self._vector_fields, dict):
             self._vector_fields = dict((field, 3) for field in self._vector_fields)
 
+    def _io_cache_key(self, *key):
+        # Returns None if reads should not be cached.
+        if not self._cache_reads or io_cache.max_bytes <= 0:
+            return None
+        if self._ds_cache_key is None:
+            self._ds_cache_key = (self.ds.parameter_filename, self.ds._hash())
+        return (self._ds_cache_key,) + key
+
+    def _io_cache_get(self, key):
+        data = io_cache.get(key)
+        if data is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return data
+
+    def _io_cache_put(self, key, data):
+        self._evictions += io_cache.put(key, data)
+
+    def _cached_obj_field(self, obj, field):
+        # What _read_obj_field(obj, field) would return if it is in the io
+        # cache, or None, so that io_iter can avoid touching the file at all.
+        key = self._io_cache_key("obj", obj.id, field)
+        if key is None or key not in io_cache:
+            return None
+        return self._io_cache_get(key)
+
     # We need a function for reading a list of sets
     # and a function for *popping* from a queue all the appropriate sets
     @contextmanager
@@ -157,6 +316,39 @@ class BaseIOHandler:
         return psize
 
     def _read_particle_selection(self, chunks, selector, fields):
+        chunks = list(chunks)
+        key = self._particle_cache_key(chunks, selector)
+        if key is None:
+            return self._read_particle_selection_uncached(chunks, selector, fields)
+        rv = {}
+        missing = []
+        for field in fields:
+            data = self._io_cache_get(key + (field,))
+            if data is None:
+                missing.append(field)
+            else:
+                rv[field] = data.copy()
+        if len(missing) > 0:
+            new = self._read_particle_selection_uncached(chunks, selector, missing)
+            for field, data in new.items():
+                self._io_cache_put(key + (field,), data.copy())
+            rv.update(new)
+        return rv
+
+    def _particle_cache_key(self, chunks, selector):
+        key = self._io_cache_key("particles")
+        if key is None:
+            return None
+        obj_keys = tuple(_io_obj_key(obj) for chunk in chunks for obj in chunk.objs)
+        if None in obj_keys:
+            return None
+        try:
+            selector_key = (type(selector).__name__, hash(selector))
+        except NotImplementedError:
+            return None
+        return key + (selector_key, obj_keys)
+
+    def _read_particle_selection_uncached(self, chunks, selector, fields):
         rv = {}
         ind = {}
         # We first need a set of masks for each particle type
@@ -42,10 +42,10 @@ cdef struct CandidateContour:
     CandidateContour *next
 
 cdef ContourID *contour_create(np.int64_t contour_id,
-                               ContourID *prev = ?)
+                               ContourID *prev = ?) nogil
 cdef void contour_delete(ContourID *node)
-cdef ContourID *contour_find(ContourID *node)
-cdef void contour_union(ContourID *node1, ContourID *node2)
+cdef ContourID *contour_find(ContourID *node) nogil
+cdef void contour_union(ContourID *node1, ContourID *node2) nogil
 cdef int candidate_contains(CandidateContour *first,
                             np.int64_t contour_id,
                             np.int64_t join_id = ?)
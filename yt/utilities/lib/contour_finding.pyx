@@ -28,7 +28,7 @@ import sys
 
 
 cdef inline ContourID *contour_create(np.int64_t contour_id,
-                               ContourID *prev = NULL):
+                               ContourID *prev = NULL) nogil:
     node = <ContourID *> malloc(sizeof(ContourID))
     #print("Creating contour with id", contour_id)
     node.contour_id = contour_id
@@ -43,7 +43,7 @@ cdef inline void contour_delete(ContourID *node):
     if node.next != NULL: node.next.prev = node.prev
     free(node)
 
-cdef inline ContourID *contour_find(ContourID *node):
+cdef inline ContourID *contour_find(ContourID *node) nogil:
     cdef ContourID *temp
     cdef ContourID *root
     root = node
@@ -62,7 +62,7 @@ cdef inline ContourID *contour_find(ContourID *node):
         node = temp
     return root
 
-cdef inline void contour_union(ContourID *node1, ContourID *node2):
+cdef inline void contour_union(ContourID *node1, ContourID *node2) nogil:
     if node1 == node2:
         return
     node1 = contour_find(node1)
@@ -302,7 +302,8 @@ cdef class TileContourTree:
                                 np.ndarray[np.uint8_t, ndim=3] mask,
                                 np.int64_t start):
         # This just looks at neighbor values and tries to identify which zones
-        # are touching by face within a given brick.
+        # are touching by face within a given brick.  The GIL is released, so
+        # that several bricks can be processed by concurrent threads.
         cdef int i, j, k, ni, nj, nk, offset
         cdef int off_i, off_j, off_k, oi, ok, oj
         cdef ContourID *cur = NULL
@@ -310,73 +311,102 @@ cdef class TileContourTree:
         cdef ContourID *c2
         cdef np.float64_t v
         cdef np.int64_t nc
+        cdef np.float64_t min_val = self.min_val
+        cdef np.float64_t max_val = self.max_val
         ni = values.shape[0]
         nj = values.shape[1]
         nk = values.shape[2]
         nc = 0
         cdef ContourID **container = <ContourID**> malloc(
                 sizeof(ContourID*)*ni*nj*nk)
-        for i in range(ni*nj*nk): container[i] = NULL
-        for i in range(ni):
-            for j in range(nj):
-                for k in range(nk):
-                    v = values[i,j,k]
-                    if mask[i,j,k] == 0: continue
-                    if v < self.min_val or v > self.max_val: continue
-                    nc += 1
-                    c1 = contour_create(nc + start)
-                    cur = container[i*nj*nk + j*nk + k] = c1
-                    for oi in range(3):
-                        off_i = oi - 1 + i
-                        if not (0 <= off_i < ni): continue
-                        for oj in range(3):
-                            off_j = oj - 1 + j
-                            if not (0 <= off_j < nj): continue
-                            for ok in range(3):
-                                if oi == oj == ok == 1: continue
-                                off_k = ok - 1 + k
-                                if not (0 <= off_k < nk): continue
-                                if off_k > k and off_j > j and off_i > i:
-                                    continue
-                                offset = off_i*nj*nk + off_j*nk + off_k
-                                c2 = container[offset]
-                                if c2 == NULL: continue
-                                c2 = contour_find(c2)
-                                cur.count = c2.count = 0
-                                contour_union(cur, c2)
-                                cur = contour_find(cur)
-        for i in range(ni):
-            for j in range(nj):
-                for k in range(nk):
-                    c1 = container[i*nj*nk + j*nk + k]
-                    if c1 == NULL: continue
-                    c1 = contour_find(c1)
-                    contour_ids[i,j,k] = c1.contour_id
-
-        for i in range(ni*nj*nk):
-            if container[i] != NULL: free(container[i])
+        with nogil:
+            for i in range(ni*nj*nk): container[i] = NULL
+            for i in range(ni):
+                for j in range(nj):
+                    for k in range(nk):
+                        v = values[i,j,k]
+                        if mask[i,j,k] == 0: continue
+                        if v < min_val or v > max_val: continue
+                        nc += 1
+                        c1 = contour_create(nc + start)
+                        cur = container[i*nj*nk + j*nk + k] = c1
+                        for oi in range(3):
+                            off_i = oi - 1 + i
+                            if not (0 <= off_i < ni): continue
+                            for oj in range(3):
+                                off_j = oj - 1 + j
+                                if not (0 <= off_j < nj): continue
+                                for ok in range(3):
+                                    if oi == oj == ok == 1: continue
+                                    off_k = ok - 1 + k
+                                    if not (0 <= off_k < nk): continue
+                                    if off_k > k and off_j > j and off_i > i:
+                                        continue
+                                    offset = off_i*nj*nk + off_j*nk + off_k
+                                    c2 = container[offset]
+                                    if c2 == NULL: continue
+                                    c2 = contour_find(c2)
+                                    cur.count = c2.count = 0
+                                    contour_union(cur, c2)
+                                    cur = contour_find(cur)
+            for i in range(ni):
+                for j in range(nj):
+                    for k in range(nk):
+                        c1 = container[i*nj*nk + j*nk + k]
+                        if c1 == NULL: continue
+                        c1 = contour_find(c1)
+                        contour_ids[i,j,k] = c1.contour_id
+
+            for i in range(ni*nj*nk):
+                if container[i] != NULL: free(container[i])
         free(container)
         return nc
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-def link_node_contours(Node trunk, contours, ContourTree tree,
-        np.ndarray[np.int64_t, ndim=1] node_ids):
+def _node_level_key(item):
+    return -item[1][0]
+
+cdef list node_joins(Node trunk, contours,
+                     np.ndarray[np.int64_t, ndim=1] node_ids):
+    # The joins between the contours of neighbouring cells of adjacent
+    # nodes, as a list of arrays, one per node with joins.
     cdef int n_nodes = node_ids.shape[0]
     cdef np.int64_t node_ind
     cdef VolumeContainer **vcs = <VolumeContainer **> malloc(
         sizeof(VolumeContainer*) * n_nodes)
     cdef int i
     cdef PartitionedGrid pg
+    cdef list all_joins = []
     for i in range(n_nodes):
         pg = contours[node_ids[i]][2]
         vcs[i] = pg.container
     cdef np.ndarray[np.uint8_t] examined = np.zeros(n_nodes, "uint8")
-    for _, cinfo in sorted(contours.items(), key = lambda a: -a[1][0]):
+    for _, cinfo in sorted(contours.items(), key = _node_level_key):
         _, node_ind, pg, _ = cinfo
-        construct_boundary_relationships(trunk, tree, node_ind,
+        joins = construct_boundary_relationships(trunk, node_ind,
             examined, vcs, node_ids)
+        if joins is not None:
+            all_joins.append(joins)
         examined[node_ind] = 1
+    free(vcs)
+    return all_joins
+
+def link_node_contours(Node trunk, contours, ContourTree tree,
+        np.ndarray[np.int64_t, ndim=1] node_ids):
+    for joins in node_joins(trunk, contours, node_ids):
+        new_joins = tree.cull_joins(joins)
+        tree.add_joins(new_joins)
+
+def find_node_joins(Node trunk, contours,
+        np.ndarray[np.int64_t, ndim=1] node_ids):
+    """
+    Return the pairs of contour IDs of neighbouring cells across the
+    boundaries of the nodes of *trunk*, as an (N, 2) array, without merging
+    them into a ContourTree.
+    """
+    all_joins = node_joins(trunk, contours, node_ids)
+    if len(all_joins) == 0:
+        return np.empty((0, 2), dtype="int64")
+    return np.concatenate(all_joins)
 
 cdef inline void get_spos(VolumeContainer *vc, int i, int j, int k,
                           int axis, np.float64_t *spos):
@@ -394,7 +424,7 @@ cdef inline int spos_contained(VolumeContainer *vc, np.float64_t *spos):
 @cython.cdivision(True)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef void construct_boundary_relationships(Node trunk, ContourTree tree,
+cdef construct_boundary_relationships(Node trunk,
                 np.int64_t nid, np.ndarray[np.uint8_t, ndim=1] examined,
                 VolumeContainer **vcs,
                 np.ndarray[np.int64_t, ndim=1] node_ids):
@@ -462,9 +492,8 @@ cdef void construct_boundary_relationships(Node trunk, ContourTree tree,
                                         joins[ti,1] = c2
                                     ti += 1
 
-    if ti == 0: return
-    new_joins = tree.cull_joins(joins[:ti,:])
-    tree.add_joins(new_joins)
+    if ti == 0: return None
+    return joins[:ti,:]
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -23,7 +23,7 @@ from yt.utilities.exceptions import YTIntDomainOverflow
 
 cdef extern from "platform_dep.h":
     # NOTE that size_t might not be int
-    void *alloca(int)
+    void *alloca(int) nogil
 
 cdef struct QuadTreeNode:
     np.float64_t *val
@@ -33,11 +33,11 @@ cdef struct QuadTreeNode:
 
 ctypedef void QTN_combine(QuadTreeNode *self,
         np.float64_t *val, np.float64_t weight_val,
-        int nvals)
+        int nvals) nogil
 
 cdef void QTN_add_value(QuadTreeNode *self,
         np.float64_t *val, np.float64_t weight_val,
-        int nvals):
+        int nvals) nogil:
     cdef int i
     for i in range(nvals):
         self.val[i] += val[i]
@@ -45,13 +45,13 @@ cdef void QTN_add_value(QuadTreeNode *self,
 
 cdef void QTN_max_value(QuadTreeNode *self,
         np.float64_t *val, np.float64_t weight_val,
-        int nvals):
+        int nvals) nogil:
     cdef int i
     for i in range(nvals):
         self.val[i] = fmax(val[i], self.val[i])
     self.weight_val = 1.0
 
-cdef void QTN_refine(QuadTreeNode *self, int nvals):
+cdef void QTN_refine(QuadTreeNode *self, int nvals) nogil:
     cdef int i, j
     cdef np.int64_t npos[2]
     cdef np.float64_t *tvals = <np.float64_t *> alloca(
@@ -66,7 +66,7 @@ cdef void QTN_refine(QuadTreeNode *self, int nvals):
                         npos, nvals, tvals, 0.0)
 
 cdef QuadTreeNode *QTN_initialize(np.int64_t pos[2], int nvals,
-                        np.float64_t *val, np.float64_t weight_val):
+                        np.float64_t *val, np.float64_t weight_val) nogil:
     cdef QuadTreeNode *node
     cdef int i, j
     node = <QuadTreeNode *> malloc(sizeof(QuadTreeNode))
@@ -112,7 +112,8 @@ cdef class QuadTree:
             self.combine = QTN_max_value
         else:
             raise NotImplementedError
-        self.merged = 1
+        # Trees built with different methods cannot be merged together.
+        self.merged = -1 if method == "mip" else 1
         self.max_level = 0
         cdef int i, j
         cdef np.int64_t pos[2]
@@ -240,7 +241,7 @@ cdef class QuadTree:
     cdef int add_to_position(self,
                  int level, np.int64_t pos[2],
                  np.float64_t *val,
-                 np.float64_t weight_val, int skip = 0):
+                 np.float64_t weight_val, int skip = 0) nogil:
         cdef int i, j, L
         cdef QuadTreeNode *node
         node = self.find_on_root_level(pos, level)
@@ -261,7 +262,8 @@ cdef class QuadTree:
         return 0
 
     @cython.cdivision(True)
-    cdef QuadTreeNode *find_on_root_level(self, np.int64_t pos[2], int level):
+    cdef QuadTreeNode *find_on_root_level(self, np.int64_t pos[2],
+                                          int level) nogil:
         # We need this because the root level won't just have four children
         # So we find on the root level, then we traverse the tree.
         cdef np.int64_t i, j
@@ -301,19 +303,24 @@ cdef class QuadTree:
             np.ndarray[np.float64_t, ndim=2] pvals,
             np.ndarray[np.float64_t, ndim=1] pweight_vals):
         cdef int ps = pxs.shape[0]
-        cdef int p, rv
+        cdef int p, rv = 0
         cdef np.float64_t *vals
         cdef np.float64_t *data = <np.float64_t *> pvals.data
         cdef np.int64_t pos[2]
-        for p in range(ps):
-            vals = data + self.nvals*p
-            pos[0] = pxs[p]
-            pos[1] = pys[p]
-            rv = self.add_to_position(level[p], pos, vals, pweight_vals[p])
-            if rv == -1:
-                raise YTIntDomainOverflow(
-                    (self.last_dims[0], self.last_dims[1]),
-                    (self.top_grid_dims[0], self.top_grid_dims[1]))
+        # The GIL is released so that chunks can be added to distinct trees
+        # from several threads at once.
+        with nogil:
+            for p in range(ps):
+                vals = data + self.nvals*p
+                pos[0] = pxs[p]
+                pos[1] = pys[p]
+                rv = self.add_to_position(level[p], pos, vals, pweight_vals[p])
+                if rv == -1:
+                    break
+        if rv == -1:
+            raise YTIntDomainOverflow(
+                (self.last_dims[0], self.last_dims[1]),
+                (self.top_grid_dims[0], self.top_grid_dims[1]))
         return
 
     @cython.boundscheck(False)
@@ -0,0 +1,316 @@
+"""
+Shared-memory parallelism on a single node, without MPI.
+
+This provides a small executor layer on top of :mod:`concurrent.futures` that
+the IO and indexing machinery can use to spread independent pieces of work
+(io chunks, data files, domains, ...) over the cores of a single machine.  It
+is disabled by default; it can be turned on globally with the
+``local_parallel_workers`` configuration option or temporarily with the
+:func:`local_parallelism` context manager.
+
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+
+from yt.config import ytcfg
+from yt.utilities.logger import ytLogger as mylog
+
+# Set by the local_parallelism context manager; takes precedence over the
+# configuration file when it is not None.
+_local_workers = None
+
+# Worker threads mark themselves here, so that nested calls (for instance a
+# derived field that reads more data from inside a worker) run serially rather
+# than spawning pools of pools.
+_thread_state = threading.local()
+
+# The callable dispatched to forked worker processes.  Workers inherit it (and
+# everything it references) from the parent at fork time, so it does not need
+# to be picklable; only the work items and the results travel through pipes.
+_process_func = None
+
+
+def get_local_workers():
+    """
+    Return the number of local workers that should be used for shared-memory
+    parallel operations.  A value of 0 or 1 means that work is done serially.
+    A negative value in the configuration means "use every available core".
+    """
+    if getattr(_thread_state, "in_worker", False):
+        return 1
+    if _local_workers is not None:
+        nworkers = _local_workers
+    else:
+        nworkers = ytcfg.getint("yt", "local_parallel_workers")
+    if nworkers < 0:
+        nworkers = os.cpu_count() or 1
+    return nworkers
+
+
+def local_parallel_enabled():
+    """Is shared-memory parallelism currently enabled?"""
+    return get_local_workers() > 1
+
+
+@contextmanager
+def local_parallelism(nworkers=-1):
+    r"""
+    Enable shared-memory parallelism within a block of code.
+
+    While this context manager is active, operations that support it (such as
+    reading fields from a data object) will spread their io chunks over a
+    pool of *nworkers* local workers.  This is independent of, and can be
+    combined with, MPI parallelism enabled with
+    :func:`~yt.utilities.parallel_tools.parallel_analysis_interface.enable_parallelism`.
+
+    Parameters
+    ----------
+    nworkers : int
+        The number of workers to use.  If negative (the default), one worker
+        per available core is used.  A value of 0 or 1 disables local
+        parallelism within the block.
+
+    Examples
+    --------
+
+    >>> ds = yt.load("RedshiftOutput0005")
+    >>> dd = ds.all_data()
+    >>> with yt.local_parallelism(16):
+    ...     rho = dd["gas", "density"]
+
+    """
+    global _local_workers
+    old_workers = _local_workers
+    if nworkers is not None and nworkers < 0:
+        nworkers = os.cpu_count() or 1
+    _local_workers = nworkers
+    try:
+        yield
+    finally:
+        _local_workers = old_workers
+
+
+def _run_in_worker(func, item):
+    _thread_state.in_worker = True
+    try:
+        return func(item)
+    finally:
+        _thread_state.in_worker = False
+
+
+def _run_in_process(item):
+    _thread_state.in_worker = True
+    return _process_func(item)
+
+
+def local_parallel_map(func, items, nworkers=None, backend="thread"):
+    """
+    Apply *func* to every element of *items* using a local pool of workers
+    and return the results as a list, in the same order as *items*.
+
+    If local parallelism is disabled, if there is at most one item, or if we
+    are already running inside a worker, this is just a serial map.
+
+    Parameters
+    ----------
+    func : callable
+        Function of one argument.  For the ``"process"`` backend, the items
+        and the results must be picklable; *func* itself is inherited by the
+        forked workers and need not be.
+    items : iterable
+        The work items.
+    nworkers : int, optional
+        Number of workers; defaults to :func:`get_local_workers`.
+    backend : "thread" or "process"
+        Whether to use a thread pool (appropriate when *func* spends its time
+        in code that releases the GIL, such as h5py or the Cython selection
+        routines) or a pool of forked processes.  Where ``fork`` is not
+        available the process backend falls back to threads, so *func* must
+        not depend on running in a separate address space.
+    """
+    global _process_func
+    items = list(items)
+    if nworkers is None:
+        nworkers = get_local_workers()
+    nworkers = min(nworkers, len(items))
+    if nworkers <= 1:
+        return [func(item) for item in items]
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Unknown local parallelism backend '{backend}'.")
+    if backend == "process" and "fork" not in multiprocessing.get_all_start_methods():
+        mylog.debug("fork is not available, using threads instead of processes")
+        backend = "thread"
+    mylog.debug(
+        "Dispatching %s items to %s local %s workers", len(items), nworkers, backend
+    )
+    if backend == "thread":
+        with ThreadPoolExecutor(max_workers=nworkers) as executor:
+            return list(executor.map(_run_in_worker, [func] * len(items), items))
+    old_func, _process_func = _process_func, func
+    try:
+        with ProcessPoolExecutor(
+            max_workers=nworkers, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            chunksize = max(1, len(items) // (4 * nworkers))
+            return list(executor.map(_run_in_process, items, chunksize=chunksize))
+    finally:
+        _process_func = old_func
+
+
+def local_parallel_objects(objects, njobs=0, storage=None):
+    r"""
+    Dispatch the elements of *objects* to a pool of forked local processes,
+    running the body of the loop over them in the worker processes.
+
+    This is the local counterpart of
+    :func:`~yt.utilities.parallel_tools.parallel_analysis_interface.parallel_objects`,
+    which it backs when called with ``backend="process"``.  Each worker takes
+    the next element that has not been handed out yet as soon as it is done
+    with the previous one, so that slow elements do not hold up the others.
+    Workers exit once there is nothing left to take; only the calling
+    process proceeds past the loop, once all the workers are done.  Anything
+    assigned to the *result* attribute of the storage objects is sent back
+    and gathered into *storage*, keyed by *result_id*, so it must be
+    picklable.  The loop body must not depend on side effects in the calling
+    process other than those of the results.
+
+    Parameters
+    ----------
+    objects : iterable
+        The objects to dispatch.  They are shared with the workers at fork
+        time, and need not be picklable.
+    njobs : int
+        The number of worker processes; if 0 or less, defaults to
+        :func:`get_local_workers`, or to the number of available cores if
+        local parallelism is not enabled.
+    storage : dict, optional
+        If given, the loop yields ``(storage_object, obj)`` pairs and results
+        are gathered into this dictionary at the end.
+
+    Examples
+    --------
+
+    >>> storage = {}
+    >>> ts = yt.DatasetSeries("DD*/DD*.index")
+    >>> for sto, ds in ts.piter(storage=storage, backend="process"):
+    ...     sto.result = ds.current_time
+    """
+    from .parallel_analysis_interface import ResultsStorage
+
+    objects = list(objects)
+    if getattr(_thread_state, "in_worker", False):
+        # Do not spawn pools of pools
+        njobs = 1
+    elif njobs <= 0:
+        njobs = get_local_workers()
+        if njobs <= 1:
+            njobs = os.cpu_count() or 1
+    njobs = min(njobs, len(objects))
+    if njobs > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        mylog.warning("fork is not available, iterating serially")
+        njobs = 1
+    results = {}
+    if njobs <= 1:
+        for index, obj in enumerate(objects):
+            if storage is None:
+                yield obj
+                continue
+            rstore = ResultsStorage()
+            rstore.result_id = index
+            yield rstore, obj
+            results[rstore.result_id] = rstore.result
+        if storage is not None:
+            storage.update(results)
+        return
+
+    ctx = multiprocessing.get_context("fork")
+    # The index of the next object to hand out, shared by all the workers
+    counter = ctx.Value("q", 0)
+    readers = {}
+    mylog.info("Dispatching %s objects to %s local processes", len(objects), njobs)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for _ in range(njobs):
+        reader, writer = ctx.Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:
+            reader.close()
+            for other in readers:
+                other.close()
+            # This never returns: the worker exits when it is done.
+            yield from _process_worker(objects, counter, writer, storage is not None)
+        writer.close()
+        readers[reader] = pid
+
+    processed = set()
+    abandoned = []
+    failed_workers = 0
+    while readers:
+        for reader in wait(list(readers)):
+            try:
+                kind, index, result_id, result = reader.recv()
+            except EOFError:
+                pid = readers.pop(reader)
+                reader.close()
+                if os.waitpid(pid, 0)[1] != 0:
+                    failed_workers += 1
+                continue
+            if kind == "result":
+                processed.add(index)
+                results[result_id] = result
+            else:
+                abandoned.append(index)
+    missing = len(objects) - len(processed)
+    if missing > 0 or failed_workers > 0:
+        raise RuntimeError(
+            f"{missing} of {len(objects)} objects were not processed and "
+            f"{failed_workers} worker processes failed.  The loop body raised "
+            f"an error or exited the loop for objects {sorted(abandoned)}."
+        )
+    if storage is not None:
+        storage.update(results)
+
+
+def _process_worker(objects, counter, conn, store):
+    # The body of a worker process of local_parallel_objects.  It yields
+    # objects (or storage, object pairs) to the loop body for as long as
+    # there are some left, sending a message back for each one.
+    from .parallel_analysis_interface import ResultsStorage
+
+    _thread_state.in_worker = True
+    status = 0
+    try:
+        while True:
+            with counter.get_lock():
+                index = counter.value
+                counter.value += 1
+            if index >= len(objects):
+                break
+            rstore = ResultsStorage()
+            rstore.result_id = index
+            try:
+                if store:
+                    yield rstore, objects[index]
+                else:
+                    yield objects[index]
+            except GeneratorExit:
+                # The loop body raised or broke out of the loop.
+                conn.send(("abandoned", index, None, None))
+                raise
+            conn.send(("result", index, rstore.result_id, rstore.result))
+    except GeneratorExit:
+        status = 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        conn.close()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(status)
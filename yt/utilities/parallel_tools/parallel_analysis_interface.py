@@ -436,7 +436,9 @@ class ResultsStorage:
     result_id = None
 
 
-def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False):
+def parallel_objects(
+    objects, njobs=0, storage=None, barrier=True, dynamic=False, backend="mpi"
+):
     r"""This function dispatches components of an iterable to different
     processors.
 
@@ -473,6 +475,13 @@ def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False
         This requires one dedicated processor; if this is enabled with a set of
         128 processors available, only 127 will be available to iterate over
         objects as one will be load balancing the rest.
+    backend : "mpi" or "process"
+        With "mpi" (the default), objects are dispatched to the processors
+        of the current MPI communicator, if any.  With "process", they are
+        dispatched to a pool of forked local processes instead, without MPI;
+        objects are then always balanced dynamically, and *njobs* is the
+        number of processes.  See
+        :func:`~yt.utilities.parallel_tools.local_parallelism.local_parallel_objects`.
 
 
     Examples
@@ -498,6 +507,16 @@ def parallel_objects(objects, njobs=0, storage=None, barrier=True, dynamic=False
     ...
 
     """
+    if backend == "process":
+        if not parallel_capable:
+            from .local_parallelism import local_parallel_objects
+
+            yield from local_parallel_objects(objects, njobs=njobs, storage=storage)
+            return
+        mylog.warning("The process backend cannot be used with MPI, using MPI.")
+    elif backend != "mpi":
+        raise ValueError(f"Unknown parallel_objects backend '{backend}'.")
+
     if dynamic:
         from .task_queue import dynamic_parallel_objects
 
@@ -0,0 +1,336 @@
+"""
+An on-disk cache for the results of expensive reductions.
+
+Projections, profiles and the images of fixed resolution buffers are stored
+in a directory, one file per result, under a name derived from everything
+that determines the result: the dataset (through
+:meth:`~yt.data_objects.static_output.Dataset._hash`), the definition of the
+data source, the fields (and the definitions of the derived fields they
+depend on), weight field, method and units.  Computing the same
+result again, from the same or from another process, then only needs to read
+it back.
+
+The cache is disabled by default.  It is enabled with the ``result_cache``
+configuration option, its location is set by ``result_cache_dir`` and its
+size by ``result_cache_size``; once the files it holds exceed that size, the
+least recently used ones are removed.  Entries are written to temporary files
+that are atomically renamed, so that several processes can share a cache
+directory without ever reading a partially written entry.
+
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from yt.config import ytcfg
+from yt.utilities.exceptions import YTFieldNotFound
+from yt.utilities.logger import ytLogger as mylog
+
+# Bump this whenever the layout of the cache entries, or the way keys are
+# computed, changes.
+_cache_version = 2
+
+# Temporary files older than this (in seconds) are left over by processes
+# that died while writing, and are removed on eviction.
+_stale_tmp_age = 3600
+
+
+def _default_cache_dir():
+    base = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, "yt", "results")
+
+
+def _canonical(obj):
+    # Turn obj into nested tuples of simple values whose repr identifies it.
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        units = getattr(obj, "units", None)
+        arr = np.ascontiguousarray(obj.view(np.ndarray))
+        digest = hashlib.sha1(arr.tobytes()).hexdigest()
+        return ("array", str(arr.dtype), arr.shape, str(units), digest)
+    if hasattr(obj, "_con_args") and hasattr(obj, "_type_name"):
+        # A data container: it is defined by its construction arguments (and
+        # any other state that changes its data, listed in _result_key_args),
+        # the data source it is selected from and its field parameters.  The
+        # "field" argument of projections lists the fields computed so far,
+        # so it is left out.
+        con_args = tuple(
+            (name, _canonical(getattr(obj, name, None)))
+            for name in getattr(obj, "_result_key_args", obj._con_args)
+            if name != "field"
+        )
+        source = getattr(obj, "data_source", None)
+        if source is None:
+            source = getattr(obj, "_data_source", None)
+        return (
+            "dobj",
+            obj._type_name,
+            _canonical(getattr(obj, "ds", None)),
+            con_args,
+            _canonical(source),
+            _canonical(getattr(obj, "max_level", None)),
+            _canonical(getattr(obj, "field_parameters", {})),
+        )
+    if hasattr(obj, "_hash") and hasattr(obj, "parameter_filename"):
+        return ("ds", obj._hash())
+    if isinstance(obj, (list, tuple)):
+        return tuple(_canonical(v) for v in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((repr(k), _canonical(v)) for k, v in obj.items()))
+    return repr(obj)
+
+
+def _code_digest(code):
+    # A digest of the bytecode, names and constants of code, and of the code
+    # objects nested in it, which is the same from one session to the next.
+    digest = hashlib.sha1(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            const = _code_digest(const)
+        digest.update(repr(const).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _function_identity(func):
+    # Fields may be redefined under the same name, from one session to the
+    # next, so their functions are identified by their code and the values
+    # they close over rather than by their names.
+    module = getattr(func, "__module__", None)
+    name = getattr(func, "__qualname__", type(func).__name__)
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return (module, name)
+    cells = []
+    for cell in getattr(func, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            # An empty cell
+            value = None
+        if hasattr(value, "__code__"):
+            cells.append(_function_identity(value))
+        elif value is None or isinstance(
+            value, (bool, int, float, str, bytes, tuple, list, np.generic)
+        ):
+            cells.append(_canonical(value))
+        else:
+            # Other objects have no repr that is the same in every session
+            cells.append(type(value).__name__)
+    return (module, name, _code_digest(code), tuple(cells))
+
+
+def field_definitions(ds, fields):
+    """
+    Return the identity of the definitions of *fields* of *ds*, and of all
+    the fields they depend on: their names, units and the functions that
+    compute them.
+    """
+    dependencies = getattr(ds, "field_dependencies", {})
+    definitions = {}
+    stack = list(fields)
+    while stack:
+        field = stack.pop()
+        if field is None:
+            # No weight field, for instance
+            continue
+        try:
+            finfo = ds._get_field_info(field)
+        except YTFieldNotFound:
+            continue
+        if finfo.name in definitions:
+            continue
+        definitions[finfo.name] = (
+            str(finfo.units),
+            _function_identity(finfo._function),
+        )
+        deps = dependencies.get(finfo.name, None)
+        if deps is not None:
+            stack.extend(deps.requested)
+    return tuple(sorted(definitions.items(), key=repr))
+
+
+def result_key(ds, kind, *parts, fields=None):
+    """
+    Return the cache key of a result of type *kind* (such as
+    ``"projection"``) computed from *ds*, identified by *parts*.
+
+    *parts* can hold data containers, arrays (with or without units), field
+    tuples and simple values.  The definitions of the *fields* the result is
+    computed from, and of the fields they depend on, are part of the key, so
+    that redefining a field does not return the results of its previous
+    definition.
+    """
+    canonical = (
+        _cache_version,
+        kind,
+        ds._hash(),
+        getattr(ds.unit_system, "name", str(ds.unit_system)),
+        _canonical(parts),
+        field_definitions(ds, fields or []),
+    )
+    return hashlib.sha256(repr(canonical).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    r"""
+    A size-limited, least recently used cache of arrays, stored as one
+    ``.npz`` file per entry in a directory.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Where to store the entries.  Defaults to the ``result_cache_dir``
+        configuration option, or to ``$XDG_CACHE_HOME/yt/results``.
+    max_size : int, optional
+        Maximum total size of the entries, in bytes.  Defaults to the
+        ``result_cache_size`` configuration option (in MB).
+    """
+
+    def __init__(self, directory=None, max_size=None):
+        self._directory = directory
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        # The serialize option used to store projections in a .yt file next
+        # to the dataset; it now enables the cache instead, so that they are
+        # stored in the cache directory.
+        return ytcfg.getboolean("yt", "result_cache") or ytcfg.getboolean(
+            "yt", "serialize"
+        )
+
+    @property
+    def directory(self):
+        if self._directory is not None:
+            return self._directory
+        directory = ytcfg.get("yt", "result_cache_dir")
+        if directory in ("", "None"):
+            directory = _default_cache_dir()
+        return os.path.expanduser(directory)
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return ytcfg.getint("yt", "result_cache_size") * 1024 ** 2
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key, ds=None):
+        """
+        Return the entry stored under *key* as a dictionary of arrays and
+        metadata, or None.  If *ds* is given, arrays stored with units are
+        returned as arrays with units attached to its unit registry.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                entry = {k: data[k] for k in data.files}
+            # Mark the entry as recently used.
+            os.utime(path)
+        except (OSError, ValueError, EOFError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        meta = json.loads(str(entry.pop("__meta__")))
+        units = meta.pop("__units__", {})
+        if ds is not None:
+            for name, unit in units.items():
+                entry[name] = ds.arr(entry[name], unit)
+        entry.update(meta)
+        return entry
+
+    def put(self, key, arrays, **meta):
+        """
+        Store *arrays*, a dictionary of arrays (with or without units), under
+        *key* along with the JSON-serializable *meta* values.  Failures to
+        write are logged and otherwise ignored.
+        """
+        directory = self.directory
+        stored = {}
+        units = {}
+        for name, arr in arrays.items():
+            if hasattr(arr, "units"):
+                units[name] = str(arr.units)
+            stored[name] = np.asarray(arr.view(np.ndarray))
+        meta["__units__"] = units
+        stored["__meta__"] = np.array(json.dumps(meta))
+        path = self._path(key)
+        tmp_fn = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_fn, "wb") as f:
+                np.savez(f, **stored)
+            os.replace(tmp_fn, path)
+        except OSError as e:
+            mylog.warning("Could not store result in %s (%s)", directory, e)
+            if os.path.exists(tmp_fn):
+                os.remove(tmp_fn)
+            return
+        self._evict()
+
+    def _entries(self):
+        # (mtime, size, path) of every entry, least recently used first
+        entries = []
+        now = time.time()
+        try:
+            scanned = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for f in scanned:
+            try:
+                st = f.stat()
+            except OSError:
+                # Removed by another process in the meantime
+                continue
+            if f.name.endswith(".tmp"):
+                if now - st.st_mtime > _stale_tmp_age:
+                    _remove(f.path)
+            elif f.name.endswith(".npz"):
+                entries.append((st.st_mtime, st.st_size, f.path))
+        entries.sort()
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            max_size = self.max_size
+            for _, size, path in entries:
+                if total <= max_size:
+                    break
+                _remove(path)
+                total -= size
+
+    def clear(self):
+        """Remove every entry of the cache."""
+        with self._lock:
+            for _, _, path in self._entries():
+                _remove(path)
+
+    def __len__(self):
+        return len(self._entries())
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+result_cache = ResultCache()
@@ -0,0 +1,38 @@
+import numpy as np
+
+from yt.testing import assert_equal
+from yt.utilities.io_handler import IOCache
+
+
+def test_io_cache_lru():
+    arr = np.ones(100, dtype="float64")  # 800 bytes
+    cache = IOCache(max_bytes=2000)
+    assert cache.put("a", arr) == 0
+    assert cache.put("b", arr.copy()) == 0
+    assert_equal(cache.nbytes, 1600)
+    # Touch "a" so that "b" is now the least recently used entry
+    assert cache.get("a") is arr
+    assert_equal(cache.put("c", arr.copy()), 1)
+    assert "b" not in cache
+    assert "a" in cache
+    assert cache.get("b") is None
+    assert_equal((cache.hits, cache.misses, cache.evictions), (1, 1, 1))
+    assert_equal(cache.nbytes, 1600)
+
+
+def test_io_cache_nbytes():
+    cache = IOCache(max_bytes=1000)
+    # Arrays larger than the whole budget are never stored
+    assert_equal(cache.put("big", np.ones(200)), 0)
+    assert_equal(len(cache), 0)
+    # Views are accounted for with the size of the array they keep alive
+    base = np.ones(100)
+    cache.put("view", base[:10])
+    assert_equal(cache.nbytes, base.nbytes)
+    # Replacing an entry does not count it twice
+    cache.put("view", base[:10])
+    assert_equal(cache.nbytes, base.nbytes)
+    # Shrinking the budget evicts entries
+    cache.max_bytes = 100
+    assert_equal(len(cache), 0)
+    assert_equal(cache.nbytes, 0)
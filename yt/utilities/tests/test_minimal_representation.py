@@ -1,37 +1,50 @@
-import os.path
+import shutil
+import tempfile
 
 import yt
 from yt.config import ytcfg
 from yt.testing import assert_equal, assert_raises, requires_file
+from yt.utilities.result_cache import result_cache
 
 G30 = "IsolatedGalaxy/galaxy0030/galaxy0030"
 
+_old_cache_dir = None
+_tmpdir = None
+
 
 def setup():
+    global _old_cache_dir, _tmpdir
+    # Projections are serialized to the result cache, kept out of the way of
+    # the user's own cache
+    _tmpdir = tempfile.mkdtemp()
+    _old_cache_dir = ytcfg.get("yt", "result_cache_dir")
+    ytcfg["yt", "result_cache_dir"] = _tmpdir
     ytcfg["yt", "serialize"] = "True"
 
 
 def teardown():
     ytcfg["yt", "serialize"] = "False"
+    ytcfg["yt", "result_cache_dir"] = _old_cache_dir
+    shutil.rmtree(_tmpdir)
 
 
 @requires_file(G30)
 def test_store():
     ds = yt.load(G30)
-    store = ds.parameter_filename + ".yt"
     field = "density"
-    if os.path.isfile(store):
-        os.remove(store)
 
     proj1 = ds.proj(field, "z")
     sp = ds.sphere(ds.domain_center, (4, "kpc"))
     proj2 = ds.proj(field, "z", data_source=sp)
 
+    hits = result_cache.hits
     proj1_c = ds.proj(field, "z")
     assert_equal(proj1[field], proj1_c[field])
 
     proj2_c = ds.proj(field, "z", data_source=sp)
     assert_equal(proj2[field], proj2_c[field])
+    # Both projections were read back from the result cache
+    assert_equal(result_cache.hits - hits, 2)
 
     def fail_for_different_method():
         proj2_c = ds.proj(field, "z", data_source=sp, method="mip")
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from yt.config import ytcfg
+from yt.data_objects.profiles import create_profile
+from yt.testing import assert_equal, fake_random_ds
+from yt.utilities.result_cache import ResultCache, result_cache, result_key
+
+
+def test_result_cache_lru():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        cache = ResultCache(directory=tmpdir, max_size=10 ** 9)
+        arr = np.ones(1000)
+        for i, key in enumerate("abc"):
+            cache.put(key, {"arr": arr * i}, index=i)
+            t = 1000.0 * (i + 1)
+            os.utime(os.path.join(tmpdir, key + ".npz"), (t, t))
+        assert_equal(len(cache), 3)
+        entry = cache.get("a")
+        assert_equal(entry["arr"], arr * 0)
+        assert_equal(entry["index"], 0)
+        # "a" was just used, so "b" is now the least recently used entry
+        size = os.path.getsize(os.path.join(tmpdir, "a.npz"))
+        cache._max_size = 2 * size
+        cache._evict()
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        cache.clear()
+        assert_equal(len(cache), 0)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_result_cache_keys():
+    ds = fake_random_ds(16)
+    sp1 = ds.sphere(ds.domain_center, 0.25)
+    sp2 = ds.sphere(ds.domain_center, 0.25)
+    sp3 = ds.sphere(ds.domain_center, 0.3)
+    key1 = result_key(ds, "projection", sp1, ("gas", "density"))
+    assert_equal(key1, result_key(ds, "projection", sp2, ("gas", "density")))
+    assert key1 != result_key(ds, "projection", sp3, ("gas", "density"))
+    assert key1 != result_key(ds, "projection", sp1, ("gas", "temperature"))
+    assert key1 != result_key(ds, "profile", sp1, ("gas", "density"))
+
+
+def test_result_cache_field_definitions():
+    ds = fake_random_ds(16)
+    field = ("gas", "doubled_density")
+
+    def _doubled(field, data):
+        return 2 * data["gas", "density"]
+
+    def _tripled(field, data):
+        return 3 * data["gas", "density"]
+
+    def _quadrupled(field, data):
+        return 2 * data["gas", "doubled_density"]
+
+    quad = ("gas", "quadrupled_density")
+    ds.add_field(field, _doubled, sampling_type="cell", units="g/cm**3")
+    ds.add_field(quad, _quadrupled, sampling_type="cell", units="g/cm**3")
+    key = result_key(ds, "frb", field, fields=[field])
+    quad_key = result_key(ds, "frb", quad, fields=[quad])
+    assert_equal(key, result_key(ds, "frb", field, fields=[field]))
+    ds.add_field(
+        field, _tripled, sampling_type="cell", units="g/cm**3", force_override=True
+    )
+    assert key != result_key(ds, "frb", field, fields=[field])
+    # Fields that depend on a redefined field change their keys as well
+    assert quad_key != result_key(ds, "frb", quad, fields=[quad])
+
+
+def test_cached_results():
+    tmpdir = tempfile.mkdtemp()
+    old = [ytcfg.get("yt", k) for k in ("result_cache", "result_cache_dir")]
+    ytcfg["yt", "result_cache"] = "True"
+    ytcfg["yt", "result_cache_dir"] = tmpdir
+    try:
+        ds = fake_random_ds(16, nprocs=8)
+        fields = [("gas", "density"), ("gas", "temperature")]
+        results = []
+        for _ in range(2):
+            hits = result_cache.hits
+            proj = ds.proj(("gas", "density"), 2, weight_field=("gas", "density"))
+            frb = proj.to_frb(1.0, 64)
+            prof = create_profile(ds.all_data(), ("gas", "density"), fields[1])
+            results.append(
+                (proj["gas", "density"], frb["gas", "density"], prof[fields[1]])
+            )
+        # Projection, image and profile were all read back the second time
+        assert_equal(result_cache.hits - hits, 3)
+        for first, second in zip(*results):
+            assert_equal(first, second)
+            assert_equal(str(first.units), str(second.units))
+    finally:
+        ytcfg["yt", "result_cache"], ytcfg["yt", "result_cache_dir"] = old
+        shutil.rmtree(tmpdir)
+
+
+def test_cached_projection_methods():
+    tmpdir = tempfile.mkdtemp()
+    old = [ytcfg.get("yt", k) for k in ("result_cache", "result_cache_dir")]
+    ytcfg["yt", "result_cache"] = "True"
+    ytcfg["yt", "result_cache_dir"] = tmpdir
+    try:
+        ds = fake_random_ds(16)
+        field = ("gas", "density")
+        images = {}
+        for method in ("integrate", "mip", "sum"):
+            proj = ds.proj(field, 2, method=method)
+            images[method] = proj.to_frb(1.0, 64)[field]
+        assert_equal(images["integrate"], ds.proj(field, 2).to_frb(1.0, 64)[field])
+        # The maximum and the sum along the line of sight are not the integral
+        assert np.all(images["mip"].d < images["sum"].d)
+        assert np.any(images["mip"].d != images["integrate"].d)
+        assert np.any(images["sum"].d != images["integrate"].d)
+    finally:
+        ytcfg["yt", "result_cache"], ytcfg["yt", "result_cache_dir"] = old
+        shutil.rmtree(tmpdir)
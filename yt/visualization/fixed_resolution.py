@@ -16,6 +16,7 @@ from yt.funcs import (
 from yt.utilities.lib.api import add_points_to_greyscale_image
 from yt.utilities.lib.pixelization_routines import pixelize_cylinder
 from yt.utilities.on_demand_imports import _h5py as h5py
+from yt.utilities.result_cache import result_cache, result_key
 
 from .fixed_resolution_filters import apply_filter, filter_registry
 from .volume_rendering.api import off_axis_projection
@@ -104,6 +105,10 @@ class FixedResolutionBuffer:
         self._filters = []
         self.axis = data_source.axis
         self.periodic = periodic
+        # Unfiltered images kept for reuse by the buffer of the next window,
+        # and those kept by the buffer of the previous one
+        self._pixels = None
+        self._previous = None
 
         ds = getattr(data_source, "ds", None)
         if ds is not None:
@@ -143,18 +148,55 @@ class FixedResolutionBuffer:
                 b = float(b.in_units("code_length"))
             bounds.append(b)
 
-        buff = self.ds.coordinates.pixelize(
-            self.data_source.axis,
-            self.data_source,
-            item,
-            bounds,
-            self.buff_size,
-            int(self.antialias),
-        )
+        buff, units = self._pixelize(item, bounds)
 
         for name, (args, kwargs) in self._filters:
             buff = filter_registry[name](*args[1:], **kwargs).apply(buff)
 
+        ia = ImageArray(buff, units=units, info=self._get_info(item))
+        self.data[item] = ia
+        return self.data[item]
+
+    def __setitem__(self, item, val):
+        self.data[item] = val
+
+    def _pixelize(self, item, bounds):
+        # Returns the unfiltered image of item and its units, from the result
+        # cache if possible.
+        key = None
+        if result_cache.enabled:
+            field = self.data_source._determine_fields(item)[0]
+            key = result_key(
+                self.ds,
+                "frb",
+                self.data_source,
+                field,
+                bounds,
+                self.buff_size,
+                bool(self.antialias),
+                bool(self.periodic),
+                fields=[field],
+            )
+            entry = result_cache.get(key, self.ds)
+            if entry is not None:
+                return entry["buff"].d, entry["buff"].units
+
+        buff = None
+        if self._previous is not None:
+            buff = self._pixelize_from_previous(item, bounds)
+        if buff is None:
+            buff = self.ds.coordinates.pixelize(
+                self.data_source.axis,
+                self.data_source,
+                item,
+                bounds,
+                self.buff_size,
+                int(self.antialias),
+            )
+        if self._pixels is not None:
+            # The image returned to the caller may be converted in place.
+            self._pixels[item] = (tuple(bounds), buff.copy(), self.data_source[item])
+
         # FIXME FIXME FIXME we shouldn't need to do this for projections
         # but that will require fixing data object access for particle
         # projections
@@ -167,12 +209,107 @@ class FixedResolutionBuffer:
         except (KeyError, AttributeError):
             units = self.data_source[item].units
 
-        ia = ImageArray(buff, units=units, info=self._get_info(item))
-        self.data[item] = ia
-        return self.data[item]
+        if key is not None:
+            result_cache.put(key, {"buff": self.ds.arr(buff, units)})
+        return buff, units
 
-    def __setitem__(self, item, val):
-        self.data[item] = val
+    def _keep_pixels(self, previous=None):
+        """
+        Keep the unfiltered images pixelized by this buffer, so that the
+        buffer of a panned or zoomed window can reuse them, and reuse those
+        kept by *previous*, the buffer of the previous window, if possible.
+        """
+        self._pixels = {}
+        self._previous = None
+        if (
+            previous is not None
+            and previous._pixels
+            and previous.data_source is self.data_source
+            and previous.buff_size == self.buff_size
+            and previous.antialias == self.antialias
+        ):
+            self._previous = previous._pixels
+
+    def _can_pixelize_window(self, item):
+        # Can images of item be pixelized window by window, from the elements
+        # overlapping each window only?  This is the case for the plain
+        # cartesian pixelization of slices and projections.
+        data_source = self.data_source
+        if self.ds.geometry != "cartesian" or data_source.axis > 2:
+            return False
+        if getattr(data_source, "_type_name", None) not in ("slice", "quad_proj"):
+            return False
+        if getattr(self.ds.index, "meshes", None):
+            return False
+        finfo = self.ds._get_field_info(*data_source._determine_fields(item)[0])
+        return not (np.any(finfo.nodal_flag) or finfo.is_sph_field)
+
+    def _pixelize_window(self, item, bounds, size):
+        # Pixelize item over part of the window, which only visits the
+        # elements of the data source that overlap it.  Returns None if the
+        # image cannot be assembled from such parts.
+        if not self._can_pixelize_window(item):
+            return None
+        return self.ds.coordinates.pixelize(
+            self.data_source.axis,
+            self.data_source,
+            item,
+            bounds,
+            size,
+            int(self.antialias),
+        )
+
+    def _pixelize_from_previous(self, item, bounds):
+        # Build the image of item from the one of the previous window, if it
+        # covers the same pixels shifted by a whole number of pixels, and
+        # pixelize the newly exposed strips only.  Returns None otherwise.
+        previous = self._previous.get(item, None)
+        if previous is None:
+            return None
+        old_bounds, old, old_data = previous
+        if old_data is not self.data_source[item]:
+            return None
+        ny, nx = old.shape
+        dx = (bounds[1] - bounds[0]) / nx
+        dy = (bounds[3] - bounds[2]) / ny
+        shifts = []
+        for lo, hi, old_lo, old_hi, d in (
+            (bounds[0], bounds[1], old_bounds[0], old_bounds[1], dx),
+            (bounds[2], bounds[3], old_bounds[2], old_bounds[3], dy),
+        ):
+            if abs((old_hi - old_lo) - (hi - lo)) > 1e-6 * d:
+                return None
+            shift = (lo - old_lo) / d
+            if abs(shift - round(shift)) > 1e-6:
+                return None
+            shifts.append(int(round(shift)))
+        sx, sy = shifts
+        if abs(sx) >= nx or abs(sy) >= ny:
+            return None
+        buff = np.empty_like(old)
+        buff[max(0, -sy) : ny - max(0, sy), max(0, -sx) : nx - max(0, sx)] = old[
+            max(0, sy) : ny - max(0, -sy), max(0, sx) : nx - max(0, -sx)
+        ]
+        # The columns and rows that were not in the previous window
+        strips = []
+        if sx != 0:
+            c0, c1 = (nx - sx, nx) if sx > 0 else (0, -sx)
+            strips.append((slice(None), slice(c0, c1), (c0, c1, 0, ny)))
+        if sy != 0:
+            r0, r1 = (ny - sy, ny) if sy > 0 else (0, -sy)
+            strips.append((slice(r0, r1), slice(None), (0, nx, r0, r1)))
+        for rows, cols, (c0, c1, r0, r1) in strips:
+            strip_bounds = (
+                bounds[0] + c0 * dx,
+                bounds[0] + c1 * dx,
+                bounds[2] + r0 * dy,
+                bounds[2] + r1 * dy,
+            )
+            strip = self._pixelize_window(item, strip_bounds, (c1 - c0, r1 - r0))
+            if strip is None:
+                return None
+            buff[rows, cols] = strip
+        return buff
 
     def _get_data_source_fields(self):
         exclude = self.data_source._key_fields + list(self._exclude_fields)
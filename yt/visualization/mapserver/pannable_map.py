@@ -1,16 +1,24 @@
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
 
 import bottle
 import numpy as np
 
 from yt.utilities.lib.misc_utilities import get_color_bounds
+from yt.utilities.lib.pixelization_routines import pixelize_cartesian
+from yt.utilities.parallel_tools.local_parallelism import get_local_workers
 from yt.utilities.png_writer import write_png_to_string
-from yt.visualization.fixed_resolution import FixedResolutionBuffer
+from yt.utilities.result_cache import ResultCache, result_cache, result_key
 from yt.visualization.image_writer import apply_colormap
 
 local_dir = os.path.dirname(__file__)
 
+# Size of the tiles, in pixels
+TILE_SIZE = 256
+
 
 def exc_writeout(f):
     import traceback
@@ -27,92 +35,275 @@ def exc_writeout(f):
     return func
 
 
+class ThreadedWSGIRefServer(bottle.ServerAdapter):
+    """
+    A bottle server adapter for the standard library WSGI server that handles
+    each request in its own thread, so that tiles can be served to several
+    clients at once without any third-party server installed.
+    """
+
+    def run(self, app):
+        from socketserver import ThreadingMixIn
+        from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+        class _Server(ThreadingMixIn, WSGIServer):
+            daemon_threads = True
+
+        class _QuietHandler(WSGIRequestHandler):
+            def log_request(*args, **kw):
+                pass
+
+        handler_class = WSGIRequestHandler if not self.quiet else _QuietHandler
+        srv = make_server(
+            self.host, self.port, app, server_class=_Server, handler_class=handler_class
+        )
+        srv.serve_forever()
+
+
 class PannableMapServer:
+    r"""
+    Serves the image of a 2D data object (a slice or an on-axis projection)
+    as tiles of 256x256 pixels in a Google Maps-style pannable interface.
+
+    Tiles are pixelized directly from the immutable ``px``, ``py``, ``pdx``
+    and ``pdy`` arrays of the data object, so that they can be rendered
+    concurrently for several clients.  Rendered tiles are kept in an in-memory
+    least recently used cache, and on disk if the result cache is enabled (see
+    :mod:`~yt.utilities.result_cache`) or *cache_dir* is given.  Color bounds
+    are computed once per field and zoom level, and the neighbours of every
+    requested tile are rendered in the background, ahead of panning.
+
+    Parameters
+    ----------
+    data : YTSelectionContainer2D
+        The slice or projection to serve.
+    field : str or tuple
+        The field shown initially.
+    takelog : bool
+        Whether to take the logarithm of the field values.
+    cmap : str
+        The colormap.
+    route_prefix : str, optional
+        Prefix of the routes of the server.
+    cache_dir : str, optional
+        Directory in which to store rendered tiles.
+    cache_size : int, optional
+        Number of tiles kept in memory.  Default: 1024.
+    nworkers : int, optional
+        Number of threads rendering neighbouring tiles in the background.
+        Defaults to the number of local workers (see
+        :func:`~yt.utilities.parallel_tools.local_parallelism.local_parallelism`),
+        with a minimum of 2.
+    """
+
     _widget_name = "pannable_map"
 
-    def __init__(self, data, field, takelog, cmap, route_prefix=""):
+    def __init__(
+        self,
+        data,
+        field,
+        takelog,
+        cmap,
+        route_prefix="",
+        cache_dir=None,
+        cache_size=1024,
+        nworkers=None,
+    ):
         self.data = data
         self.ds = data.ds
         self.field = field
         self.cmap = cmap
 
-        bottle.route(f"{route_prefix}/map/:field/:L/:x/:y.png")(self.map)
         bottle.route(f"{route_prefix}/map/:field/:L/:x/:y.png")(self.map)
         bottle.route(f"{route_prefix}/")(self.index)
         bottle.route(f"{route_prefix}/:field")(self.index)
         bottle.route(f"{route_prefix}/index.html")(self.index)
         bottle.route(f"{route_prefix}/list", "GET")(self.list_fields)
-        # This is a double-check, since we do not always mandate this for
-        # slices:
-        self.data[self.field] = self.data[self.field].astype("float64")
         bottle.route(f"{route_prefix}/static/:path", "GET")(self.static)
 
         self.takelog = takelog
-        self._lock = False
+        # Protects the data object, the caches and the pending tiles
+        self._lock = threading.RLock()
+        self._fields = {}
+        self._color_bounds = {}
+        self._tiles = OrderedDict()
+        self._pending = {}
+        self.cache_size = cache_size
+        if cache_dir is not None:
+            self._disk_cache = ResultCache(directory=cache_dir)
+        elif result_cache.enabled:
+            self._disk_cache = result_cache
+        else:
+            self._disk_cache = None
+        if nworkers is None:
+            nworkers = max(get_local_workers(), 2)
+        self._executor = ThreadPoolExecutor(max_workers=nworkers)
+        # This is a double-check, since we do not always mandate this for
+        # slices:
+        self._get_field(self.field)
 
         for unit in ["Gpc", "Mpc", "kpc", "pc"]:
             v = self.ds.domain_width[0].in_units(unit).value
             if v > 1:
                 break
         self.unit = unit
-        self.px2unit = self.ds.domain_width[0].in_units(unit).value / 256
+        self.px2unit = self.ds.domain_width[0].in_units(unit).value / TILE_SIZE
 
-    def lock(self):
-        import time
+    def _get_field(self, field):
+        # The values of field in the data object, as a float64 array.  Fields
+        # are computed (or projected) once, under the lock; afterwards tiles
+        # only read the resulting arrays.
+        with self._lock:
+            if field not in self._fields:
+                values = self.data[field].astype("float64")
+                self.data[field] = values
+                for name in ("px", "py", "pdx", "pdy"):
+                    self.data[name]
+                self._fields[field] = values
+            return self._fields[field]
 
-        while self._lock:
-            time.sleep(0.01)
-        self._lock = True
+    def _get_color_bounds(self, field, L):
+        # The color bounds only depend on the zoom level: they are the extrema
+        # of the cells that are resolved at that level, over the whole domain.
+        key = (field, L, self.takelog)
+        bounds = self._color_bounds.get(key, None)
+        if bounds is not None:
+            return bounds
+        dd = 1.0 / 2.0 ** L
+        DLE = self.ds.domain_left_edge.to("code_length").d
+        DRE = self.ds.domain_right_edge.to("code_length").d
+        DW = DRE - DLE
+        bounds = get_color_bounds(
+            self.data["px"].d,
+            self.data["py"].d,
+            self.data["pdx"].d,
+            self.data["pdy"].d,
+            self._get_field(field).d,
+            DLE[0],
+            DRE[0],
+            DLE[1],
+            DRE[1],
+            dd * DW[0] / (64 * TILE_SIZE),
+            dd * DW[0],
+        )
+        if self.takelog:
+            bounds = (np.log10(bounds[0]), np.log10(bounds[1]))
+        with self._lock:
+            return self._color_bounds.setdefault(key, bounds)
 
-    def unlock(self):
-        self._lock = False
+    def _render_tile(self, field, L, x, y):
+        # Render the PNG image of a tile, without touching the data object
+        values = self._get_field(field)
+        dd = 1.0 / 2.0 ** L
+        DLE = self.ds.domain_left_edge.to("code_length").d
+        DW = self.ds.domain_width.to("code_length").d
+        xl = DLE[0] + x * dd * DW[0]
+        yl = DLE[1] + y * dd * DW[1]
+        bounds = (xl, xl + dd * DW[0], yl, yl + dd * DW[1])
+        buff = np.zeros((TILE_SIZE, TILE_SIZE), dtype="float64")
+        pixelize_cartesian(
+            buff,
+            self.data["px"].d,
+            self.data["py"].d,
+            self.data["pdx"].d,
+            self.data["pdy"].d,
+            values.d,
+            bounds,
+            1,
+            None,
+            0,
+        )
+        if self.takelog:
+            buff = np.log10(buff)
+        to_plot = apply_colormap(
+            buff, color_bounds=self._get_color_bounds(field, L), cmap_name=self.cmap
+        )
+        return write_png_to_string(to_plot)
 
-    def map(self, field, L, x, y):
-        if "," in field:
-            field = tuple(field.split(","))
-        cmap = self.cmap
-        dd = 1.0 / (2.0 ** (int(L)))
-        relx = int(x) * dd
-        rely = int(y) * dd
-        DW = self.ds.domain_right_edge - self.ds.domain_left_edge
-        xl = self.ds.domain_left_edge[0] + relx * DW[0]
-        yl = self.ds.domain_left_edge[1] + rely * DW[1]
-        xr = xl + dd * DW[0]
-        yr = yl + dd * DW[1]
+    def _disk_key(self, key):
+        field, L, x, y, cmap, takelog = key
+        return result_key(
+            self.ds,
+            "map_tile",
+            self.data,
+            field,
+            L,
+            x,
+            y,
+            TILE_SIZE,
+            cmap,
+            takelog,
+            fields=[field],
+        )
+
+    def get_tile(self, field, L, x, y):
+        """
+        Return the PNG image of the tile (*x*, *y*) of zoom level *L*, from
+        the caches if possible.  Concurrent requests for a tile that is being
+        rendered wait for it rather than render it again.
+        """
+        key = (field, L, x, y, self.cmap, self.takelog)
+        with self._lock:
+            png = self._tiles.get(key, None)
+            if png is not None:
+                self._tiles.move_to_end(key)
+                return png
+            future = self._pending.get(key, None)
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+        if not owner:
+            return future.result()
         try:
-            self.lock()
-            w = 256  # pixels
-            data = self.data[field]
-            frb = FixedResolutionBuffer(self.data, (xl, xr, yl, yr), (w, w))
-            cmi, cma = get_color_bounds(
-                self.data["px"],
-                self.data["py"],
-                self.data["pdx"],
-                self.data["pdy"],
-                data,
-                self.ds.domain_left_edge[0],
-                self.ds.domain_right_edge[0],
-                self.ds.domain_left_edge[1],
-                self.ds.domain_right_edge[1],
-                dd * DW[0] / (64 * 256),
-                dd * DW[0],
-            )
-        finally:
-            self.unlock()
+            png = self._load_tile(key)
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(key)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._tiles[key] = png
+            while len(self._tiles) > self.cache_size:
+                self._tiles.popitem(last=False)
+            self._pending.pop(key)
+        future.set_result(png)
+        return png
 
-        if self.takelog:
-            cmi = np.log10(cmi)
-            cma = np.log10(cma)
-            to_plot = apply_colormap(
-                np.log10(frb[field]), color_bounds=(cmi, cma), cmap_name=cmap
-            )
-        else:
-            to_plot = apply_colormap(
-                frb[field], color_bounds=(cmi, cma), cmap_name=cmap
-            )
+    def _load_tile(self, key):
+        # Read a tile from the disk cache, or render (and store) it
+        disk_key = None
+        if self._disk_cache is not None:
+            disk_key = self._disk_key(key)
+            entry = self._disk_cache.get(disk_key)
+            if entry is not None:
+                return entry["png"].tobytes()
+        png = self._render_tile(*key[:4])
+        if disk_key is not None:
+            self._disk_cache.put(disk_key, {"png": np.frombuffer(png, dtype="uint8")})
+        return png
+
+    def _prefetch(self, field, L, x, y):
+        # Render the neighbours of a tile in the background
+        ntiles = 2 ** L
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if (dx, dy) == (0, 0) or not (0 <= nx < ntiles and 0 <= ny < ntiles):
+                    continue
+                key = (field, L, nx, ny, self.cmap, self.takelog)
+                with self._lock:
+                    if key in self._tiles or key in self._pending:
+                        continue
+                self._executor.submit(self.get_tile, field, L, nx, ny)
 
-        rv = write_png_to_string(to_plot)
-        return rv
+    def map(self, field, L, x, y):
+        if "," in field:
+            field = tuple(field.split(","))
+        L, x, y = int(L), int(x), int(y)
+        png = self.get_tile(field, L, x, y)
+        self._prefetch(field, L, x, y)
+        bottle.response.headers["Content-Type"] = "image/png"
+        return png
 
     def index(self, field=None):
         if field is not None:
@@ -287,7 +287,9 @@ class PlotWindow(ImagePlotContainer):
         else:
             bounds = self.xlim + self.ylim
 
-        # Generate the FRB
+        # Generate the FRB, reusing the images of the previous one where the
+        # window was only panned
+        old_frb = self._frb
         self.frb = self._frb_generator(
             self.data_source,
             bounds,
@@ -295,6 +297,7 @@ class PlotWindow(ImagePlotContainer):
             self.antialias,
             periodic=self._periodic,
         )
+        self._frb._keep_pixels(previous=old_frb)
 
         # At this point the frb has the valid bounds, size, aliasing, etc.
         if old_fields is None:
@@ -312,6 +315,7 @@ class PlotWindow(ImagePlotContainer):
         # Restore the override fields
         for key in self.override_fields:
             self._frb[key]
+        self._frb._previous = None
 
     @property
     def width(self):
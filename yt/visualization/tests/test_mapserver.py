@@ -0,0 +1,134 @@
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from yt.testing import assert_equal, fake_random_ds, requires_module
+
+FIELD = ("gas", "density")
+
+
+def setup():
+    """Test specific setup."""
+    from yt.config import ytcfg
+
+    ytcfg["yt", "__withintesting"] = "True"
+
+
+def _server(takelog=False, data=None, **kwargs):
+    from yt.visualization.mapserver.pannable_map import PannableMapServer
+
+    if data is None:
+        data = fake_random_ds(16).slice(2, 0.5)
+    return PannableMapServer(data, FIELD, takelog, "arbre", **kwargs)
+
+
+def _frb_tile(server, field, L, x, y):
+    # A tile rendered through a fixed resolution buffer, as the map server
+    # used to
+    from yt.utilities.lib.misc_utilities import get_color_bounds
+    from yt.utilities.png_writer import write_png_to_string
+    from yt.visualization.fixed_resolution import FixedResolutionBuffer
+    from yt.visualization.image_writer import apply_colormap
+
+    data = server.data
+    ds = server.ds
+    dd = 1.0 / 2.0 ** L
+    DW = ds.domain_right_edge - ds.domain_left_edge
+    xl = ds.domain_left_edge[0] + x * dd * DW[0]
+    yl = ds.domain_left_edge[1] + y * dd * DW[1]
+    frb = FixedResolutionBuffer(
+        data, (xl, xl + dd * DW[0], yl, yl + dd * DW[1]), (256, 256)
+    )
+    cmi, cma = get_color_bounds(
+        data["px"],
+        data["py"],
+        data["pdx"],
+        data["pdy"],
+        data[field],
+        ds.domain_left_edge[0],
+        ds.domain_right_edge[0],
+        ds.domain_left_edge[1],
+        ds.domain_right_edge[1],
+        dd * DW[0] / (64 * 256),
+        dd * DW[0],
+    )
+    image = frb[field]
+    if server.takelog:
+        cmi, cma, image = np.log10(cmi), np.log10(cma), np.log10(image)
+    return write_png_to_string(
+        apply_colormap(image, color_bounds=(cmi, cma), cmap_name=server.cmap)
+    )
+
+
+@requires_module("bottle")
+def test_tile_matches_frb():
+    for takelog in (False, True):
+        server = _server(takelog)
+        for L, x, y in [(0, 0, 0), (1, 1, 0), (2, 1, 3)]:
+            png = server.get_tile(FIELD, L, x, y)
+            assert_equal(png, _frb_tile(server, FIELD, L, x, y))
+
+
+@requires_module("bottle")
+def test_color_bounds_takelog():
+    server = _server(False)
+    linear = server._get_color_bounds(FIELD, 1)
+    server.takelog = True
+    assert_equal(server._get_color_bounds(FIELD, 1), np.log10(linear))
+
+
+@requires_module("bottle")
+def test_concurrent_tiles_render_once():
+    server = _server()
+    render = server._render_tile
+    calls = []
+
+    def _render(*args):
+        calls.append(args)
+        # Give the other requests time to find the tile being rendered
+        time.sleep(0.1)
+        return render(*args)
+
+    server._render_tile = _render
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(server.get_tile, FIELD, 1, 0, 1) for _ in range(8)]
+        tiles = [future.result() for future in futures]
+    assert_equal(len(calls), 1)
+    for png in tiles:
+        assert_equal(png, tiles[0])
+
+
+@requires_module("bottle")
+def test_tile_cache_eviction():
+    server = _server(cache_size=2)
+    server.get_tile(FIELD, 1, 0, 0)
+    server.get_tile(FIELD, 1, 0, 1)
+    # (0, 0) is used again, so (0, 1) is the least recently used tile
+    server.get_tile(FIELD, 1, 0, 0)
+    server.get_tile(FIELD, 1, 1, 0)
+    assert_equal(len(server._tiles), 2)
+    assert_equal(
+        sorted(key[2:4] for key in server._tiles),
+        [(0, 0), (1, 0)],
+    )
+
+
+@requires_module("bottle")
+def test_tile_disk_cache():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        first = _server(cache_dir=tmpdir)
+        png = first.get_tile(FIELD, 2, 1, 2)
+        # A new server, with empty in-memory caches, on the same data
+        server = _server(data=first.data, cache_dir=tmpdir)
+
+        def _render(*args):
+            raise RuntimeError("The tile should be read from the disk cache")
+
+        server._render_tile = _render
+        assert_equal(server.get_tile(FIELD, 2, 1, 2), png)
+    finally:
+        shutil.rmtree(tmpdir)
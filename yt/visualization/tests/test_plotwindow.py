@@ -37,6 +37,7 @@ from yt.visualization.api import (
     SlicePlot,
     plot_2d,
 )
+from yt.visualization.fixed_resolution import FixedResolutionBuffer
 
 
 def setup():
@@ -539,6 +540,27 @@ def test_frb_regen():
     assert_equal(slc.frb["density"].shape, (200, 400))
 
 
+def test_frb_pan_zoom():
+    ds = fake_random_ds(32, nprocs=8)
+    slc = SlicePlot(ds, 2, ("gas", "density"), center=[0.5, 0.5, 0.5])
+    slc.set_buff_size(256)
+    slc.zoom(4)
+    slc.frb["gas", "density"]
+    # Pan by a whole number of pixels, so that the image of the previous
+    # window is reused for the pixels they share
+    dx = 0.25 / 256
+    for deltas in [(64 * dx, -32 * dx), (-10 * dx, 0.0), (0.0, 7 * dx)]:
+        slc.pan(deltas)
+        image = slc.frb["gas", "density"]
+        bounds = slc.xlim + slc.ylim
+        frb = FixedResolutionBuffer(slc.data_source, bounds, (256, 256))
+        assert_rel_equal(image, frb["gas", "density"], 10)
+    slc.zoom(2)
+    image = slc.frb["gas", "density"]
+    frb = FixedResolutionBuffer(slc.data_source, slc.xlim + slc.ylim, (256, 256))
+    assert_rel_equal(image, frb["gas", "density"], 10)
+
+
 def test_set_background_color():
     ds = fake_random_ds(32)
     plot = SlicePlot(ds, 2, "density")